@@ -0,0 +1,65 @@
+import os
+import re
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+from config.memory_budget import memory_report, relieve_memory_pressure
+from models.admin_models import ProfilingSettings
+from utils.profiler import configure_profiling, profile_path, profiling_status
+
+# 라우터 생성 (모든 엔드포인트에 관리자 토큰 필요)
+router = APIRouter(prefix="/api/admin")
+debug_router = APIRouter(prefix="/debug")
+
+# 관리자 토큰 (설정하지 않으면 관리자 API 사용 불가)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+def check_admin_token(token: Optional[str]) -> bool:
+    """X-Admin-Token 헤더 값 확인 (시간 차이로 토큰이 드러나지 않도록 비교)"""
+    return bool(ADMIN_TOKEN) and token is not None and secrets.compare_digest(token, ADMIN_TOKEN)
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """관리자 API 인증 (토큰이 없거나 다르면 403)"""
+    if not check_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 올바르지 않습니다")
+
+@router.get("/profiling", dependencies=[Depends(require_admin)])
+async def get_profiling():
+    """프로파일링 설정과 최근 프로파일 목록"""
+    return profiling_status()
+
+@router.post("/profiling", dependencies=[Depends(require_admin)])
+async def update_profiling(settings: ProfilingSettings):
+    """
+    프로파일링 켜기/끄기와 샘플링 비율 변경
+    - 예: {"enabled": true, "sample_rate": 0.05} → 요청의 5%를 프로파일링
+    - 특정 요청만 보려면 /api/chat 에 X-Profile: 1 + X-Admin-Token 헤더
+    """
+    return configure_profiling(settings.enabled, settings.sample_rate)
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def get_profile(profile_id: str):
+    """
+    저장된 프로파일 다운로드 (collapsed stack 형식)
+    - speedscope.app 에 올리거나 flamegraph.pl 로 SVG 생성
+    """
+    path = profile_path(profile_id) if re.fullmatch(r"[0-9a-f]{12}", profile_id) else None
+    if path is None:
+        raise HTTPException(status_code=404, detail="프로파일이 없습니다")
+    return FileResponse(path, media_type="text/plain", filename=os.path.basename(path))
+
+@debug_router.get("/memory", dependencies=[Depends(require_admin)])
+async def get_memory(top: int = 10):
+    """
+    메모리 사용 현황
+    - 프로세스 RSS, 컴포넌트별 사용량(임베딩 모델, 컬렉션, 대화 세션, FAQ 인덱스)
+    - MEMORY_TRACEMALLOC=1로 시작한 경우 할당 위치 상위 top개
+    """
+    return memory_report(top)
+
+@debug_router.post("/memory/evict", dependencies=[Depends(require_admin)])
+async def evict_memory():
+    """해제 가능한 컴포넌트를 모두 해제 (예산과 관계없이)"""
+    evicted = relieve_memory_pressure(force=True)
+    return {"evicted": evicted, **memory_report(0)}
@@ -1,8 +1,12 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from models.chat_models import ChatMessage, ChatResponse
 from services.chat_service import ChatService
 from services.translator_service import TranslationService
 from services.unified_prompt_service import UnifiedPromptService
+from api.responses import negotiate_response
+from api.admin_routes import check_admin_token
+from utils.profiler import request_profile
+from config.collection_registry import list_collections, registry_stats
 
 # 라우터 생성
 router = APIRouter()
@@ -13,6 +17,26 @@ unified_prompt_service = UnifiedPromptService()
 chat_service = ChatService(translation_service, unified_prompt_service)
 
 @router.post("/api/chat", response_model=ChatResponse)
-async def chat_with_gemini(request: ChatMessage):
-    """챗봇과의 대화 처리 메인 함수"""
-    return await chat_service.process_chat(request)
+async def chat_with_gemini(request: ChatMessage, http_request: Request):
+    """
+    챗봇과의 대화 처리 메인 함수
+    - 기본은 JSON 응답, Accept: application/x-msgpack 이면 MessagePack 응답
+    - 프로파일링된 요청은 X-Profile-Id 헤더로 프로파일 ID 반환
+      (관리자 토큰과 함께 X-Profile: 1 을 보내면 이 요청을 반드시 프로파일링)
+    """
+    forced = http_request.headers.get("x-profile") == "1" and check_admin_token(http_request.headers.get("x-admin-token"))
+    with request_profile(forced) as profile:
+        response = await chat_service.process_chat(request)
+    result = negotiate_response(http_request, response)
+    if profile is not None and profile.path:
+        result.headers["X-Profile-Id"] = profile.id
+    return result
+
+
+@router.get("/api/collections")
+async def get_collections():
+    """
+    사용 가능한 학과별 컬렉션 목록과 메모리에 로드된 컬렉션 상태
+    - ChatMessage.collection 값으로 사용
+    """
+    return {"collections": list_collections(), "registry": registry_stats()}
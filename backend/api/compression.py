@@ -0,0 +1,137 @@
+# =============================================================================
+# 응답 압축 미들웨어 (brotli / gzip 협상)
+# =============================================================================
+# 주요 기능:
+# 1. 요청의 Accept-Encoding을 보고 brotli(br) > gzip 순서로 압축 방식 선택
+# 2. 크기 기준(RESPONSE_COMPRESSION_MIN_BYTES) 미만의 작은 응답은 압축하지 않음
+# 3. 스트리밍 응답은 청크마다 flush하여 압축해도 실시간으로 전달
+# =============================================================================
+import os
+import zlib
+
+try:
+    import brotli  # 선택 사항: 없으면 gzip만 사용
+except ImportError:
+    brotli = None
+
+# 이 크기 미만 응답은 압축 이득보다 CPU 비용이 커서 그대로 전송
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "500"))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5   # 실시간 응답용 (11은 너무 느림)
+
+# 이미 압축된 형식은 다시 압축하지 않음
+_SKIP_CONTENT_TYPES = ("image/", "video/", "audio/", "application/zip", "application/gzip")
+
+
+def choose_encoding(accept_encoding: str) -> str:
+    """Accept-Encoding 헤더에서 사용할 압축 방식 선택 (없으면 빈 문자열)"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name] = quality
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return ""
+
+
+class _Compressor:
+    """br / gzip 스트리밍 압축기 (같은 인터페이스)"""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._zlib = None
+        else:
+            self._brotli = None
+            # wbits=31: gzip 헤더/트레일러 포함
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """
+    협상 기반 응답 압축 ASGI 미들웨어
+    - 한 번에 끝나는 응답: 크기 기준 이상일 때만 압축
+    - 스트리밍 응답: 첫 청크부터 압축하며 청크마다 flush
+    """
+
+    def __init__(self, app, minimum_size: int = RESPONSE_COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        encoding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        state = {"start": None, "compressor": None, "passthrough": False}
+
+        async def send_compressed(message):
+            if message["type"] == "http.response.start":
+                # 본문을 보기 전까지 시작 메시지를 보류 (압축 여부에 따라 헤더가 바뀜)
+                state["start"] = message
+                return
+            if message["type"] != "http.response.body" or state["passthrough"]:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if state["compressor"] is None:
+                start = state["start"]
+                response_headers = {k.lower(): v for k, v in start.get("headers", [])}
+                content_type = response_headers.get(b"content-type", b"").decode("latin-1")
+                already_encoded = b"content-encoding" in response_headers
+                too_small = not more_body and len(body) < self.minimum_size
+                if already_encoded or too_small or content_type.startswith(_SKIP_CONTENT_TYPES):
+                    state["passthrough"] = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                state["compressor"] = _Compressor(encoding)
+                new_headers = [(k, v) for k, v in start.get("headers", [])
+                               if k.lower() not in (b"content-length", b"vary")]
+                vary = response_headers.get(b"vary")
+                new_headers.append((b"content-encoding", encoding.encode("latin-1")))
+                new_headers.append((b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"))
+                if not more_body:
+                    compressed = state["compressor"].compress(body) + state["compressor"].finish()
+                    new_headers.append((b"content-length", str(len(compressed)).encode("latin-1")))
+                    await send({**start, "headers": new_headers})
+                    await send({"type": "http.response.body", "body": compressed, "more_body": False})
+                    return
+                await send({**start, "headers": new_headers})
+
+            compressor = state["compressor"]
+            chunk = compressor.compress(body) if body else b""
+            if not more_body:
+                chunk += compressor.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
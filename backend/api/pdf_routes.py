@@ -1,23 +1,53 @@
-from fastapi import APIRouter
-from pdf_importer import create_vector_store
-from config.vector_store import initialize_vector_store
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks
+from pdf_importer import create_vector_store, validate_collection_name, COLLECTION_NAME
+from config.collection_registry import reload_collection
+from config.memory_budget import memory_pressure
+from faq_builder import build_faq_index
+from utils.faq_index import unload_faq_index
 
 # 라우터 생성
 router = APIRouter()
 
+# 동시에 여러 import가 실행되지 않도록 (임베딩 계산이 CPU/메모리를 많이 사용)
+_import_lock = asyncio.Lock()
+
 @router.post("/api/import-pdf")
-async def import_pdf():
+async def import_pdf(background_tasks: BackgroundTasks, collection: Optional[str] = None):
     """
     PDF 데이터를 벡터 스토어에 import
     - PDF 파일을 텍스트로 변환
     - 텍스트를 벡터로 변환하여 PostgreSQL에 저장
     - RAG 검색을 위한 데이터 준비
+    - collection 지정 시 data/<collection>/*.pdf 를 학과별 컬렉션으로 import
+    - 기본 컬렉션이면 FAQ 답변 인덱스를 백그라운드에서 재구축
+    - import는 새 세대에 만들어지므로 그동안 채팅 요청은 이전 세대로 계속 응답
     """
     try:
-        vector_store = create_vector_store()
-        if vector_store:
-            return {"message": "PDF import 성공!", "success": True}
-        else:
-            return {"message": "PDF import 실패", "success": False}
+        # 경로/DB 이름으로 쓰이므로 import 전에 이름 확인
+        collection = validate_collection_name(collection or COLLECTION_NAME)
+    except ValueError as e:
+        return {"message": str(e), "success": False}
+    if _import_lock.locked():
+        return {"message": "이미 PDF import가 진행 중입니다", "success": False}
+    if memory_pressure():
+        # 임베딩 계산으로 메모리가 더 늘어나 서버가 종료될 수 있으므로 거부
+        return {"message": "메모리가 부족하여 PDF import를 할 수 없습니다", "success": False}
+    try:
+        async with _import_lock:
+            # 별도 스레드에서 실행 (import 중에도 이벤트 루프는 채팅 요청 처리)
+            vector_store = await asyncio.to_thread(create_vector_store, collection)
+            if vector_store:
+                # 새 활성 세대를 미리 로드해 교체 (이전 세대는 처리 중인 요청이 끝나면 해제)
+                await asyncio.to_thread(reload_collection, collection)
+                if collection != COLLECTION_NAME:
+                    return {"message": f"PDF import 성공! ({collection})", "success": True}
+                # 이전 문서 기준 FAQ 답변은 재구축이 끝날 때까지 사용하지 않음
+                unload_faq_index()
+                background_tasks.add_task(build_faq_index)
+                return {"message": "PDF import 성공! (FAQ 인덱스 재구축 중)", "success": True}
+            else:
+                return {"message": "PDF import 실패", "success": False}
     except Exception as e:
         return {"message": f"PDF import 오류: {str(e)}", "success": False}
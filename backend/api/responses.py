@@ -0,0 +1,45 @@
+# =============================================================================
+# API 응답 직렬화 (orjson / MessagePack)
+# =============================================================================
+# 주요 기능:
+# 1. orjson 기반 JSON 응답 (표준 json보다 빠른 직렬화, FastAPI 기본 응답 클래스로 사용)
+# 2. Accept: application/x-msgpack 요청에는 MessagePack 바이너리 응답 (선택 사항)
+# =============================================================================
+from typing import Any
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse, Response
+
+try:
+    import msgpack  # 선택 사항: 없으면 항상 JSON 응답
+except ImportError:
+    msgpack = None
+
+MSGPACK_MEDIA_TYPES = ("application/x-msgpack", "application/msgpack", "application/vnd.msgpack")
+
+
+class MsgPackResponse(Response):
+    """MessagePack 응답 (UTF-8 문자열을 그대로 담아 JSON보다 작고 파싱이 빠름)"""
+    media_type = "application/x-msgpack"
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, use_bin_type=True)
+
+
+def wants_msgpack(request: Request) -> bool:
+    """클라이언트가 MessagePack 응답을 요청했는지 확인"""
+    accept = request.headers.get("accept", "").lower()
+    return msgpack is not None and any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+
+
+def negotiate_response(request: Request, content: Any) -> Response:
+    """
+    Accept 헤더에 맞는 응답 생성
+    - application/x-msgpack → MessagePack
+    - 그 외 → orjson JSON
+    """
+    data = jsonable_encoder(content)
+    if wants_msgpack(request):
+        return MsgPackResponse(data)
+    return ORJSONResponse(data)
@@ -0,0 +1,102 @@
+# =============================================================================
+# 임베딩 백엔드 비교 (HuggingFace vs ONNX int8) - 일치도 / 속도 / 메모리
+# =============================================================================
+# 주요 기능:
+# 1. 원본 모델(HuggingFaceEmbeddings)과 ONNX 모델의 코사인 일치도 검사
+# 2. 모델 로드 시간, 질문 1개 지연 시간(p50/p95), 문서 배치 처리량 측정
+# 3. 모델 로드 전후 RSS 증가량 비교
+#
+# 실행 방법 (backend 디렉터리에서, ONNX 모델 변환 후):
+#   python -m benchmarks.embedding_benchmark
+#   python -m benchmarks.embedding_benchmark --min-cosine 0.99   # 일치도 기준 미달 시 종료 코드 1
+# =============================================================================
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from utils.chunk_store import load_chunks
+from utils.index_generations import active_generation
+from pdf_importer import COLLECTION_NAME
+
+
+def current_rss_mb() -> float:
+    """현재 프로세스 RSS (MB, Linux /proc 기준, 없으면 최대 RSS)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_texts(limit: int):
+    """측정용 텍스트: FAQ 질문 + 청크 저장소 본문"""
+    with open(os.path.join("data", "faq_questions.json"), encoding="utf-8") as f:
+        queries = json.load(f)
+    documents = [record["text"] for record in load_chunks(active_generation(COLLECTION_NAME)).values()][:limit]
+    if not documents:
+        documents = queries * 4
+    return queries, documents
+
+
+def measure(name: str, factory, queries, documents):
+    """백엔드 하나의 로드 시간 / 지연 시간 / 처리량 / 메모리 측정"""
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+    model = factory()
+    load_seconds = time.perf_counter() - start
+    rss_after = current_rss_mb()
+
+    model.embed_query(queries[0])  # 워밍업
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        model.embed_query(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    document_vectors = np.asarray(model.embed_documents(documents), dtype=np.float32)
+    throughput = len(documents) / (time.perf_counter() - start)
+
+    query_vectors = np.asarray([model.embed_query(q) for q in queries], dtype=np.float32)
+    print(f"{name:<14}로드 {load_seconds:6.1f}s  RSS +{rss_after - rss_before:7.0f}MB  "
+          f"질문 p50 {np.percentile(latencies, 50):6.1f}ms p95 {np.percentile(latencies, 95):6.1f}ms  "
+          f"문서 {throughput:6.1f}개/s")
+    return np.vstack([query_vectors, document_vectors])
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HuggingFace vs ONNX 임베딩 비교")
+    parser.add_argument("--documents", type=int, default=128, help="처리량 측정 문서 수")
+    parser.add_argument("--min-cosine", type=float, default=0.99, help="최소 코사인 일치도 기준")
+    args = parser.parse_args()
+
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+    from config.onnx_embeddings import OnnxEmbeddings
+
+    queries, documents = load_texts(args.documents)
+    print(f"📊 질문 {len(queries)}개, 문서 {len(documents)}개\n")
+
+    reference = measure("huggingface", lambda: HuggingFaceEmbeddings(
+        model_name='nlpai-lab/KURE-v1', model_kwargs={'device': 'cpu'}), queries, documents)
+    candidate = measure("onnx-int8", OnnxEmbeddings, queries, documents)
+
+    # 일치도 검사: 같은 텍스트에 대한 두 벡터의 코사인 유사도
+    cosine = np.sum(normalize(reference) * normalize(candidate), axis=1)
+    print(f"\n🔁 코사인 일치도: 평균 {cosine.mean():.4f}, 최소 {cosine.min():.4f} (기준 {args.min_cosine})")
+    if cosine.min() < args.min_cosine:
+        print("❌ 일치도 기준 미달")
+        sys.exit(1)
+    print("✅ 일치도 기준 통과")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# =============================================================================
+# 임베딩 양자화 벤치마크 (재현율 vs 메모리)
+# =============================================================================
+# 주요 기능:
+# 1. 로컬 양자화 인덱스(float32 / int8 / binary)를 같은 질문으로 검색
+# 2. float32 정확 검색 결과 대비 recall@k 측정 (재정렬 유무 비교)
+# 3. 벡터 1개당 메모리, 인덱스 상주 메모리, 질문당 검색 시간 비교
+#
+# 실행 방법 (backend 디렉터리에서):
+#   python -m benchmarks.quantization_benchmark                 # 실제 코퍼스 + FAQ 질문
+#   python -m benchmarks.quantization_benchmark --synthetic 100000
+# =============================================================================
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from pdf_importer import COLLECTION_NAME
+from utils.chunk_store import load_chunks
+from utils.index_generations import active_generation
+from utils.quantized_index import QUANTIZED_BACKENDS, build_quantized_index, get_quantized_index, quantized_index_dir
+
+SYNTHETIC_COLLECTION = "_benchmark_synthetic"
+CORPUS_COLLECTION = "_benchmark_corpus"
+
+
+def load_queries(dim: int, synthetic: bool, count: int) -> np.ndarray:
+    """검색 질문 벡터 준비 (실제 코퍼스는 FAQ 질문 임베딩, 합성은 무작위)"""
+    if synthetic:
+        return np.random.default_rng(1).standard_normal((count, dim)).astype(np.float32)
+
+    from config.vector_store import get_embeddings
+    with open(os.path.join("data", "faq_questions.json"), encoding="utf-8") as f:
+        questions = json.load(f)
+    return np.asarray(get_embeddings().embed_documents(questions), dtype=np.float32)
+
+
+def load_corpus(generation: str):
+    """
+    실제 코퍼스 벡터 준비 (중복이 아닌 청크를 다시 임베딩)
+    - import는 VECTOR_BACKEND 형식만 저장하므로 모든 형식 비교용 인덱스는 따로 만듦
+    """
+    from config.vector_store import get_embeddings
+    records = {chunk_id: record for chunk_id, record in load_chunks(generation).items()
+               if "duplicate_of" not in record["metadata"]}
+    vectors = get_embeddings().embed_documents([record["text"] for record in records.values()])
+    return list(records), np.asarray(vectors, dtype=np.float32)
+
+
+def run(collection_name: str, queries: np.ndarray, top_k: int):
+    """모드별 검색 결과 비교 출력"""
+    exact_index = get_quantized_index(collection_name, "float32")
+    exact = [{row for row, _ in exact_index.search(q, top_k)} for q in queries]
+    dim = exact_index.full.shape[1]
+
+    print(f"\n📊 벡터 {len(exact_index)}개, {dim}차원, 질문 {len(queries)}개, top_k={top_k}")
+    print(f"{'모드':<16}{'bytes/벡터':>12}{'상주 메모리':>14}{'recall@k':>10}{'평균 ms':>10}")
+    for mode, rescore in [("float32", True), ("int8", False), ("int8", True), ("binary", False), ("binary", True)]:
+        index = get_quantized_index(collection_name, mode)
+        start = time.perf_counter()
+        results = [{row for row, _ in index.search(q, top_k, rescore=rescore)} for q in queries]
+        elapsed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        recall = np.mean([len(found & truth) / len(truth) for found, truth in zip(results, exact)])
+        bytes_per_vector = index.nbytes / len(index)
+        label = f"{mode}{' +재정렬' if rescore and mode != 'float32' else ''}"
+        print(f"{label:<16}{bytes_per_vector:>12.0f}{index.nbytes / 1024 / 1024:>12.2f}MB{recall:>10.3f}{elapsed_ms:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 양자화 재현율/메모리 벤치마크")
+    parser.add_argument("--synthetic", type=int, default=0, help="합성 벡터 개수 (0이면 실제 코퍼스 사용)")
+    parser.add_argument("--dim", type=int, default=1024, help="합성 벡터 차원 (KURE-v1: 1024)")
+    parser.add_argument("--queries", type=int, default=200, help="합성 질문 개수")
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        collection_name = SYNTHETIC_COLLECTION
+        chunk_ids = [str(i) for i in range(args.synthetic)]
+        vectors = np.random.default_rng(0).standard_normal((args.synthetic, args.dim)).astype(np.float32)
+    else:
+        generation = active_generation(COLLECTION_NAME)
+        if not load_chunks(generation):
+            print("❌ 청크 저장소가 없습니다. python pdf_importer.py 를 먼저 실행하세요.")
+            return
+        collection_name = CORPUS_COLLECTION
+        chunk_ids, vectors = load_corpus(generation)
+
+    build_quantized_index(collection_name, chunk_ids, vectors, modes=QUANTIZED_BACKENDS)
+    try:
+        run(collection_name, load_queries(args.dim, bool(args.synthetic), args.queries), args.top_k)
+    finally:
+        shutil.rmtree(os.path.dirname(quantized_index_dir(collection_name)), ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
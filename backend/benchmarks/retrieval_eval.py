@@ -0,0 +1,192 @@
+# =============================================================================
+# 오프라인 검색 품질/속도 평가 (RAG 검색 회귀 검사)
+# =============================================================================
+# 주요 기능:
+# 1. data/eval/retrieval_eval.jsonl 의 (질문, 정답 출처/문구) 라벨 로드
+# 2. data/ 의 PDF를 설정별 청킹 방식으로 분할하고 로컬 벡터 인덱스 생성
+# 3. 설정별 recall@k, MRR, 질문당 검색 지연 시간, 전달 글자 수를 나란히 비교
+#
+# 정답 판정: 검색 결과(이웃 확장 포함)의 청크가 정답 PDF에서 왔고,
+#           공백을 제거한 본문에 정답 문구가 들어 있으면 정답
+#           (청크 경계가 바뀌어도 라벨을 다시 만들 필요 없음)
+#
+# 실행 방법 (backend 디렉터리에서):
+#   python -m benchmarks.retrieval_eval
+#   python -m benchmarks.retrieval_eval --top-k 5 --config structure-int8
+#   EMBEDDING_BACKEND=onnx python -m benchmarks.retrieval_eval   # 임베딩 백엔드 비교
+# =============================================================================
+import argparse
+import glob
+import json
+import os
+import re
+import shutil
+import time
+from typing import Dict, List
+
+import numpy as np
+from langchain.schema import Document
+from langchain_community.document_loaders import PyPDFLoader
+
+from config.vector_store import get_embeddings
+from utils.chunk_store import INDEX_DIR, expand_with_neighbors, save_chunks
+from utils.dedup import mark_near_duplicates, strip_boilerplate, unique_chunks
+from utils.quantized_index import QUANTIZED_BACKENDS, build_quantized_index, similarity_search_quantized
+from utils.rag_utils import MMR_FETCH_FACTOR, MMR_LAMBDA, RAG_CONTEXT_TOKENS
+from utils.text_chunker import chunk_documents
+
+EVAL_SET_PATH = os.path.join("data", "eval", "retrieval_eval.jsonl")
+
+# 평가할 검색 설정
+# - chunker: structure(구조 기반, 토큰 기준, 반복 요소 제거 + 중복 청크 제외)
+#            / recursive(이전 방식, 1000자 + 200자 겹침)
+# - backend: float32 / int8 / binary (utils/quantized_index.py)
+# - neighbors: 이웃 청크 확장 여부 (recursive는 이전 방식대로 500자 제한)
+# - mmr: 최종 top-k에 MMR 적용 여부 (MMR_LAMBDA)
+EVAL_CONFIGS = [
+    {"name": "recursive-float32", "chunker": "recursive", "backend": "float32", "neighbors": False},
+    {"name": "structure-float32", "chunker": "structure", "backend": "float32", "neighbors": False},
+    {"name": "structure-float32+nb", "chunker": "structure", "backend": "float32", "neighbors": True},
+    {"name": "structure-float32+nb+mmr", "chunker": "structure", "backend": "float32", "neighbors": True,
+     "mmr": True},
+    {"name": "structure-int8+nb", "chunker": "structure", "backend": "int8", "neighbors": True},
+    {"name": "structure-binary+nb", "chunker": "structure", "backend": "binary", "neighbors": True},
+]
+
+
+def _compact(text: str) -> str:
+    """비교용 정규화 (공백 제거)"""
+    return re.sub(r"\s+", "", text)
+
+
+def load_eval_set() -> List[Dict]:
+    """라벨 데이터 로드"""
+    with open(EVAL_SET_PATH, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_pdf_pages() -> List[Document]:
+    """data/ 의 모든 PDF 페이지 로드"""
+    pages = []
+    for pdf_path in sorted(glob.glob(os.path.join("data", "*.pdf"))):
+        pages.extend(PyPDFLoader(pdf_path).load())
+    return pages
+
+
+def split_recursive(pages: List[Document]) -> List[Document]:
+    """이전 방식 청킹 (비교 기준선)"""
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200,
+                                              separators=["\n\n", "\n", " ", ""])
+    chunks = splitter.split_documents(pages)
+    counts: Dict[str, int] = {}
+    for chunk in chunks:
+        source = chunk.metadata.get("source", "")
+        index = counts.get(source, 0)
+        counts[source] = index + 1
+        chunk.metadata.update({"chunk_index": index, "section": "",
+                               "chunk_id": f"{os.path.basename(source)}#{index}"})
+    return chunks
+
+
+def split_structure(pages: List[Document]) -> List[Document]:
+    """현재 import 방식 청킹 (반복 요소 제거 후 분할, 중복 청크 표시)"""
+    chunks = chunk_documents(strip_boilerplate(pages)[0])
+    mark_near_duplicates(chunks)
+    return chunks
+
+
+def build_collection(name: str, chunks: List[Document], vectors: np.ndarray):
+    """평가용 임시 컬렉션 생성 (청크 저장소 + 중복이 아닌 청크의 로컬 벡터 인덱스)"""
+    save_chunks(name, chunks)
+    build_quantized_index(name, [chunk.metadata["chunk_id"] for chunk in unique_chunks(chunks)], vectors,
+                          modes=QUANTIZED_BACKENDS)
+
+
+def evaluate(config: Dict, collection: str, eval_set: List[Dict], query_vectors: np.ndarray,
+             embed_ms: List[float], top_k: int) -> Dict:
+    """설정 하나 평가"""
+    ranks, latencies, context_chars = [], [], []
+    for item, query_vector, embedding_ms in zip(eval_set, query_vectors, embed_ms):
+        start = time.perf_counter()
+        lambda_mult = MMR_LAMBDA if config.get("mmr") else 1.0
+        hits = similarity_search_quantized(collection, query_vector, top_k, mode=config["backend"],
+                                           fetch_k=top_k * MMR_FETCH_FACTOR, lambda_mult=lambda_mult)
+        results = []
+        for doc, _ in hits:
+            expanded = None
+            if config["neighbors"]:
+                expanded = expand_with_neighbors(collection, doc.metadata["chunk_id"], RAG_CONTEXT_TOKENS)
+            if expanded is not None:
+                results.append((doc.metadata["source"], expanded[0]))
+            else:
+                results.append((doc.metadata["source"], doc.page_content[:500]))
+        latencies.append(embedding_ms + (time.perf_counter() - start) * 1000)
+        context_chars.append(sum(len(text) for _, text in results))
+
+        expected = _compact(item["expected"])
+        rank = next((i for i, (source, text) in enumerate(results, 1)
+                     if item["source"] in source and expected in _compact(text)), None)
+        ranks.append(rank)
+
+    found = [rank for rank in ranks if rank is not None]
+    return {
+        "name": config["name"],
+        "recall@1": sum(1 for rank in found if rank <= 1) / len(ranks),
+        f"recall@{top_k}": len(found) / len(ranks),
+        "mrr": sum(1 / rank for rank in found) / len(ranks),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "context_chars": float(np.mean(context_chars)),
+        "misses": [item["question"] for item, rank in zip(eval_set, ranks) if rank is None],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색 품질/속도 오프라인 평가")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--config", action="append", help="평가할 설정 이름 (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument("--show-misses", action="store_true", help="정답을 못 찾은 질문 출력")
+    args = parser.parse_args()
+
+    configs = [c for c in EVAL_CONFIGS if not args.config or c["name"] in args.config]
+    eval_set = load_eval_set()
+    pages = load_pdf_pages()
+    embeddings = get_embeddings()
+
+    # 질문 임베딩 (설정과 무관하므로 한 번만 계산, 질문별 시간은 지연 시간에 포함)
+    query_vectors, embed_ms = [], []
+    for item in eval_set:
+        start = time.perf_counter()
+        query_vectors.append(embeddings.embed_query(item["question"]))
+        embed_ms.append((time.perf_counter() - start) * 1000)
+
+    results = []
+    built = {}
+    try:
+        for config in configs:
+            # 청킹 방식별로 임시 컬렉션을 한 번만 생성
+            collection = f"_eval_{config['chunker']}"
+            if collection not in built:
+                chunks = split_recursive(pages) if config["chunker"] == "recursive" else split_structure(pages)
+                texts = [c.page_content for c in unique_chunks(chunks)]
+                vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+                build_collection(collection, chunks, vectors)
+                built[collection] = len(chunks)
+            results.append(evaluate(config, collection, eval_set, query_vectors, embed_ms, args.top_k))
+    finally:
+        for collection in built:
+            shutil.rmtree(os.path.join(INDEX_DIR, collection), ignore_errors=True)
+
+    print(f"\n📊 질문 {len(eval_set)}개, top_k={args.top_k}")
+    print(f"{'설정':<24}{'R@1':>7}{f'R@{args.top_k}':>7}{'MRR':>7}{'p50 ms':>9}{'p95 ms':>9}{'전달 글자':>10}")
+    for result in results:
+        print(f"{result['name']:<24}{result['recall@1']:>7.3f}{result[f'recall@{args.top_k}']:>7.3f}"
+              f"{result['mrr']:>7.3f}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}{result['context_chars']:>10.0f}")
+        if args.show_misses and result["misses"]:
+            for question in result["misses"]:
+                print(f"    ❌ {question}")
+
+
+if __name__ == "__main__":
+    main()
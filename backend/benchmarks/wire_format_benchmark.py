@@ -0,0 +1,81 @@
+# =============================================================================
+# 채팅 응답 직렬화 / 전송 크기 벤치마크
+# =============================================================================
+# 주요 기능:
+# 1. 한국어 / 영어 / 베트남어 / 미얀마어 ChatResponse와 배치(여러 응답) 페이로드 준비
+# 2. 표준 json / orjson / MessagePack 직렬화 시간 비교
+# 3. 원본 / gzip / brotli 압축 후 전송 바이트 수 비교
+#
+# 실행 방법 (backend 디렉터리에서):
+#   python -m benchmarks.wire_format_benchmark
+# =============================================================================
+import gzip
+import json
+import time
+
+import orjson
+
+from api.compression import BROTLI_QUALITY, GZIP_LEVEL
+from models.chat_models import ChatResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# 언어별 예시 답변 (실제 답변 길이와 비슷하게 반복)
+SAMPLE_ANSWERS = {
+    "ko": "휴학은 일반휴학, 군휴학, 창업휴학이 있으며 학과사무실 방문 후 학과장 면담을 거쳐 휴학원서를 제출하면 됩니다. ",
+    "en": "Leave of absence includes general, military and start-up leave; visit the department office and submit the form. ",
+    "vi": "Nghỉ học gồm nghỉ học thông thường, nghỉ nhập ngũ và nghỉ khởi nghiệp; hãy đến văn phòng khoa để nộp đơn. ",
+    "my": "ကျောင်းပိတ်ခွင့်တွင် ယေဘုယျ၊ စစ်မှုထမ်းနှင့် စီးပွားရေးစတင်ခြင်း ခွင့်များ ပါဝင်ပြီး ဌာနရုံးသို့ သွားရောက်လျှောက်ထားနိုင်ပါသည်။ ",
+}
+REPEAT = 4        # 답변 1개 = 예시 문장 4번 (약 200 토큰 답변)
+BATCH_SIZE = 50   # 배치 페이로드의 응답 개수
+ITERATIONS = 2000
+
+
+def build_payloads():
+    """측정할 페이로드: 언어별 단일 응답 + 미얀마어 배치"""
+    payloads = {}
+    for lang, sentence in SAMPLE_ANSWERS.items():
+        payloads[f"single-{lang}"] = ChatResponse(response=sentence * REPEAT, success=True).model_dump()
+    payloads["batch-my"] = [payloads["single-my"]] * BATCH_SIZE
+    return payloads
+
+
+def time_us(function, payload) -> float:
+    """직렬화 1회 평균 시간 (마이크로초)"""
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        function(payload)
+    return (time.perf_counter() - start) / ITERATIONS * 1_000_000
+
+
+def main():
+    serializers = {
+        # FastAPI 기본 JSONResponse와 같은 설정
+        "json": lambda data: json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        "json(ascii)": lambda data: json.dumps(data).encode("utf-8"),
+        "orjson": orjson.dumps,
+    }
+    if msgpack is not None:
+        serializers["msgpack"] = lambda data: msgpack.packb(data, use_bin_type=True)
+
+    print(f"{'페이로드':<12}{'형식':<13}{'직렬화 us':>10}{'원본 B':>9}{'gzip B':>9}{'br B':>9}")
+    for name, payload in build_payloads().items():
+        for format_name, serialize in serializers.items():
+            body = serialize(payload)
+            gzip_size = len(gzip.compress(body, compresslevel=GZIP_LEVEL))
+            brotli_size = len(brotli.compress(body, quality=BROTLI_QUALITY)) if brotli is not None else 0
+            print(f"{name:<12}{format_name:<13}{time_us(serialize, payload):>10.1f}"
+                  f"{len(body):>9}{gzip_size:>9}{brotli_size or '-':>9}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+# =============================================================================
+# 컬렉션 레지스트리 (학과별 문서 컬렉션을 한 서버에서 제공)
+# =============================================================================
+# 주요 기능:
+# 1. 요청의 collection 값으로 학과별 컬렉션 선택 (없으면 기본 컬렉션)
+# 2. 컬렉션별 검색 리소스(PGVector, 청크 저장소, 로컬 벡터 인덱스)를 처음 쓸 때 로드
+# 3. 임베딩 모델과 DB 연결 풀은 모든 컬렉션이 공유
+# 4. 메모리 예산(COLLECTION_MEMORY_BUDGET_MB)을 넘으면 가장 오래 안 쓴 컬렉션부터 해제
+# 5. 사전 번역 컬렉션(<컬렉션>_en 등)이 있으면 질문 언어로 바로 검색
+# 6. 재import로 활성 세대가 바뀌면 새 세대를 미리 로드한 뒤 교체하고,
+#    이전 세대는 처리 중인 요청이 끝난 뒤 해제 (utils/index_generations.py)
+# 7. 프로세스 메모리 압박 시 기본 컬렉션 외 모두 해제 (config/memory_budget.py)
+# =============================================================================
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set
+
+from config.memory_budget import register_memory_component
+from config.vector_store import create_pgvector
+from pdf_importer import (
+    COLLECTION_NAME, COLLECTION_NAME_PATTERN, TRANSLATABLE_LANGUAGES, translated_collection_name,
+)
+from utils.chunk_store import chunk_store_path, load_chunks, unload_chunks
+from utils.index_generations import active_generation, collection_exists, list_indexed_collections
+from utils.quantized_index import (
+    QUANTIZED_BACKENDS, VECTOR_BACKEND, get_quantized_index, loaded_index_nbytes, unload_quantized_index,
+)
+
+# 메모리에 올려둘 컬렉션 리소스의 총 예산 (기본 컬렉션은 항상 유지)
+COLLECTION_MEMORY_BUDGET_MB = float(os.getenv("COLLECTION_MEMORY_BUDGET_MB", "256"))
+
+# 추가로 허용할 컬렉션 (쉼표 구분, import 전이라 로컬 인덱스가 없는 컬렉션용)
+EXTRA_COLLECTIONS = [name.strip() for name in os.getenv("CHAT_COLLECTIONS", "").split(",") if name.strip()]
+
+# 활성 세대 포인터를 다시 확인하는 간격 (다른 프로세스에서 실행한 pdf_importer.py 감지)
+GENERATION_CHECK_SECONDS = float(os.getenv("GENERATION_CHECK_SECONDS", "2"))
+
+
+class CollectionEntry:
+    """
+    메모리에 올라온 컬렉션 세대 하나 (PGVector + 로컬 리소스 크기)
+    - generation: 실제 저장된 세대 이름 (포인터가 없으면 컬렉션명과 같음)
+    - leases: 이 세대로 검색 중인 요청 수 (사용 중지된 세대는 0이 된 뒤 해제)
+    """
+
+    def __init__(self, name: str, generation: str, vector_store):
+        self.name = name
+        self.generation = generation
+        self.vector_store = vector_store
+        self.nbytes = 0
+        self.leases = 0
+        self.retired = False
+        self.checked_at = time.monotonic()
+
+    def measure(self) -> int:
+        """
+        컬렉션이 차지하는 메모리 추정
+        - 청크 저장소: 파일 크기 (JSON 원문과 메모리 크기가 비슷함)
+        - 로컬 벡터 인덱스: 메모리에 상주하는 코드 크기
+        """
+        path = chunk_store_path(self.generation)
+        chunk_bytes = os.path.getsize(path) if os.path.exists(path) else 0
+        self.nbytes = chunk_bytes + loaded_index_nbytes(self.generation)
+        return self.nbytes
+
+
+# 컬렉션명 -> 현재 세대 (앞쪽일수록 오래 안 쓴 컬렉션)
+_entries: "OrderedDict[str, CollectionEntry]" = OrderedDict()
+_registry_lock = threading.Lock()
+
+# 사용 중지되었지만 검색 중인 요청이 있어 아직 해제하지 못한 세대 (메모리 사용량에 포함)
+_draining: Set[CollectionEntry] = set()
+
+# 세대 로드는 오래 걸리므로 레지스트리 잠금 밖에서 (같은 컬렉션은 한 번만 로드)
+_loading_locks: Dict[str, threading.Lock] = {}
+
+
+def list_collections() -> List[str]:
+    """
+    사용 가능한 컬렉션 목록
+    - 기본 컬렉션 + import로 로컬 인덱스가 만들어진 컬렉션 + CHAT_COLLECTIONS
+    - '_'로 시작하는 컬렉션(평가용 임시 컬렉션), 세대, 사전 번역 컬렉션은 제외
+    """
+    names = [COLLECTION_NAME] + list_indexed_collections() + EXTRA_COLLECTIONS
+    translated = {translated_collection_name(name, lang) for name in names for lang in TRANSLATABLE_LANGUAGES}
+    return [name for name in dict.fromkeys(names) if name not in translated]
+
+
+def translated_collection(collection_name: str, lang: Optional[str]) -> Optional[str]:
+    """
+    사전 번역 컬렉션명 (pdf_importer --languages 로 만든 경우만, 없으면 None)
+    """
+    if lang not in TRANSLATABLE_LANGUAGES:
+        return None
+    name = translated_collection_name(collection_name, lang)
+    return name if collection_exists(name) else None
+
+
+def resolve_collection(collection_name: Optional[str]) -> str:
+    """
+    요청의 컬렉션 이름 검증 (없으면 기본 컬렉션)
+    - 목록에 없는 컬렉션으로 PGVector를 만들면 빈 컬렉션이 생기므로 거부
+    """
+    if not collection_name:
+        return COLLECTION_NAME
+    if not COLLECTION_NAME_PATTERN.fullmatch(collection_name) or collection_name not in list_collections():
+        raise ValueError(f"알 수 없는 컬렉션: {collection_name}")
+    return collection_name
+
+
+def _release(entry: CollectionEntry):
+    """세대의 메모리 리소스 해제 (잠금 안에서 호출)"""
+    _draining.discard(entry)
+    unload_chunks(entry.generation)
+    unload_quantized_index(entry.generation)
+    entry.vector_store = None
+
+
+def _retire(entry: CollectionEntry):
+    """세대 사용 중지: 검색 중인 요청이 없으면 바로, 있으면 마지막 요청이 끝날 때 해제 (잠금 안에서 호출)"""
+    entry.retired = True
+    if entry.leases == 0:
+        _release(entry)
+    else:
+        _draining.add(entry)
+
+
+def _evict_over_budget(keep: str):
+    """예산을 넘는 동안 가장 오래 안 쓴 컬렉션부터 해제 (기본 컬렉션과 방금 쓴 컬렉션 제외)"""
+    budget = COLLECTION_MEMORY_BUDGET_MB * 1024 * 1024
+    total = sum(entry.nbytes for entry in _entries.values())
+    for name in list(_entries):
+        if total <= budget:
+            break
+        if name in (COLLECTION_NAME, keep):
+            continue
+        entry = _entries.pop(name)
+        _retire(entry)
+        total -= entry.nbytes
+        print(f"♻️ 컬렉션 해제: {name} ({entry.nbytes // 1024}KB, 메모리 예산 {COLLECTION_MEMORY_BUDGET_MB:g}MB)")
+
+
+def _load_generation(collection_name: str, generation: str) -> CollectionEntry:
+    """
+    세대 하나를 요청에서 쓰기 전에 모두 로드
+    - PGVector 인스턴스 (공유 임베딩 모델 + 공유 연결 풀)
+    - 청크 저장소와 로컬 벡터 인덱스 (크기 측정)
+    """
+    try:
+        vector_store = create_pgvector(generation)
+    except Exception as e:
+        print(f"⚠️ 컬렉션 벡터 스토어 연결 실패 ({generation}): {e}")
+        vector_store = None
+
+    load_chunks(generation)
+    if VECTOR_BACKEND in QUANTIZED_BACKENDS and get_quantized_index(generation) is None:
+        # 양자화 검색으로 import한 세대는 pgvector에 벡터가 없으므로 검색 결과 없음
+        print(f"⚠️ 로컬 벡터 인덱스({VECTOR_BACKEND})가 없습니다: {generation} (이 형식으로 다시 import 필요)")
+
+    entry = CollectionEntry(collection_name, generation, vector_store)
+    entry.measure()
+    print(f"✅ 컬렉션 로드: {collection_name} [{generation}] ({entry.nbytes // 1024}KB)")
+    return entry
+
+
+def get_collection(collection_name: str) -> CollectionEntry:
+    """
+    컬렉션의 현재 세대 반환 (최초 사용 시 로드)
+
+    처리 과정:
+    1. 이미 로드된 컬렉션이면 최근 사용으로 표시
+       (GENERATION_CHECK_SECONDS가 지났으면 활성 세대 포인터 확인)
+    2. 처음 쓰거나 활성 세대가 바뀌었으면 새 세대를 레지스트리 잠금 밖에서 로드
+       (그동안 다른 요청은 이전 세대로 계속 처리)
+    3. 새 세대로 교체하고 이전 세대는 처리 중인 요청이 끝나면 해제
+    4. 메모리 예산을 넘으면 오래 안 쓴 컬렉션 해제
+    """
+    with _registry_lock:
+        entry = _entries.get(collection_name)
+        if entry is not None:
+            _entries.move_to_end(collection_name)
+            if time.monotonic() - entry.checked_at < GENERATION_CHECK_SECONDS:
+                return entry
+        loading_lock = _loading_locks.setdefault(collection_name, threading.Lock())
+
+    generation = active_generation(collection_name)
+    if entry is not None and entry.generation == generation:
+        entry.checked_at = time.monotonic()
+        return entry
+
+    with loading_lock:
+        # 기다리는 동안 다른 요청이 새 세대를 이미 로드했으면 그대로 사용
+        with _registry_lock:
+            current = _entries.get(collection_name)
+        if current is not None and current.generation == generation:
+            return current
+
+        new_entry = _load_generation(collection_name, generation)
+        with _registry_lock:
+            previous = _entries.get(collection_name)
+            _entries[collection_name] = new_entry
+            _entries.move_to_end(collection_name)
+            if previous is not None:
+                print(f"🔀 컬렉션 세대 교체: {collection_name} {previous.generation} → {generation}")
+                _retire(previous)
+            _evict_over_budget(keep=collection_name)
+        return new_entry
+
+
+@contextmanager
+def lease_collection(collection_name: str):
+    """
+    검색하는 동안 컬렉션 세대를 사용 중으로 표시
+    - 검색 도중 세대가 교체되어도 이 세대의 리소스는 요청이 끝날 때까지 유지
+    - 세대를 받은 뒤 사용 표시 전에 교체/해제되었으면 현재 세대를 다시 받음
+      (사용 중지 확인과 사용 표시를 같은 잠금 안에서 해야 해제된 세대로 검색하지 않음)
+
+    사용 예:
+        with lease_collection(name) as entry:
+            similarity_search_quantized(entry.generation, ...)
+    """
+    while True:
+        entry = get_collection(collection_name)
+        with _registry_lock:
+            if not entry.retired:
+                entry.leases += 1
+                break
+    try:
+        yield entry
+    finally:
+        with _registry_lock:
+            entry.leases -= 1
+            if entry.retired and entry.leases == 0:
+                _release(entry)
+
+
+def reload_collection(collection_name: str):
+    """
+    컬렉션 재import 후 호출: 새 활성 세대를 바로 로드해 교체 (다음 요청부터 새 세대 사용)
+    - 함께 다시 만들어진 사전 번역 컬렉션도 교체, 더 이상 없는 번역 컬렉션은 해제
+    """
+    names = [collection_name] + [translated_collection_name(collection_name, lang) for lang in TRANSLATABLE_LANGUAGES]
+    for name in names:
+        with _registry_lock:
+            entry = _entries.get(name)
+            if entry is None:
+                continue
+            if name != collection_name and not collection_exists(name):
+                _entries.pop(name)
+                _retire(entry)
+                continue
+            entry.checked_at = 0.0
+        get_collection(name)
+
+
+def evict_collections():
+    """기본 컬렉션 외 모든 컬렉션 해제 (메모리 압박 시, 다음 요청에서 다시 로드)"""
+    with _registry_lock:
+        for name in [name for name in _entries if name != COLLECTION_NAME]:
+            _retire(_entries.pop(name))
+
+
+def registry_nbytes() -> int:
+    """로드된 컬렉션 리소스 크기 합계 (해제를 기다리는 이전 세대 포함)"""
+    with _registry_lock:
+        return sum(entry.nbytes for entry in list(_entries.values()) + list(_draining))
+
+
+# 다시 로드할 수 있으므로 가장 먼저 해제
+register_memory_component("collections", registry_nbytes, evict_collections, priority=10)
+
+
+def registry_stats() -> Dict:
+    """로드된 컬렉션과 메모리 사용량 (상태 확인용)"""
+    with _registry_lock:
+        entries = [
+            {"name": entry.name, "generation": entry.generation, "kb": entry.nbytes // 1024, "leases": entry.leases,
+             "retired": entry.retired}
+            for entry in list(reversed(_entries.values())) + list(_draining)
+        ]
+    return {
+        "budget_mb": COLLECTION_MEMORY_BUDGET_MB,
+        "resident_kb": sum(entry["kb"] for entry in entries),
+        "loaded": entries,
+    }
@@ -0,0 +1,222 @@
+# =============================================================================
+# 메모리 예산 (작은 CPU VM에서 OOM 대신 단계적으로 기능 축소)
+# =============================================================================
+# 주요 기능:
+# 1. 메모리를 차지하는 컴포넌트(임베딩 모델, 컬렉션 인덱스, 대화 세션, FAQ 인덱스 등)가
+#    크기 측정 함수와 해제 함수를 등록
+# 2. 백그라운드 스레드가 MEMORY_CHECK_SECONDS마다 프로세스 RSS 확인
+# 3. RSS가 MEMORY_BUDGET_MB x MEMORY_PRESSURE_RATIO를 넘으면
+#    우선순위가 낮은(priority 값이 작은) 컴포넌트부터 해제 (다시 로드 가능한 캐시 먼저)
+# 4. 해제 후에도 예산을 넘으면 메모리를 많이 쓰는 작업(PDF import) 거부
+# 5. /debug/memory: 컴포넌트별 사용량 + RSS + (MEMORY_TRACEMALLOC=1이면) 할당 위치 상위 목록
+#
+# MEMORY_BUDGET_MB=0(기본)이면 측정만 하고 해제하지 않음
+# =============================================================================
+import gc
+import os
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+# 프로세스 메모리 예산 (MB, 0이면 해제하지 않음)
+MEMORY_BUDGET_MB = float(os.getenv("MEMORY_BUDGET_MB", "0"))
+
+# 예산의 이 비율을 넘으면 해제 시작 (해제 후 RSS가 줄어드는 데 여유를 둠)
+MEMORY_PRESSURE_RATIO = float(os.getenv("MEMORY_PRESSURE_RATIO", "0.85"))
+
+# RSS 확인 간격 (초)
+MEMORY_CHECK_SECONDS = float(os.getenv("MEMORY_CHECK_SECONDS", "5"))
+
+# PyTorch 연산 스레드 수 (0이면 기본값 = CPU 코어 수, 스레드마다 작업 버퍼가 생김)
+TORCH_NUM_THREADS = int(os.getenv("TORCH_NUM_THREADS", "0"))
+
+# tracemalloc 사용 여부 (할당 위치 추적, 메모리/속도 부담이 있으므로 조사할 때만)
+MEMORY_TRACEMALLOC = os.getenv("MEMORY_TRACEMALLOC", "0") == "1"
+
+
+class MemoryComponent:
+    """
+    메모리 예산에 등록된 컴포넌트
+    - size_fn: 현재 사용량 추정 (바이트)
+    - evict_fn: 메모리 해제 (None이면 해제 불가, 측정만)
+    - priority: 작을수록 먼저 해제 (다시 로드하기 쉬운 캐시일수록 작게)
+    """
+
+    def __init__(self, name: str, size_fn: Callable[[], int], evict_fn: Optional[Callable[[], None]],
+                 priority: int):
+        self.name = name
+        self.size_fn = size_fn
+        self.evict_fn = evict_fn
+        self.priority = priority
+        self.evictions = 0
+
+    def size(self) -> int:
+        """사용량 (측정 실패 시 0)"""
+        try:
+            return int(self.size_fn())
+        except Exception as e:
+            print(f"⚠️ 메모리 측정 실패 ({self.name}): {e}")
+            return 0
+
+
+_components: Dict[str, MemoryComponent] = {}
+_components_lock = threading.Lock()
+_monitor: Optional[threading.Thread] = None
+_over_budget = False
+
+
+def register_memory_component(name: str, size_fn: Callable[[], int],
+                              evict_fn: Optional[Callable[[], None]] = None, priority: int = 100):
+    """
+    컴포넌트 등록 (같은 이름이면 교체)
+
+    사용 예:
+        register_memory_component("sessions", sessions_nbytes, trim_sessions, priority=30)
+    """
+    with _components_lock:
+        _components[name] = MemoryComponent(name, size_fn, evict_fn, priority)
+
+
+def current_rss_bytes() -> int:
+    """현재 프로세스 RSS (Linux /proc 기준, 없으면 최대 RSS)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def limit_torch_threads():
+    """PyTorch 연산 스레드 수 제한 (임베딩 모델 로드 전에 호출, torch가 없으면 무시)"""
+    if not TORCH_NUM_THREADS:
+        return
+    try:
+        import torch
+        torch.set_num_threads(TORCH_NUM_THREADS)
+        print(f"🧵 PyTorch 스레드 수: {TORCH_NUM_THREADS}")
+    except ImportError:
+        pass
+
+
+def _trim_heap():
+    """해제된 메모리를 운영체제에 반환 (glibc malloc_trim, 다른 환경에서는 무시)"""
+    gc.collect()
+    try:
+        import ctypes
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except Exception:
+        pass
+
+
+def memory_pressure() -> bool:
+    """해제 후에도 예산을 넘은 상태인지 (메모리를 많이 쓰는 작업을 거부할 때 사용)"""
+    return _over_budget
+
+
+def relieve_memory_pressure(force: bool = False) -> List[str]:
+    """
+    메모리 압박 시 컴포넌트 해제
+
+    처리 과정:
+    1. RSS가 예산 x MEMORY_PRESSURE_RATIO 이하면 종료 (force면 바로 해제)
+    2. priority가 작은 컴포넌트부터 하나씩 해제하고 RSS 다시 확인
+    3. 모두 해제해도 예산을 넘으면 압박 상태로 표시
+
+    Returns:
+        해제한 컴포넌트 이름 목록
+    """
+    global _over_budget
+    budget = MEMORY_BUDGET_MB * 1024 * 1024
+    if not budget and not force:
+        return []
+    threshold = budget * MEMORY_PRESSURE_RATIO
+    if not force and current_rss_bytes() <= threshold:
+        _over_budget = False
+        return []
+
+    with _components_lock:
+        evictable = sorted((c for c in _components.values() if c.evict_fn), key=lambda c: c.priority)
+    evicted = []
+    for component in evictable:
+        before = component.size()
+        try:
+            component.evict_fn()
+        except Exception as e:
+            print(f"⚠️ 메모리 해제 실패 ({component.name}): {e}")
+            continue
+        component.evictions += 1
+        evicted.append(component.name)
+        _trim_heap()
+        rss = current_rss_bytes()
+        print(f"♻️ 메모리 해제: {component.name} (약 {before // 1024}KB, RSS {rss // 1024 // 1024}MB)")
+        if not force and rss <= threshold:
+            break
+
+    _over_budget = bool(budget) and current_rss_bytes() > budget
+    if _over_budget:
+        print(f"⚠️ 메모리 예산 초과: RSS {current_rss_bytes() // 1024 // 1024}MB > {MEMORY_BUDGET_MB:g}MB")
+    return evicted
+
+
+def _monitor_loop():
+    """메모리 확인 스레드"""
+    while True:
+        time.sleep(MEMORY_CHECK_SECONDS)
+        try:
+            relieve_memory_pressure()
+        except Exception as e:
+            print(f"⚠️ 메모리 확인 오류: {e}")
+
+
+def start_memory_monitor():
+    """서버 시작 시 호출: tracemalloc 시작(설정 시), 예산이 있으면 확인 스레드 시작"""
+    global _monitor
+    if MEMORY_TRACEMALLOC and not tracemalloc.is_tracing():
+        tracemalloc.start(10)
+    if MEMORY_BUDGET_MB and _monitor is None:
+        _monitor = threading.Thread(target=_monitor_loop, name="memory-monitor", daemon=True)
+        _monitor.start()
+        print(f"🧮 메모리 예산: {MEMORY_BUDGET_MB:g}MB (해제 시작 {MEMORY_PRESSURE_RATIO:.0%})")
+
+
+def memory_report(top: int = 10) -> Dict:
+    """
+    메모리 사용 현황 (/debug/memory 응답)
+    - components: 컴포넌트별 추정 사용량 (큰 순서)
+    - unaccounted_mb: RSS 중 등록된 컴포넌트로 설명되지 않는 부분 (인터프리터, 라이브러리 등)
+    - allocations: tracemalloc 사용 시 할당 위치 상위 목록
+    """
+    with _components_lock:
+        components = list(_components.values())
+    sizes = sorted(((c, c.size()) for c in components), key=lambda item: -item[1])
+    rss = current_rss_bytes()
+    report = {
+        "rss_mb": round(rss / 1024 / 1024, 1),
+        "budget_mb": MEMORY_BUDGET_MB,
+        "over_budget": _over_budget,
+        "components": [
+            {
+                "name": c.name,
+                "mb": round(size / 1024 / 1024, 2),
+                "evictable": c.evict_fn is not None,
+                "priority": c.priority,
+                "evictions": c.evictions,
+            }
+            for c, size in sizes
+        ],
+        "unaccounted_mb": round(max(0, rss - sum(size for _, size in sizes)) / 1024 / 1024, 1),
+    }
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        stats = tracemalloc.take_snapshot().statistics("lineno")[:top]
+        report["tracemalloc"] = {
+            "current_mb": round(current / 1024 / 1024, 1),
+            "peak_mb": round(peak / 1024 / 1024, 1),
+            "allocations": [
+                {"location": str(stat.traceback[0]), "kb": stat.size // 1024, "count": stat.count}
+                for stat in stats
+            ],
+        }
+    return report
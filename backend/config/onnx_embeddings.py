@@ -0,0 +1,149 @@
+# =============================================================================
+# ONNX Runtime 기반 KURE-v1 임베딩 (CPU 추론 최적화, 선택 사항)
+# =============================================================================
+# 주요 기능:
+# 1. KURE-v1 모델을 ONNX로 변환하고 동적 int8 양자화 적용
+# 2. onnxruntime으로 CPU 추론 (intra-op 스레드 수 조정)
+# 3. LangChain Embeddings 인터페이스 제공 (HuggingFaceEmbeddings 대체)
+#
+# 사용 방법 (backend 디렉터리에서):
+#   pip install onnxruntime onnx
+#   python -m config.onnx_embeddings           # 모델 변환 + 양자화 (최초 1회)
+#   EMBEDDING_BACKEND=onnx python main.py      # ONNX 임베딩으로 서버 실행
+# =============================================================================
+import os
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+EMBEDDING_MODEL_NAME = 'nlpai-lab/KURE-v1'
+
+# 변환된 모델 저장 위치
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", os.path.join("data", "onnx", "KURE-v1"))
+ONNX_FP32_PATH = os.path.join(ONNX_MODEL_DIR, "model.onnx")
+ONNX_INT8_PATH = os.path.join(ONNX_MODEL_DIR, "model_int8.onnx")
+
+# onnxruntime 스레드 설정 (기본: CPU 코어 수 / 요청 간 병렬은 FastAPI가 담당하므로 inter-op 1)
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", str(os.cpu_count() or 1)))
+ONNX_INTER_OP_THREADS = int(os.getenv("ONNX_INTER_OP_THREADS", "1"))
+
+MAX_SEQ_LENGTH = 512   # 청크 최대 256 토큰 + 섹션 제목 여유
+BATCH_SIZE = 32
+
+
+def export_onnx_model(quantize: bool = True) -> str:
+    """
+    KURE-v1을 ONNX로 변환하고 (선택) 동적 int8 양자화 적용
+
+    처리 과정:
+    1. transformers로 모델/토크나이저 로드
+    2. torch.onnx.export로 변환 (batch, sequence 축은 동적)
+    3. onnxruntime.quantization.quantize_dynamic으로 가중치 int8 양자화
+
+    Returns:
+        str: 사용할 ONNX 모델 경로
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    os.makedirs(ONNX_MODEL_DIR, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(EMBEDDING_MODEL_NAME)
+    model = AutoModel.from_pretrained(EMBEDDING_MODEL_NAME)
+    model.eval()
+    tokenizer.save_pretrained(ONNX_MODEL_DIR)
+    print("*****모델 로드 완료.")
+
+    sample = tokenizer(["명지전문대학 휴학 신청 방법"], return_tensors="pt")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            ONNX_FP32_PATH,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "last_hidden_state": {0: "batch", 1: "sequence"},
+            },
+            opset_version=17,
+        )
+    print(f"*****ONNX 변환 완료: {ONNX_FP32_PATH}")
+
+    if not quantize:
+        return ONNX_FP32_PATH
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    # KURE-v1(XLM-R large 기반)은 float32 가중치가 2GB를 넘으므로 외부 데이터 형식 사용
+    quantize_dynamic(ONNX_FP32_PATH, ONNX_INT8_PATH, weight_type=QuantType.QInt8,
+                     use_external_data_format=True)
+    print(f"*****동적 int8 양자화 완료: {ONNX_INT8_PATH}")
+    return ONNX_INT8_PATH
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    onnxruntime으로 실행하는 KURE-v1 임베딩
+    - CLS 토큰 풀링 + L2 정규화 (sentence-transformers 설정과 동일)
+    - 길이가 비슷한 문장끼리 배치로 묶어 패딩 낭비를 줄임
+    """
+
+    def __init__(self, model_path: str = None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_path = model_path or (ONNX_INT8_PATH if os.path.exists(ONNX_INT8_PATH) else ONNX_FP32_PATH)
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = ONNX_INTRA_OP_THREADS
+        options.inter_op_num_threads = ONNX_INTER_OP_THREADS
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self.model_path = model_path
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.tokenizer = AutoTokenizer.from_pretrained(ONNX_MODEL_DIR)
+        print(f"✅ ONNX 임베딩 로드: {model_path} (intra-op 스레드 {ONNX_INTRA_OP_THREADS})")
+
+    @property
+    def nbytes(self) -> int:
+        """
+        모델 가중치 크기 (메모리 예산 측정용)
+        - onnxruntime 세션은 가중치를 모두 메모리에 올리므로 모델 파일 + 외부 데이터 파일 크기로 계산
+        """
+        paths = [self.model_path, self.model_path + ".data"]
+        return sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """배치 하나를 임베딩 (CLS 풀링 + 정규화)"""
+        encoded = self.tokenizer(texts, padding=True, truncation=True,
+                                 max_length=MAX_SEQ_LENGTH, return_tensors="np")
+        outputs = self.session.run(None, {
+            "input_ids": encoded["input_ids"].astype(np.int64),
+            "attention_mask": encoded["attention_mask"].astype(np.int64),
+        })
+        cls = outputs[0][:, 0]
+        return cls / np.clip(np.linalg.norm(cls, axis=1, keepdims=True), 1e-12, None)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """문서 임베딩 (길이순 정렬 후 배치 처리, 원래 순서로 복원)"""
+        if not texts:
+            return []
+        order = np.argsort([len(text) for text in texts])
+        results = [None] * len(texts)
+        for start in range(0, len(texts), BATCH_SIZE):
+            batch_index = order[start:start + BATCH_SIZE]
+            vectors = self._embed_batch([texts[i] for i in batch_index])
+            for i, vector in zip(batch_index, vectors):
+                results[i] = vector.tolist()
+        return results
+
+    def embed_query(self, text: str) -> List[float]:
+        """질문 임베딩"""
+        return self._embed_batch([text])[0].tolist()
+
+# =============================================================================
+# 스크립트 직접 실행 시
+# =============================================================================
+if __name__ == "__main__":
+    # KURE-v1 ONNX 변환 + 동적 int8 양자화
+    export_onnx_model()
@@ -1,34 +1,78 @@
+import os
+import sqlalchemy
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import PGVector
-from pdf_importer import CONNECTION_STRING, COLLECTION_NAME
-
-# 벡터 스토어 초기화 (RAG 시스템의 핵심)
-vector_store = None
-
-def get_vector_store():
-    """벡터 스토어 인스턴스 반환"""
-    global vector_store
-    if vector_store is None:
-        initialize_vector_store()
-    return vector_store
-
-def initialize_vector_store():
-    """벡터 스토어 초기화"""
-    global vector_store
-    try:
-        # 한국어 특화 임베딩 모델 로드 (KURE-v1)
+from pdf_importer import CONNECTION_STRING
+from config.memory_budget import limit_torch_threads, register_memory_component
+
+# 임베딩 모델 (벡터 스토어, FAQ 인덱스 등에서 공유)
+embeddings = None
+
+# DB 연결 풀 (모든 컬렉션의 벡터 스토어가 공유)
+engine = None
+
+# 연결 풀 크기 (컬렉션 수와 무관하게 고정)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+
+# 임베딩 백엔드: huggingface(기본) / onnx (config/onnx_embeddings.py, 사전 변환 필요)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "huggingface")
+
+def get_embeddings():
+    """
+    임베딩 모델 인스턴스 반환
+    - 모델 로드 비용이 크므로 프로세스 전체에서 하나만 사용
+    """
+    global embeddings
+    if embeddings is None and EMBEDDING_BACKEND == "onnx":
+        # ONNX Runtime + int8 양자화 모델 (변환된 모델이 없으면 기본 모델 사용)
+        try:
+            from config.onnx_embeddings import OnnxEmbeddings
+            embeddings = OnnxEmbeddings()
+        except Exception as e:
+            print(f"⚠️ ONNX 임베딩 로드 실패, 기본 모델 사용: {e}")
+            print("📝 ONNX 모델을 먼저 변환해주세요: python -m config.onnx_embeddings")
+    if embeddings is None:
+        # 한국어 특화 임베딩 모델 로드 (KURE-v1, TORCH_NUM_THREADS 설정 시 스레드 수 제한)
+        limit_torch_threads()
         embeddings = HuggingFaceEmbeddings(
             model_name='nlpai-lab/KURE-v1',  # 한국어 임베딩 모델
             model_kwargs={'device': 'cpu'}   # CPU 사용 (GPU 있으면 'cuda'로 변경)
         )
-        # PostgreSQL + pgvector를 사용한 벡터 데이터베이스 연결
-        vector_store = PGVector(
-            collection_name=COLLECTION_NAME,     # 컬렉션명: "mjc_homepage"
-            connection_string=CONNECTION_STRING, # PostgreSQL 연결 문자열
-            embedding_function=embeddings        # 임베딩 함수
+    return embeddings
+
+def embeddings_nbytes() -> int:
+    """임베딩 모델 가중치 크기 (PyTorch 파라미터 또는 ONNX 모델 파일, 로드 전이면 0)"""
+    if hasattr(embeddings, "nbytes"):
+        return embeddings.nbytes
+    client = getattr(embeddings, "client", None)
+    if client is None or not hasattr(client, "parameters"):
+        return 0
+    return sum(p.numel() * p.element_size() for p in client.parameters())
+
+# 모든 요청이 쓰므로 해제하지 않음 (측정만)
+register_memory_component("embedder", embeddings_nbytes)
+
+def get_engine():
+    """
+    SQLAlchemy 엔진 반환
+    - PGVector는 인스턴스마다 엔진(연결 풀)을 만들므로, 컬렉션별 인스턴스가 하나의 풀을 쓰도록 공유
+    """
+    global engine
+    if engine is None:
+        engine = sqlalchemy.create_engine(
+            CONNECTION_STRING,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_pre_ping=True,  # 끊어진 연결 자동 재연결
         )
-        print("✅ LangChain 벡터 스토어 연결 성공")
-    except Exception as e:
-        print(f"⚠️ 벡터 스토어 연결 실패: {e}")
-        print("📝 PDF 데이터를 먼저 import 해주세요: python pdf_importer.py")
-        vector_store = None
+    return engine
+
+def create_pgvector(collection_name: str) -> PGVector:
+    """공유 임베딩 모델과 연결 풀을 사용하는 PGVector 인스턴스 생성"""
+    return PGVector(
+        collection_name=collection_name,     # 컬렉션명 (학과별 문서)
+        connection_string=CONNECTION_STRING, # PostgreSQL 연결 문자열
+        embedding_function=get_embeddings(), # 임베딩 함수 (공유 인스턴스)
+        connection=get_engine(),             # 연결 풀 (공유 인스턴스)
+    )
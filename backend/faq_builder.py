@@ -0,0 +1,94 @@
+# =============================================================================
+# FAQ 답변 인덱스를 생성하는 오프라인 작업
+# =============================================================================
+# 주요 기능:
+# 1. 자주 묻는 질문 목록 로드 (data/faq_questions.json)
+# 2. ChatService 전체 파이프라인으로 한국어 답변 생성 (RAG + Gemini)
+# 3. 질문과 답변을 지원 언어(영어, 베트남어, 미얀마어)로 번역
+# 4. 질문 임베딩 + 다국어 답변을 data/faq_index/ 에 저장
+# =============================================================================
+import asyncio
+
+import numpy as np
+
+from config.vector_store import get_embeddings
+from models.chat_models import ChatMessage
+from services.chat_service import ChatService
+from services.translator_service import TranslationService
+from services.unified_prompt_service import UnifiedPromptService
+from utils.faq_index import FAQ_LANGUAGES, load_faq_index, load_faq_questions, save_faq_index
+
+
+def build_faq_index(chat_service: ChatService = None) -> bool:
+    """
+    FAQ 답변 인덱스를 생성하는 메인 함수
+
+    처리 과정:
+    1. FAQ 질문 목록 로드
+    2. 각 질문을 ChatService로 처리하여 한국어 답변 생성
+       (대화 히스토리와 기존 FAQ 인덱스는 사용하지 않음)
+    3. 질문/답변을 지원 언어로 번역 (번역에 실패한 언어는 건너뜀)
+    4. 모든 언어의 질문 변형을 한 번에 임베딩하여 인덱스 저장
+
+    Returns:
+        bool: 인덱스 생성 성공 여부
+    """
+    questions = load_faq_questions()
+    if not questions:
+        return False
+    print(f"*****FAQ 질문 {len(questions)}개 로드 완료.")
+
+    if chat_service is None:
+        chat_service = ChatService(TranslationService(), UnifiedPromptService())
+    translation_service = chat_service.translation_service
+
+    rows = []
+    answers = {}
+    for i, question in enumerate(questions):
+        faq_id = f"faq-{i}"
+
+        # 2단계: 전체 파이프라인으로 한국어 답변 생성
+        result = asyncio.run(chat_service.process_chat(
+            ChatMessage(message=question), use_history=False, use_faq=False, record=False
+        ))
+        if not result.success:
+            print(f"⚠️ 답변 생성 실패, 건너뜀: {question}")
+            continue
+
+        # 3단계: 질문/답변 다국어 변형 생성
+        answers[faq_id] = {'ko': result.response}
+        rows.append({'faq_id': faq_id, 'lang': 'ko', 'question': question})
+        for lang in FAQ_LANGUAGES:
+            if lang == 'ko':
+                continue
+            # 번역 실패 시 한국어 원문이 그 언어 답변으로 저장되지 않도록 이 언어만 건너뜀
+            # (그 언어 질문은 FAQ 대신 일반 파이프라인으로 처리)
+            try:
+                translated_answer = translation_service.translate(result.response, lang)
+                translated_question = translation_service.translate(question, lang)
+            except Exception as e:
+                print(f"⚠️ FAQ 번역 실패, {lang} 건너뜀: {question} ({e})")
+                continue
+            answers[faq_id][lang] = translated_answer
+            rows.append({'faq_id': faq_id, 'lang': lang, 'question': translated_question})
+        print(f"📄 FAQ {i + 1}/{len(questions)}: {question}")
+
+    if not rows:
+        print("❌ 생성된 FAQ 답변이 없습니다.")
+        return False
+
+    # 4단계: 질문 임베딩 (L2 정규화하여 내적 = 코사인 유사도)
+    vectors = np.asarray(get_embeddings().embed_documents([row['question'] for row in rows]), dtype=np.float32)
+    vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+    print("*****FAQ 질문 임베딩 완료.")
+
+    save_faq_index(vectors, rows, answers)
+    load_faq_index()
+    return True
+
+# =============================================================================
+# 스크립트 직접 실행 시
+# =============================================================================
+if __name__ == "__main__":
+    # FAQ 답변 인덱스 생성
+    build_faq_index()
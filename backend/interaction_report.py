@@ -0,0 +1,162 @@
+# =============================================================================
+# 질문/답변 기록 분석 리포트
+# =============================================================================
+# 주요 기능:
+# 1. 자주 묻는 질문 순위 (정규화된 질문 기준, FAQ 캐시 적중 여부 포함)
+# 2. 단계별 소요 시간 (평균 / p50 / p95) 과 가장 느린 요청
+# 3. 캐시 적중 기회: 자주 묻지만 FAQ 인덱스에 없는 질문 (data/faq_questions.json 추가 후보)
+#
+# 실행 방법 (backend 디렉터리에서):
+#   python interaction_report.py
+#   python interaction_report.py --days 7 --top 30
+# =============================================================================
+import argparse
+import json
+import os
+import sqlite3
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+import numpy as np
+
+from utils.faq_index import load_faq_questions, normalize_question
+from utils.interaction_log import INTERACTION_LOG_PATH
+
+# 실제 단계가 아니라 ChatService._prepare가 계산한 값 (단계별 표와 가장 느린 단계에서 제외)
+# - prepare: 번역/맥락/검색 병렬 구간의 실제 소요 시간
+# - overlap_saved: 순차 실행 대비 줄어든 시간
+DERIVED_STAGES = ("prepare", "overlap_saved")
+
+
+def load_interactions(path: str, days: float) -> List[Dict]:
+    """기간 내 기록 로드 (JSON 컬럼은 파싱)"""
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    connection.row_factory = sqlite3.Row
+    since = time.time() - days * 86400 if days else 0
+    rows = connection.execute("SELECT * FROM interactions WHERE ts >= ? ORDER BY ts", (since,)).fetchall()
+    connection.close()
+
+    records = []
+    for row in rows:
+        record = dict(row)
+        record["chunk_ids"] = json.loads(record["chunk_ids"] or "null") or []
+        record["stage_ms"] = json.loads(record["stage_ms"] or "null") or {}
+        records.append(record)
+    return records
+
+
+def report_overview(records: List[Dict]):
+    """전체 요약 (요청 수, 성공률, 언어별, 캐시 결과별)"""
+    if not records:
+        print("\n📊 요청 0개")
+        return
+    total_ms = [r["total_ms"] for r in records if r["total_ms"] is not None]
+    success = sum(1 for r in records if r["success"])
+    # 모든 요청이 실패한 경우 등 응답 시간 기록이 없으면 백분위 생략
+    latency = (f"응답 시간 p50 {np.percentile(total_ms, 50):.0f}ms / p95 {np.percentile(total_ms, 95):.0f}ms"
+               if total_ms else "응답 시간 기록 없음")
+    print(f"\n📊 요청 {len(records)}개 (성공 {success / len(records):.1%}), {latency}")
+    languages = Counter(r["language"] or "-" for r in records)
+    caches = Counter(r["cache"] or "-" for r in records)
+    print("   언어: " + ", ".join(f"{lang} {count}" for lang, count in languages.most_common()))
+    print("   FAQ 캐시: " + ", ".join(f"{cache} {count}" for cache, count in caches.most_common()))
+    tokens = [(r["prompt_tokens"] or 0) + (r["output_tokens"] or 0) for r in records if r["prompt_tokens"]]
+    if tokens:
+        print(f"   LLM 토큰: 요청당 평균 {np.mean(tokens):.0f} (합계 {sum(tokens)})")
+
+
+def report_top_questions(records: List[Dict], top: int):
+    """자주 묻는 질문 순위"""
+    groups = defaultdict(list)
+    for record in records:
+        groups[normalize_question(record["question"])].append(record)
+
+    print(f"\n🔝 자주 묻는 질문 (상위 {top}개)")
+    print(f"{'횟수':>5}{'FAQ 적중':>9}{'평균 ms':>9}  질문")
+    for key, group in sorted(groups.items(), key=lambda item: -len(item[1]))[:top]:
+        hits = sum(1 for r in group if r["cache"] == "hit")
+        mean_ms = np.mean([r["total_ms"] or 0 for r in group])
+        print(f"{len(group):>5}{hits:>9}{mean_ms:>9.0f}  {group[-1]['question'][:60]}")
+
+
+def report_stages(records: List[Dict], top: int):
+    """단계별 소요 시간과 가장 느린 요청"""
+    stages = defaultdict(list)
+    for record in records:
+        for stage, ms in record["stage_ms"].items():
+            if stage not in DERIVED_STAGES:
+                stages[stage].append(ms)
+
+    print("\n🐢 단계별 소요 시간 (ms)")
+    print(f"{'단계':<20}{'횟수':>7}{'평균':>9}{'p50':>9}{'p95':>9}{'합계 비중':>10}")
+    overall = sum(sum(values) for values in stages.values()) or 1
+    for stage, values in sorted(stages.items(), key=lambda item: -sum(item[1])):
+        print(f"{stage:<20}{len(values):>7}{np.mean(values):>9.0f}{np.percentile(values, 50):>9.0f}"
+              f"{np.percentile(values, 95):>9.0f}{sum(values) / overall:>10.1%}")
+
+    saved = [r["stage_ms"]["overlap_saved"] for r in records if "overlap_saved" in r["stage_ms"]]
+    if saved:
+        prepare = [r["stage_ms"]["prepare"] for r in records if "prepare" in r["stage_ms"]]
+        print(f"   번역/검색 병렬 실행: 구간 평균 {np.mean(prepare):.0f}ms, "
+              f"순차 실행 대비 평균 {np.mean(saved):.0f}ms 단축 (p95 {np.percentile(saved, 95):.0f}ms)")
+
+    print(f"\n⏱️ 가장 느린 요청 (상위 {min(top, 10)}개)")
+    slowest = sorted((r for r in records if r["total_ms"] is not None), key=lambda r: -r["total_ms"])[:min(top, 10)]
+    for record in slowest:
+        # 병렬 구간 전체(prepare)나 단축 시간(overlap_saved)이 아닌 실제 단계 중 가장 느린 단계
+        stages = [(stage, ms) for stage, ms in record["stage_ms"].items() if stage not in DERIVED_STAGES]
+        slowest_stage = max(stages, key=lambda item: item[1], default=("-", 0))
+        print(f"{record['total_ms']:>8.0f}ms  [{slowest_stage[0]} {slowest_stage[1]:.0f}ms]  {record['question'][:60]}")
+
+
+def report_cache_opportunities(records: List[Dict], top: int, min_count: int):
+    """
+    캐시 적중 기회
+    - FAQ 캐시를 놓친(miss) 질문 중 반복된 질문
+    - 이미 FAQ 목록에 있는 질문은 제외 (표현만 다른 경우는 임계값 조정 대상)
+    """
+    faq_keys = {normalize_question(question) for question in load_faq_questions()}
+    groups = defaultdict(list)
+    for record in records:
+        if record["cache"] == "miss" and record["success"]:
+            groups[normalize_question(record["question"])].append(record)
+
+    candidates = [(key, group) for key, group in groups.items()
+                  if len(group) >= min_count and key not in faq_keys]
+    candidates.sort(key=lambda item: -sum(r["total_ms"] or 0 for r in item[1]))
+
+    print(f"\n💡 캐시 적중 기회 (FAQ 미적중 {min_count}회 이상, 절약 가능 시간 순)")
+    if not candidates:
+        print("   없음")
+        return
+    print(f"{'횟수':>5}{'절약 ms':>10}  질문 → data/faq_questions.json 추가 후보")
+    for key, group in candidates[:top]:
+        saved_ms = sum(r["total_ms"] or 0 for r in group)
+        print(f"{len(group):>5}{saved_ms:>10.0f}  {group[-1]['question'][:60]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="질문/답변 기록 분석 리포트")
+    parser.add_argument("--path", default=INTERACTION_LOG_PATH, help="로그 DB 경로")
+    parser.add_argument("--days", type=float, default=0, help="최근 N일만 분석 (기본: 전체)")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--min-count", type=int, default=3, help="캐시 후보로 볼 최소 반복 횟수")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"Error: interaction log not found at {args.path}")
+        return
+    records = load_interactions(args.path, args.days)
+    if not records:
+        print("기록 없음")
+        return
+
+    report_overview(records)
+    report_top_questions(records, args.top)
+    report_stages(records, args.top)
+    report_cache_opportunities(records, args.top, args.min_count)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,19 +10,25 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import os
 from dotenv import load_dotenv
 
 # 모듈화된 컴포넌트들 import
 from api.chat_routes import router as chat_router
 from api.pdf_routes import router as pdf_router
-from config.vector_store import initialize_vector_store
+from api.admin_routes import router as admin_router, debug_router
+from api.compression import CompressionMiddleware
+from config.collection_registry import get_collection
+from config.memory_budget import start_memory_monitor
+from pdf_importer import COLLECTION_NAME
+from utils.faq_index import load_faq_index
 
 # 환경 변수 로드 (.env 파일에서 API 키, DB 설정 등)
 load_dotenv()
 
-# FastAPI 애플리케이션 초기화
-app = FastAPI()
+# FastAPI 애플리케이션 초기화 (orjson으로 JSON 직렬화)
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # CORS 설정 - 프론트엔드에서 API 호출 허용
 app.add_middleware(
@@ -33,12 +39,23 @@ app.add_middleware(
     allow_headers=["*"],        # 모든 헤더 허용
 )
 
-# 벡터 스토어 초기화
-initialize_vector_store()
+# 응답 압축 - Accept-Encoding에 따라 brotli/gzip, 500바이트 미만은 압축 안 함
+app.add_middleware(CompressionMiddleware)
+
+# 벡터 스토어 초기화 (기본 컬렉션의 활성 세대를 미리 로드)
+get_collection(COLLECTION_NAME)
+
+# FAQ 답변 인덱스 로드 (없으면 일반 파이프라인만 사용)
+load_faq_index()
+
+# 메모리 예산 감시 (MEMORY_BUDGET_MB 설정 시 압박을 받으면 캐시부터 해제)
+start_memory_monitor()
 
 # 라우터 등록
 app.include_router(chat_router)
 app.include_router(pdf_router)
+app.include_router(admin_router)
+app.include_router(debug_router)
 
 @app.get("/")
 async def root():
@@ -0,0 +1,7 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class ProfilingSettings(BaseModel):
+    """프로파일링 설정 변경 요청 모델 (없는 값은 유지)"""
+    enabled: Optional[bool] = None  # 비율 샘플링 사용 여부
+    sample_rate: Optional[float] = Field(None, ge=0.0, le=1.0)  # 프로파일링할 요청 비율 (0~1)
@@ -1,8 +1,11 @@
+from typing import Optional
 from pydantic import BaseModel
 
 class ChatMessage(BaseModel):
     """챗봇 API 요청 모델"""
     message: str  # 사용자가 입력한 메시지
+    session_id: Optional[str] = None  # 대화 세션 ID (없으면 기본 세션)
+    collection: Optional[str] = None  # 검색할 학과별 컬렉션 (없으면 기본 컬렉션)
 
 class ChatResponse(BaseModel):
     """챗봇 API 응답 모델"""
@@ -3,87 +3,299 @@
 # =============================================================================
 # 주요 기능:
 # 1. PDF 파일을 텍스트로 변환
-# 2. 텍스트를 적절한 크기로 분할
+# 2. 텍스트를 문서 구조에 맞춰 토큰 수 기준으로 분할
 # 3. 한국어 임베딩 모델로 벡터화
-# 4. PostgreSQL + pgvector에 저장
+# 4. PostgreSQL + pgvector에 저장 (VECTOR_BACKEND=pgvector)
+# 5. 로컬 양자화 인덱스(float32 / int8 / binary 중 VECTOR_BACKEND 형식만) 저장
+# 6. (선택) 청크를 영어/베트남어/미얀마어로 번역한 언어별 컬렉션 저장
+# 7. 새 세대로 저장한 뒤 활성 세대 교체 (서버 무중단 재import)
+# 8. 페이지 반복 요소(머리글/바닥글/경로 표시줄) 제거, 거의 같은 청크는 임베딩 생략
 # =============================================================================
+import argparse
+import glob
 import os
+import re
+import numpy as np
 from langchain_community.document_loaders import PyPDFLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings 
 from langchain_community.vectorstores import PGVector
 from dotenv import load_dotenv
+from utils.text_chunker import chunk_documents, count_tokens, CHUNK_MAX_TOKENS
+from utils.chunk_store import save_chunks
+from utils.quantized_index import QUANTIZED_BACKENDS, VECTOR_BACKEND, build_quantized_index
+from utils.dedup import mark_near_duplicates, strip_boilerplate, unique_chunks
+from utils.index_generations import (
+    activate_generation, collection_exists, deactivate_collection, delete_generation_files, new_generation_name,
+)
 
 # 환경 변수 로드
 load_dotenv()
 
 # PostgreSQL 데이터베이스 연결 정보 설정
 CONNECTION_STRING = f"postgresql+psycopg2://{os.getenv('POSTGRES_USER')}:{os.getenv('POSTGRES_PASSWORD')}@{os.getenv('POSTGRES_HOST')}:{os.getenv('POSTGRES_PORT')}/{os.getenv('POSTGRES_DB')}"
-COLLECTION_NAME = "mjc_homepage"  # 벡터 저장소 컬렉션명
+COLLECTION_NAME = "mjc_homepage"  # 벡터 저장소 컬렉션명 (기본 컬렉션)
 
-def create_vector_store():
+# 사전 번역 컬렉션을 만들 수 있는 언어 / 기본으로 만들 언어 (쉼표 구분, 예: "en,vi,my")
+TRANSLATABLE_LANGUAGES = ['en', 'vi', 'my']
+INDEX_LANGUAGES = [lang.strip() for lang in os.getenv("INDEX_LANGUAGES", "").split(",") if lang.strip()]
+
+# 기본 컬렉션의 PDF 파일
+DEFAULT_PDF_PATH = os.path.join("data", "명지전문대학 _ 학부_학과안내 _ 공학ㆍ정보학부 _ AI게임소프트웨어학과 _ 학과소개.pdf")
+
+# 컬렉션 이름 규칙 (파일 경로/DB 이름으로 쓰이므로 제한, 세대 구분자 '@'는 쓸 수 없음)
+COLLECTION_NAME_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_\-]{0,62}")
+
+def validate_collection_name(collection_name: str) -> str:
+    """
+    import할 컬렉션 이름 확인 (잘못된 이름이면 ValueError)
+    - data/<컬렉션>/, data/index/<세대>/, PGVector 컬렉션명으로 쓰이므로 "."이나 "../x" 등은 거부
+    - <컬렉션>_en 등 사전 번역 컬렉션과 겹치는 이름도 거부
+    """
+    if not COLLECTION_NAME_PATTERN.fullmatch(collection_name or ""):
+        raise ValueError(f"잘못된 컬렉션 이름: {collection_name!r} (영문/숫자/_/- 최대 63자)")
+    if any(collection_name.endswith(f"_{lang}") for lang in TRANSLATABLE_LANGUAGES):
+        raise ValueError(f"사전 번역 컬렉션과 겹치는 이름입니다: {collection_name}")
+    return collection_name
+
+def collection_pdf_paths(collection_name: str):
+    """
+    컬렉션의 PDF 파일 목록
+    - 기본 컬렉션: DEFAULT_PDF_PATH
+    - 학과별 컬렉션: data/<컬렉션명>/*.pdf
+    """
+    if collection_name == COLLECTION_NAME:
+        return [DEFAULT_PDF_PATH]
+    return sorted(glob.glob(os.path.join("data", collection_name, "*.pdf")))
+
+def translated_collection_name(collection_name: str, lang: str) -> str:
+    """사전 번역 컬렉션명 (예: mjc_homepage_en)"""
+    return f"{collection_name}_{lang}"
+
+def create_vector_store(collection_name: str = COLLECTION_NAME, pdf_paths=None, languages=None):
     # 독스트링 (함수 설명서)
     """
     PDF 문서를 벡터 데이터베이스로 변환하는 메인 함수
     
     처리 과정:
-    1. PDF 파일 로드 및 텍스트 추출
-    2. 텍스트를 적절한 크기로 분할 (chunking)
+    1. PDF 파일 로드 및 텍스트 추출 (페이지마다 반복되는 머리글/바닥글 제거)
+    2. 문서 구조(제목/표/목록)를 고려해 토큰 수 기준으로 분할 (chunking)
+       거의 같은 청크는 중복으로 표시 (청크 저장소에만 저장, 임베딩 생략)
     3. 한국어 임베딩 모델로 벡터화
-    4. PostgreSQL + pgvector에 저장
+    4. PostgreSQL + pgvector에 저장 (VECTOR_BACKEND=pgvector)
+    5. 로컬 양자화 인덱스 저장 (VECTOR_BACKEND=float32/int8/binary, 이 경우 4단계 생략)
+    6. (선택) 청크를 영어/베트남어/미얀마어로 번역해 언어별 컬렉션으로 저장
+       (번역에 실패한 언어는 건너뛰고 이전 번역 컬렉션도 사용 중지)
+    7. 활성 세대 교체 후 오래된 세대 삭제
+    
+    무중단 재import:
+    - 3~6단계는 새 세대(<컬렉션>@<시각>)에 따로 만들고, 서버는 그동안 이전 세대로 계속 응답
+    - 모든 세대가 완성된 뒤에만 활성 세대 포인터를 교체 (중간에 실패하면 이전 세대 유지)
+    
+    Args:
+        collection_name: 저장할 컬렉션명 (학과별 컬렉션, 기본: mjc_homepage)
+        pdf_paths: PDF 파일 목록 (없으면 collection_pdf_paths 사용)
+        languages: 사전 번역할 언어 목록 (en, vi, my / 없으면 INDEX_LANGUAGES)
     
     Returns:
         PGVector: 벡터 저장소 객체 (성공 시)
         None: 실패 시
+    
+    Raises:
+        ValueError: 컬렉션 이름이 규칙에 맞지 않을 때 (validate_collection_name)
     """
+    validate_collection_name(collection_name)
     
     # 1단계: PDF 파일 로드 및 텍스트 추출
-    pdf_path = os.path.join("data", "명지전문대학 _ 학부_학과안내 _ 공학ㆍ정보학부 _ AI게임소프트웨어학과 _ 학과소개.pdf")
-    if not os.path.exists(pdf_path):
-        print(f"Error: PDF file not found at {pdf_path}")
+    pdf_paths = pdf_paths or collection_pdf_paths(collection_name)
+    missing = [pdf_path for pdf_path in pdf_paths if not os.path.exists(pdf_path)]
+    if not pdf_paths or missing:
+        print(f"Error: PDF file not found at {missing or os.path.join('data', collection_name)}")
         return None
 
     # PyPDFLoader로 PDF 파일을 텍스트로 변환
-    loader = PyPDFLoader(pdf_path)
-    documents = loader.load()
-    print("*****PDF 로드 완료.")
+    documents = []
+    for pdf_path in pdf_paths:
+        documents.extend(PyPDFLoader(pdf_path).load())
+    print(f"*****PDF 로드 완료. ({collection_name}: {len(pdf_paths)}개 파일)")
+
+    # 인쇄 머리글/바닥글, 경로 표시줄 등 모든 페이지에 반복되는 요소 제거
+    documents, boilerplate = strip_boilerplate(documents)
+    print(f"*****반복 요소 제거. ({boilerplate['lines']}줄, {boilerplate['chars']}자)")
 
     # 2단계: 텍스트 분할 (Chunking)
     # - 너무 긴 텍스트는 AI가 처리하기 어려움
-    # - 적절한 크기로 나누되, 맥락을 유지하기 위해 겹치는 부분 포함
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,      # 각 청크의 최대 크기 (1000자)
-        chunk_overlap=200,    # 청크 간 겹치는 부분 (200자)
-        separators=["\n\n", "\n", " ", ""]  # 분할 기준 (문단 > 줄 > 단어 > 문자)
-    )
-    docs = text_splitter.split_documents(documents)
-    print("*****텍스트 분할 완료.")
+    # - 제목/표/목록 구조를 유지하면서 토큰 수 기준으로 분할
+    # - 겹치는 부분 대신 검색 시 같은 섹션의 이웃 청크로 확장
+    docs = chunk_documents(documents, max_tokens=CHUNK_MAX_TOKENS)
+    print(f"*****텍스트 분할 완료. (청크 {len(docs)}개, 청크당 최대 {CHUNK_MAX_TOKENS} 토큰)")
+
+    # 거의 같은 청크 표시 (검색 상위 결과를 같은 내용이 차지하지 않도록)
+    duplicates = mark_near_duplicates(docs)
+    print(f"*****중복 청크 표시. (완전 중복 {duplicates['exact']}개, 거의 같은 청크 {duplicates['near']}개)")
+
+    # 3~5단계: 임베딩 계산 후 PostgreSQL 또는 로컬 인덱스(VECTOR_BACKEND)에 저장 (새 세대)
+    generation = new_generation_name(collection_name)
+    for doc in docs:
+        doc.metadata["generation"] = generation
+    db = store_chunks(generation, docs)
+    built = {collection_name: generation}
+
+    # 6단계: 사전 번역 컬렉션 (질문 언어로 바로 검색하여 번역 왕복 생략)
+    languages = INDEX_LANGUAGES if languages is None else languages
+    for lang in languages:
+        if lang not in TRANSLATABLE_LANGUAGES:
+            continue
+        translated_name = translated_collection_name(collection_name, lang)
+        translated_generation = new_generation_name(translated_name)
+        try:
+            translated_docs = translate_chunks(unique_chunks(docs), lang)
+        except Exception as e:
+            # 이 언어만 건너뜀 (이전 번역 컬렉션도 7단계에서 사용 중지되어 그 언어 질문은 번역 경로로 처리)
+            print(f"⚠️ 청크 번역 실패, 번역 컬렉션 생성 건너뜀 ({translated_name}): {e}")
+            continue
+        for doc in translated_docs:
+            doc.metadata["generation"] = translated_generation
+        store_chunks(translated_generation, translated_docs)
+        built[translated_name] = translated_generation
+
+    # 7단계: 모든 세대가 완성된 뒤 한꺼번에 활성 세대 교체
+    for name, new_generation in built.items():
+        drop_generations(activate_generation(name, new_generation))
+    for lang in TRANSLATABLE_LANGUAGES:
+        translated_name = translated_collection_name(collection_name, lang)
+        if translated_name not in built and collection_exists(translated_name):
+            # 이전 문서 기준 번역본은 더 이상 맞지 않으므로 사용 중지 (검색에서 제외됨)
+            drop_generations(deactivate_collection(translated_name))
+            print(f"*****이전 번역 컬렉션 사용 중지: {translated_name}")
+
+    return db
+
+def drop_generations(generations):
+    """
+    오래된 세대 삭제 (PGVector 컬렉션 + 로컬 인덱스 파일)
+    - 활성 세대와 직전 세대는 activate_generation이 남겨두므로
+      교체 직후 이전 세대로 처리 중인 서버 요청에는 영향 없음
+    """
+    if not generations:
+        return
+    from config.vector_store import create_pgvector
+    for generation in generations:
+        try:
+            create_pgvector(generation).delete_collection()
+        except Exception as e:
+            print(f"⚠️ 이전 세대 PGVector 컬렉션 삭제 실패 ({generation}): {e}")
+        delete_generation_files(generation)
+        print(f"*****이전 세대 삭제: {generation}")
+
+def store_chunks(collection_name: str, docs):
+    """
+    청크를 임베딩하여 컬렉션으로 저장
+
+    처리 과정:
+    1. 이웃 청크 확장용 청크 저장소 저장 (중복 청크 포함)
+    2. 임베딩 계산 (중복 청크 제외)
+    3. VECTOR_BACKEND가 고른 검색 백엔드에만 벡터 저장
+       - pgvector: PGVector 저장 (재import 시 이전 청크 삭제)
+       - float32/int8/binary: 로컬 양자화 인덱스 저장 (pgvector에는 빈 컬렉션만 생성,
+         같은 벡터를 두 곳에 중복 저장하지 않음)
+    """
+    # 이웃 청크 확장을 위해 청크 원문과 메타데이터를 로컬에 저장
+    save_chunks(collection_name, docs)
 
     # 3단계: 한국어 임베딩 모델 로드
-    # KURE-v1: 한국어 특화 임베딩 모델
-    embedding_model_name = 'nlpai-lab/KURE-v1'
-    embeddings = HuggingFaceEmbeddings(
-        model_name=embedding_model_name,
-        model_kwargs={'device': 'cpu'}  # CPU 사용 (GPU 있으면 'cuda'로 변경)
-    )
+    # KURE-v1: 한국어 특화 임베딩 모델 (다국어 문서도 같은 모델로 임베딩)
+    # - 검색 시와 같은 백엔드(huggingface / onnx)를 사용해야 벡터가 일치함
+    from config.vector_store import create_pgvector, get_embeddings, get_engine
+    embeddings = get_embeddings()
     print("*****임베딩 모델 로드 완료.")
 
-    # 4단계: PGVector를 사용해 벡터 저장소 생성
+    # 4단계: 임베딩 계산
+    # - 중복 청크는 청크 저장소에만 두고 임베딩/벡터 저장 생략
+    all_docs, docs = docs, unique_chunks(docs)
+    texts = [doc.page_content for doc in docs]
+    vectors = embeddings.embed_documents(texts)
+    print(f"*****임베딩 계산 완료. ({collection_name})")
+    skipped = len(all_docs) - len(docs)
+    if skipped and vectors:
+        # 벡터 1개 = pgvector(float32) 또는 로컬 인덱스(float32 + 선택한 압축 코드)
+        dim = len(vectors[0])
+        code_bytes = {"int8": dim, "binary": (dim + 7) // 8}.get(VECTOR_BACKEND, 0)
+        saved_kb = skipped * (dim * 4 + code_bytes) // 1024
+        print(f"*****중복 청크 임베딩 생략: {skipped}/{len(all_docs)}개 (벡터 저장 약 {saved_kb}KB 절약)")
+
+    if VECTOR_BACKEND in QUANTIZED_BACKENDS:
+        # 5단계: 로컬 양자화 인덱스만 저장 (pgvector에는 벡터 없이 빈 컬렉션만 생성)
+        # - 빈 컬렉션은 세대 삭제(drop_generations)를 pgvector 검색과 같은 방식으로 처리하기 위함
+        build_quantized_index(collection_name, [doc.metadata["chunk_id"] for doc in docs], np.asarray(vectors))
+        print(f"*****로컬 벡터 인덱스 저장 완료 ({VECTOR_BACKEND}). ({collection_name})")
+        return create_pgvector(collection_name)
+
+    # 5단계: PGVector를 사용해 벡터 저장소 생성
     # - 텍스트를 벡터로 변환하여 PostgreSQL에 저장
     # - 나중에 유사도 검색으로 관련 문서를 찾을 수 있음
-    db = PGVector.from_documents(
-        embedding=embeddings,           # 임베딩 함수
-        documents=docs,                 # 분할된 문서들
-        collection_name=COLLECTION_NAME, # 컬렉션명
+    db = PGVector.from_embeddings(
+        text_embeddings=list(zip(texts, vectors)), # (텍스트, 벡터) 쌍
+        embedding=embeddings,           # 임베딩 함수 (검색 시 질문 임베딩용)
+        metadatas=[doc.metadata for doc in docs], # 청크 메타데이터
+        collection_name=collection_name, # 컬렉션명
         connection_string=CONNECTION_STRING, # DB 연결 문자열
+        connection=get_engine(),        # 서버와 같은 연결 풀 사용
+        pre_delete_collection=True,     # 재import 시 이전 청크 삭제 (청크 저장소와 일치)
     )
 
-    print("*****Vector store created in PostgreSQL.")
+    print(f"*****Vector store created in PostgreSQL. ({collection_name})")
     return db
 
+def translate_chunks(docs, lang: str):
+    """
+    청크를 다른 언어로 번역 (import 시 1회, 요청 경로 밖)
+    - chunk_id, 페이지 등 메타데이터는 그대로 유지 (한국어 청크와 1:1 대응)
+    - 섹션 제목은 따로 번역하여 "[섹션]\n본문" 형식과 이웃 확장이 그대로 동작
+    - 번역에 실패하면 예외 발생 (한국어 원문이 번역 컬렉션에 저장되지 않도록)
+    """
+    from langchain.schema import Document
+    from services.translator_service import TranslationService
+    translation_service = TranslationService()
+
+    sections = {}
+    translated = []
+    for i, doc in enumerate(docs):
+        section = doc.metadata.get("section", "")
+        prefix = f"[{section}]\n"
+        body = doc.page_content[len(prefix):] if section and doc.page_content.startswith(prefix) else doc.page_content
+        if section and section not in sections:
+            sections[section] = translation_service.translate(section, lang)
+        translated_section = sections.get(section, "")
+        translated_body = translation_service.translate(body, lang)
+        text = f"[{translated_section}]\n{translated_body}" if translated_section else translated_body
+
+        metadata = dict(doc.metadata, section=translated_section, lang=lang, n_tokens=count_tokens(text))
+        translated.append(Document(page_content=text, metadata=metadata))
+        if (i + 1) % 50 == 0:
+            print(f"*****번역 진행 ({lang}): {i + 1}/{len(docs)}")
+    print(f"*****청크 번역 완료. ({lang}: {len(translated)}개)")
+    return translated
+
 # =============================================================================
 # 스크립트 직접 실행 시
 # =============================================================================
 if __name__ == "__main__":
+    # 사용 예:
+    #   python pdf_importer.py                                  # 기본 컬렉션
+    #   python pdf_importer.py --collection computer_security   # data/computer_security/*.pdf
+    #   python pdf_importer.py --languages en,vi,my              # 사전 번역 컬렉션도 생성
+    parser = argparse.ArgumentParser(description="PDF를 벡터 데이터베이스로 변환")
+    parser.add_argument("--collection", default=COLLECTION_NAME, help="저장할 컬렉션명 (학과별)")
+    parser.add_argument("--pdf", action="append", help="PDF 파일 경로 (여러 번 지정 가능)")
+    parser.add_argument("--languages", help="사전 번역할 언어 (쉼표 구분, 예: en,vi,my)")
+    args = parser.parse_args()
+    try:
+        validate_collection_name(args.collection)
+    except ValueError as e:
+        parser.error(str(e))
+    languages = [lang.strip() for lang in args.languages.split(",") if lang.strip()] if args.languages else None
+
     # PDF를 벡터 데이터베이스로 변환
-    create_vector_store()
\ No newline at end of file
+    if create_vector_store(args.collection, args.pdf, languages) and args.collection == COLLECTION_NAME:
+        # 문서가 바뀌었으므로 FAQ 답변 인덱스도 재구축 (FAQ는 기본 컬렉션 기준)
+        from faq_builder import build_faq_index
+        build_faq_index()
\ No newline at end of file
@@ -1,58 +1,261 @@
-from typing import List
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
 from models.chat_models import ChatMessage, ChatResponse
 from services.translator_service import TranslationService
 from services.unified_prompt_service import UnifiedPromptService
-from utils.rag_utils import search_similar_documents
-from utils.chat_context import get_chat_context, update_chat_history
+from utils.rag_utils import embed_query, format_reference_docs, is_confident, merge_hits, search_hits
+from utils.chat_context import DEFAULT_SESSION_ID, get_chat_context, update_chat_history, set_history_summarizer
+from utils.faq_index import faq_index_ready, lookup_faq, lookup_faq_exact
+from utils.interaction_log import log_interaction
+from config.collection_registry import (
+    CollectionEntry, get_collection, lease_collection, resolve_collection, translated_collection,
+)
+from utils.language_detector import detect_language
+from utils.profiler import profile_stage
+from pdf_importer import COLLECTION_NAME
+
+# 검색할 문서 수 (상위 3개)
+RAG_TOP_K = 3
+
+def _mark(trace: Dict, stage: str, stage_started: float):
+    """단계 소요 시간 기록 (질문/답변 로그용, ms)"""
+    trace["stage_ms"][stage] = round((time.perf_counter() - stage_started) * 1000, 1)
+
+@contextmanager
+def _stage(trace: Dict, stage: str):
+    """동기 구간 하나를 단계로 실행 (소요 시간 기록 + 프로파일링 중이면 단계 이름으로 샘플링)"""
+    stage_started = time.perf_counter()
+    try:
+        with profile_stage(stage):
+            yield
+    finally:
+        _mark(trace, stage, stage_started)
+
+def _run_in_stage(stage: str, function, *args):
+    """스레드에서 실행되는 단계 (프로파일링 중이면 이 스레드를 단계 이름으로 샘플링)"""
+    with profile_stage(stage):
+        return function(*args)
 
 class ChatService:
     def __init__(self, translation_service: TranslationService, unified_prompt_service: UnifiedPromptService):
         self.translation_service = translation_service
         self.unified_prompt_service = unified_prompt_service
+        # 오래된 대화는 LLM으로 요약하여 맥락 크기를 일정하게 유지
+        set_history_summarizer(unified_prompt_service.summarize_history)
     
-    async def process_chat(self, request: ChatMessage) -> ChatResponse:
+    async def process_chat(self, request: ChatMessage, use_history: bool = True, use_faq: bool = True,
+                           record: bool = True) -> ChatResponse:
         """
         챗봇과의 대화 처리 메인 함수
         처리 순서:
+        0. FAQ 인덱스 조회 (사전 계산된 답변이 있으면 바로 반환)
         1. 언어 감지 및 번역 (다국어 지원)
         2. 대화 맥락 구성 (이전 대화 기억)
-        3. RAG 검색 (관련 문서 찾기)
+        3. RAG 검색 (관련 문서 찾기, 1~3단계는 _prepare에서 병렬 실행)
         4. AI 답변 생성 (Gemini 모델)
         5. 답변 번역 (사용자 언어로)
         6. 대화 히스토리 업데이트
+        7. 질문/답변 기록 (큐에 넣기만 하므로 응답 지연 없음)
+
+        Args:
+            request: 사용자 요청
+            use_history: 대화 맥락 사용/저장 여부 (FAQ 인덱스 생성 시 False)
+            use_faq: FAQ 인덱스 조회 여부 (FAQ 인덱스 생성 시 False)
+            record: 질문/답변 기록 여부 (FAQ 인덱스 생성 시 False)
         """
+        started = time.perf_counter()
+        # 질문/답변 로그에 남길 정보 (단계별 소요 시간, 검색 결과, 토큰 수 등)
+        trace = {
+            "session_id": request.session_id,
+            "question": request.message,
+            "stage_ms": {},
+            "cache": "disabled",
+        }
+
         try:
             print(f"받은 메시지: {request.message}")
+            session_id = request.session_id or DEFAULT_SESSION_ID
+            # 검색할 학과별 컬렉션 (목록에 없으면 오류 응답)
+            collection = resolve_collection(request.collection)
+            trace["collection"] = collection
             
-            # 1단계: 언어 감지 및 번역 (다국어 지원)
-            translated_question, detected_lang, needs_translation = self.translation_service.detect_and_translate(request.message)
-            
-            # 2단계: 대화 맥락 구성 (이전 대화 기억)
-            chat_context = get_chat_context(translated_question)
-            print(f"대화 맥락 길이: {len(chat_context)} 문자")
+            # 0단계: 사전 계산된 FAQ 답변 조회 (번역/RAG/LLM 호출 생략)
+            # - FAQ 답변은 기본 컬렉션 문서로 만든 것이므로 기본 컬렉션에서만 사용
+            # - 완전 일치가 없으면 질문 임베딩을 스레드에서 계산 (원문 질문 검색에서 재사용)
+            query_vector = None
+            if use_faq and collection == COLLECTION_NAME:
+                with _stage(trace, "faq"):
+                    faq_hit = lookup_faq_exact(request.message)
+                if faq_hit is None and faq_index_ready():
+                    try:
+                        query_vector = await self._run_stage(trace, "embed_query", embed_query, request.message)
+                    except Exception as e:
+                        # 조회 실패 시 일반 파이프라인으로 처리 (검색에서 다시 임베딩)
+                        print(f"⚠️ FAQ 조회 오류: {e}")
+                    else:
+                        with _stage(trace, "faq_similarity"):
+                            faq_hit = lookup_faq(request.message, query_vector)
+                trace["cache"] = "miss"
+                if faq_hit:
+                    response, faq_lang, score = faq_hit
+                    print(f"⚡ FAQ 답변 사용 (언어: {faq_lang}, 유사도: {score:.3f})")
+                    trace.update(cache="hit", cache_score=score, language=faq_lang)
+                    if use_history:
+                        update_chat_history(request.message, response, session_id)
+                    return self._finish(trace, started, record, ChatResponse(response=response, success=True))
             
-            # 3단계: LangChain RAG로 유사한 문서 검색 (상위 3개)
-            reference_docs = search_similar_documents(translated_question, top_k=3)
+            # 1~3단계: 사전 번역 컬렉션이 있는 언어면 번역 없이 바로 검색 (답변도 그 언어로 생성)
+            direct_lang = detect_language(request.message)
+            if direct_lang is None and translated_collection(collection, "en"):
+                # 라틴 문자 질문은 영어인지 googletrans로 확인 (영어 사전 번역 컬렉션이 있을 때만)
+                try:
+                    direct_lang = await self._run_stage(
+                        trace, "detect_language", self.translation_service.detect, request.message)
+                except Exception as e:
+                    print(f"언어 감지 오류: {str(e)}")
+            direct_collection = translated_collection(collection, direct_lang)
+            # (검색 중 재import로 세대가 교체되어도 참고 자료를 만들 때까지 같은 세대 유지,
+            #  잡고 있는 세대 entry를 검색과 참고 자료 구성에 그대로 전달)
+            search_collection = direct_collection or collection
+            await asyncio.to_thread(get_collection, search_collection)
+            with lease_collection(search_collection) as entry:
+                if direct_collection:
+                    answer_language = direct_lang
+                    translated_question, detected_lang, needs_translation = request.message, direct_lang, False
+                    chat_context, reference_docs = await self._prepare_direct(
+                        request.message, direct_lang, session_id, entry, use_history, trace, query_vector)
+                else:
+                    # 번역, 대화 맥락, 검색을 동시에 진행
+                    answer_language = None
+                    # (위에서 감지한 언어가 있으면 다시 감지하지 않음)
+                    translated_question, detected_lang, needs_translation, chat_context, reference_docs = \
+                        await self._prepare(
+                            request.message, session_id, entry, use_history, trace, direct_lang, query_vector)
             
             # 4단계: 통합된 프롬프트 서비스로 질문 처리 (RAG 결과 포함)
-            response = self.unified_prompt_service.process_question(
-                question=translated_question,
-                reference_docs=reference_docs if reference_docs else None,
-                chat_context=chat_context
-            )
+            with _stage(trace, "generate"):
+                response = self.unified_prompt_service.process_question(
+                    question=translated_question,
+                    reference_docs=reference_docs if reference_docs else None,
+                    chat_context=chat_context,
+                    trace=trace,
+                    answer_language=answer_language
+                )
             
             # 5단계: 답변 번역 (사용자 언어로)
             if needs_translation:
-                response = self.translation_service.translate_response(response, detected_lang)
+                with _stage(trace, "translate_response"):
+                    response = self.translation_service.translate_response(response, detected_lang)
             
             # 6단계: 대화 히스토리 업데이트
-            update_chat_history(request.message, response)
+            if use_history:
+                update_chat_history(request.message, response, session_id)
             
-            return ChatResponse(response=response, success=True)
+            return self._finish(trace, started, record, ChatResponse(response=response, success=True))
             
         except Exception as e:
             print(f"오류 발생: {str(e)}")
-            return ChatResponse(
+            trace["error"] = str(e)
+            return self._finish(trace, started, record, ChatResponse(
                 response=f"오류가 발생했습니다: {str(e)}", 
                 success=False
-            )
+            ))
+
+    async def _prepare_direct(self, message: str, lang: str, session_id: str, entry: CollectionEntry,
+                              use_history: bool, trace: Dict, query_vector: Optional[List[float]] = None):
+        """
+        사전 번역 컬렉션으로 바로 검색 (질문 번역 / 답변 번역 없음)
+
+        Returns:
+            (대화 맥락, 참고 문서)
+        """
+        print(f"🌐 {lang} 사전 번역 컬렉션으로 바로 검색: {entry.name}")
+        trace.update(language=lang, translated_question=None)
+
+        with _stage(trace, "context"):
+            chat_context = get_chat_context(message, session_id) if use_history else ""
+
+        hits = await self._run_stage(trace, "retrieve_direct", search_hits, message, RAG_TOP_K, entry,
+                                     query_vector)
+        with profile_stage("format_references"):
+            reference_docs = format_reference_docs(hits, entry)
+        trace["chunk_ids"] = [doc.metadata.get("chunk_id") for doc, _ in hits]
+        print(f"✅ 선택된 문서: {len(reference_docs)}개")
+        return chat_context, reference_docs
+
+    async def _prepare(self, message: str, session_id: str, entry: CollectionEntry, use_history: bool, trace: Dict,
+                       detected_lang: Optional[str] = None, query_vector: Optional[List[float]] = None):
+        """
+        번역과 검색을 병렬로 실행하는 파이프라인
+
+        처리 과정:
+        1. 언어 감지/번역(googletrans)과 원문 질문 검색(KURE-v1 다국어 임베딩)을 동시에 시작
+        2. 기다리는 동안 대화 맥락 구성 (메모리 조회)
+        3. 한국어 질문이면 원문 검색 결과를 그대로 사용
+        4. 번역된 질문이면 원문 검색이 끝나기를 기다린 뒤:
+           - 원문 검색 결과가 충분히 가까우면 그대로 사용 (번역문 검색 생략)
+           - 아니면 번역문으로도 검색하여 두 결과를 합침
+           (어느 쪽이 먼저 끝났는지와 무관하게 같은 질문에는 같은 검색 결과)
+
+        단계별 소요 시간과 함께, 순차 실행 대비 줄어든 시간을 overlap_saved로 기록
+
+        Returns:
+            (번역된 질문, 언어코드, 번역 여부, 대화 맥락, 참고 문서)
+        """
+        prepare_started = time.perf_counter()
+        translation = asyncio.create_task(self._run_stage(
+            trace, "translate_question", self.translation_service.detect_and_translate, message, detected_lang))
+        speculative = asyncio.create_task(self._run_stage(
+            trace, "retrieve_original", search_hits, message, RAG_TOP_K, entry, query_vector))
+
+        # 대화 맥락 구성 (현재 메시지는 사용하지 않으므로 번역을 기다릴 필요 없음)
+        with _stage(trace, "context"):
+            chat_context = get_chat_context(message, session_id) if use_history else ""
+        print(f"대화 맥락 길이: {len(chat_context)} 문자")
+
+        translated_question, detected_lang, needs_translation = await translation
+        trace.update(language=detected_lang, translated_question=translated_question)
+
+        original_hits = await speculative
+        retrieval_stage = "retrieve_original"
+        if needs_translation and not is_confident(original_hits):
+            translated_hits = await self._run_stage(
+                trace, "retrieve_translated", search_hits, translated_question, RAG_TOP_K, entry)
+            hits = merge_hits([original_hits, translated_hits], RAG_TOP_K)
+            retrieval_stage = "retrieve_translated"
+        else:
+            hits = original_hits
+            if needs_translation:
+                print("⚡ 원문 검색 결과 사용 (번역문 검색 생략)")
+
+        with profile_stage("format_references"):
+            reference_docs = format_reference_docs(hits, entry)
+        trace["chunk_ids"] = [doc.metadata.get("chunk_id") for doc, _ in hits]
+        print(f"✅ 선택된 문서: {len(reference_docs)}개")
+
+        # 순차 실행했다면: 번역 → (번역문) 검색
+        stage_ms = trace["stage_ms"]
+        prepare_ms = (time.perf_counter() - prepare_started) * 1000
+        sequential_ms = stage_ms["translate_question"] + stage_ms["context"] + stage_ms[retrieval_stage]
+        stage_ms["prepare"] = round(prepare_ms, 1)
+        stage_ms["overlap_saved"] = round(max(0.0, sequential_ms - prepare_ms), 1)
+        return translated_question, detected_lang, needs_translation, chat_context, reference_docs
+
+    @staticmethod
+    async def _run_stage(trace: Dict, stage: str, function, *args):
+        """동기 함수를 스레드에서 실행하고 소요 시간 기록 (이벤트 루프를 막지 않음)"""
+        stage_started = time.perf_counter()
+        try:
+            return await asyncio.to_thread(_run_in_stage, stage, function, *args)
+        finally:
+            _mark(trace, stage, stage_started)
+
+    @staticmethod
+    def _finish(trace: Dict, started: float, record: bool, result: ChatResponse) -> ChatResponse:
+        """7단계: 총 소요 시간을 더해 질문/답변 기록 (백그라운드 저장)"""
+        if record:
+            trace.update(total_ms=round((time.perf_counter() - started) * 1000, 1), success=int(result.success))
+            log_interaction(trace)
+        return result
@@ -9,7 +9,8 @@
 # =============================================================================
 
 from googletrans import Translator
-from typing import Tuple
+from typing import Optional, Tuple
+from utils.language_detector import detect_language
 
 class TranslationService:
     """
@@ -22,20 +23,37 @@ class TranslationService:
         # Google Translate API 초기화
         self.translator = Translator()
     
+    def detect(self, text: str) -> str:
+        """
+        언어 감지 (문자 체계로 판별할 수 없는 라틴 문자 텍스트만 Google Translate API 사용)
+        - 영어와 프랑스어/스페인어 등은 문자 체계로 구분할 수 없으므로 API로 확인
+        - 오류 시 예외 발생
+        """
+        return detect_language(text) or self.translator.detect(text).lang
+    
+    def translate(self, text: str, dest: str) -> str:
+        """
+        텍스트 번역 (오류 시 원문을 돌려주지 않고 예외 발생)
+        - 사전 번역 컬렉션 생성처럼 원문이 번역문으로 저장되면 안 되는 곳에서 사용
+        """
+        return self.translator.translate(text, dest=dest).text
+    
     # =============================================================================
     # 입력 텍스트 번역 함수
     # =============================================================================
-    def detect_and_translate(self, text: str) -> Tuple[str, str, bool]:
+    def detect_and_translate(self, text: str, detected_lang: Optional[str] = None) -> Tuple[str, str, bool]:
         """
         사용자 입력 텍스트의 언어를 감지하고 필요시 한국어로 번역
         
         처리 과정:
-        1. Google Translate API로 언어 감지
+        1. 문자 체계로 언어 감지 (판별할 수 없을 때만 Google Translate API로 감지,
+           이미 감지한 언어가 주어지면 다시 감지하지 않음)
         2. 미얀마어(my), 영어(en), 베트남어(vi)인 경우 한국어로 번역
         3. 한국어(ko)인 경우 그대로 유지
         
         Args:
             text: 사용자가 입력한 텍스트
+            detected_lang: 이미 감지한 언어 코드 (없으면 여기서 감지)
             
         Returns:
             Tuple[번역된_텍스트, 원본_언어코드, 번역_필요여부]
@@ -44,14 +62,14 @@ class TranslationService:
             - 번역_필요여부: 번역이 수행되었는지 여부 (True/False)
         """
         try:
-            # 1단계: 언어 자동 감지
-            detected_lang = self.translator.detect(text).lang
+            # 1단계: 언어 자동 감지 (한국어/미얀마어/베트남어는 네트워크 호출 없이 바로 판별)
+            detected_lang = detected_lang or self.detect(text)
             print(f" 언어 감지: {detected_lang}")
             
             # 2단계: 지원 언어인 경우 한국어로 번역
             # 미얀마어(my), 영어(en), 베트남어(vi) → 한국어(ko)
             if detected_lang in ['my', 'en', 'vi']:
-                translated_text = self.translator.translate(text, dest='ko').text
+                translated_text = self.translate(text, 'ko')
                 print(f"{detected_lang} 언어 감지됨: {text} -> {translated_text}")
                 return translated_text, detected_lang, True
             
@@ -91,7 +109,7 @@ class TranslationService:
             # 1단계: 지원 언어 사용자에게 번역 제공
             # 영어, 미얀마어, 베트남어 사용자 → 해당 언어로 번역
             if target_lang in ['en', 'my', 'vi']:
-                translated = self.translator.translate(text, dest=target_lang).text
+                translated = self.translate(text, target_lang)
                 print(f"답변 번역: {text} -> {translated}")
                 return translated
             
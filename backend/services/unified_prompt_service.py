@@ -10,9 +10,16 @@
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.schema import SystemMessage, HumanMessage
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import json
 
+# 답변 언어 지시용 언어 이름 (사전 번역 컬렉션으로 바로 답변할 때)
+ANSWER_LANGUAGE_NAMES = {
+    'en': '영어(English)',
+    'vi': '베트남어(Tiếng Việt)',
+    'my': '미얀마어(မြန်မာဘာသာ)',
+}
+
 class UnifiedPromptService:
     """
     통합된 프롬프트 처리를 담당하는 서비스 클래스
@@ -32,7 +39,8 @@ class UnifiedPromptService:
     # 메인 질문 처리 함수
     # =============================================================================
     
-    def process_question(self, question: str, reference_docs: List[str] = None, chat_context: str = None) -> str:
+    def process_question(self, question: str, reference_docs: List[str] = None, chat_context: str = None,
+                         trace: Optional[Dict[str, Any]] = None, answer_language: Optional[str] = None) -> str:
         """
         통합된 프롬프트로 질문을 처리하고 적절한 답변 생성
         
@@ -44,7 +52,9 @@ class UnifiedPromptService:
         Args:
             question: 사용자 질문 (이미 한국어로 번역됨)
             reference_docs: RAG 검색으로 찾은 관련 문서 리스트
-            chat_context: 이전 대화 맥락 (최근 3개 대화)
+            chat_context: 이전 대화 맥락 (요약본 + 최근 3개 대화)
+            trace: 주어지면 토큰 사용량(prompt_tokens, output_tokens)을 기록 (질문/답변 로그용)
+            answer_language: 답변 언어 (en, vi, my / 없으면 한국어로 답변 후 별도 번역)
             
         Returns:
             str: AI가 생성한 답변 텍스트
@@ -98,6 +108,12 @@ class UnifiedPromptService:
                 prompt_parts.append("사용자의 질문에 친근하게 답변해주세요.")
                 prompt_parts.append("명지전문대학과 관련이 없다면 '죄송합니다. 명지전문대학 관련 질문에만 답변드릴 수 있습니다.'라고 답변해주세요.")
             
+            # 1-5. 사전 번역 문서로 답변하는 경우 사용자 언어로 바로 답변 (답변 번역 생략)
+            if answer_language in ANSWER_LANGUAGE_NAMES:
+                language_name = ANSWER_LANGUAGE_NAMES[answer_language]
+                print(f"   🌐 답변 언어: {language_name}")
+                prompt_parts.append(f"답변은 반드시 {language_name}로 작성해주세요. 위의 안내 문구도 {language_name}로 번역하여 답변해주세요.")
+            
             # =============================================================================
             # 2단계: 통합된 프롬프트 생성
             # =============================================================================
@@ -152,6 +168,8 @@ class UnifiedPromptService:
             ]
             
             response = self.llm.invoke(messages)
+            if trace is not None:
+                trace.update(self._token_usage(response))
             
             # =============================================================================
             # 4단계: 응답 처리 및 반환
@@ -167,4 +185,46 @@ class UnifiedPromptService:
                 
         except Exception as e:
             print(f"❌ 통합 프롬프트 처리 오류: {e}")
-            return f"죄송합니다. 오류가 발생했습니다: {str(e)}"
\ No newline at end of file
+            return f"죄송합니다. 오류가 발생했습니다: {str(e)}"
+    
+    @staticmethod
+    def _token_usage(response) -> Dict[str, Optional[int]]:
+        """
+        LLM 응답의 토큰 사용량
+        - langchain 표준 usage_metadata 우선, 없으면 Gemini 응답 메타데이터 사용
+        """
+        usage = getattr(response, "usage_metadata", None) or {}
+        if usage:
+            return {"prompt_tokens": usage.get("input_tokens"), "output_tokens": usage.get("output_tokens")}
+        gemini_usage = (getattr(response, "response_metadata", None) or {}).get("usage_metadata") or {}
+        return {
+            "prompt_tokens": gemini_usage.get("prompt_token_count"),
+            "output_tokens": gemini_usage.get("candidates_token_count"),
+        }
+    
+    # =============================================================================
+    # 대화 히스토리 요약 함수 (백그라운드에서 호출)
+    # =============================================================================
+    
+    def summarize_history(self, summary: str, turns: List[Dict[str, str]]) -> str:
+        """
+        기존 요약본에 오래된 대화를 합쳐 새 요약본 생성
+        - utils/chat_context.py 의 백그라운드 스레드에서 호출됨 (요청 경로 밖)
+        
+        Args:
+            summary: 기존 요약본 (없으면 빈 문자열)
+            turns: 요약에 합칠 대화 목록 [{'user': ..., 'bot': ...}]
+            
+        Returns:
+            str: 새 요약본 (실패 시 빈 문자열 → 간이 요약 사용)
+        """
+        conversation = "\n".join(f"사용자: {turn['user']}\n챗봇: {turn['bot']}" for turn in turns)
+        prompt = (
+            f"기존 요약:\n{summary or '(없음)'}\n\n"
+            f"추가 대화:\n{conversation}\n\n"
+            "기존 요약과 추가 대화를 합쳐 사용자가 무엇을 물었고 어떤 정보를 얻었는지 "
+            "한국어 3문장 이내로 요약해주세요. 요약문만 출력하세요."
+        )
+        response = self.llm.invoke([HumanMessage(content=prompt)])
+        return (response.content or "").strip()
+
@@ -0,0 +1,103 @@
+# =============================================================================
+# 대화 맥락 크기 테스트 (utils/chat_context.py)
+# =============================================================================
+# 100턴 대화에서 긴 답변이 계속 쌓여도 프롬프트에 들어가는 맥락 크기가
+# 요약본 + 최근 대화 원문 한도 안에 머무는지 확인 (LLM 요약 함수는 대체)
+# 요약은 대화 몇 개씩 묶어서 호출하고, 요약이 밀려도 세션의 대화 수가 제한되는지 확인
+# =============================================================================
+import threading
+
+import pytest
+
+from utils import chat_context
+from utils.chat_context import (
+    MAX_PENDING_TURNS, MAX_TURN_CHARS, RECENT_TURNS, SUMMARY_BATCH_TURNS, SUMMARY_MAX_CHARS,
+    get_chat_context, set_history_summarizer, update_chat_history,
+)
+
+TURNS = 100
+
+# 맥락 최대 길이: 요약본 + 최근 대화 원문 (머리말 "이전 대화 요약: ", "사용자: ", "챗봇: ", 말줄임, 줄바꿈 여유 포함)
+CONTEXT_LIMIT = SUMMARY_MAX_CHARS + 20 + RECENT_TURNS * 2 * (MAX_TURN_CHARS + 10)
+
+
+class InlineExecutor:
+    """백그라운드 요약을 호출한 스레드에서 바로 실행 (결과를 기다리지 않고 확인하기 위해)"""
+
+    def submit(self, function, *args):
+        function(*args)
+
+
+def verbose_summarizer(summary, turns):
+    """LLM 요약 대신 합칠 대화를 모두 이어 붙임 (한도보다 긴 요약본을 돌려주는 경우)"""
+    return summary + "".join(f"{turn['user']} {turn['bot']}" for turn in turns)
+
+
+@pytest.fixture(autouse=True)
+def clean_sessions():
+    chat_context.sessions.clear()
+    yield
+    chat_context.sessions.clear()
+    set_history_summarizer(None)
+
+
+def long_answer(turn: int) -> str:
+    return f"{turn}번째 답변: " + "학사 일정과 장학금 안내입니다. " * 60
+
+
+def test_context_size_bounded_over_100_turns(monkeypatch):
+    monkeypatch.setattr(chat_context, "_summary_executor", InlineExecutor())
+    calls = []
+
+    def counting_summarizer(summary, turns):
+        calls.append(len(turns))
+        return verbose_summarizer(summary, turns)
+
+    set_history_summarizer(counting_summarizer)
+
+    sizes = []
+    for turn in range(TURNS):
+        get_chat_context(f"질문 {turn}", "long-session")
+        update_chat_history(f"{turn}번째 질문입니다. 휴학 신청은 어떻게 하나요?", long_answer(turn), "long-session")
+        sizes.append(len(get_chat_context("다음 질문", "long-session")))
+
+    assert max(sizes) <= CONTEXT_LIMIT
+    # 요약본이 계속 커지지 않고 한도에서 멈춤
+    assert sizes[-1] == sizes[-2]
+    session = chat_context.sessions["long-session"]
+    assert len(session.summary) <= SUMMARY_MAX_CHARS
+    assert RECENT_TURNS <= len(session.turns) < RECENT_TURNS + SUMMARY_BATCH_TURNS
+    # 대화마다가 아니라 SUMMARY_BATCH_TURNS개씩 묶어서 요약
+    assert min(calls) >= SUMMARY_BATCH_TURNS
+    assert len(calls) <= TURNS // SUMMARY_BATCH_TURNS
+    # 가장 최근 대화는 원문 그대로 포함
+    assert f"{TURNS - 1}번째 질문입니다" in get_chat_context("다음 질문", "long-session")
+
+
+def test_context_size_bounded_when_summarizer_falls_behind():
+    """요약이 밀려도 (LLM 요약이 느린 경우) 맥락 크기가 제한됨"""
+    release = threading.Event()
+
+    def slow_summarizer(summary, turns):
+        release.wait(timeout=10)
+        return verbose_summarizer(summary, turns)
+
+    set_history_summarizer(slow_summarizer)
+    try:
+        for turn in range(TURNS):
+            update_chat_history(f"{turn}번째 질문", long_answer(turn), "slow-session")
+            assert len(get_chat_context("다음 질문", "slow-session")) <= CONTEXT_LIMIT
+            # 요약 중이어도 대기 대화는 간이 요약으로 합쳐져 늘어나지 않음
+            assert len(chat_context.sessions["slow-session"].turns) <= MAX_PENDING_TURNS
+    finally:
+        release.set()
+    chat_context._summary_executor.submit(lambda: None).result(timeout=10)
+
+    assert len(get_chat_context("다음 질문", "slow-session")) <= CONTEXT_LIMIT
+    session = chat_context.sessions["slow-session"]
+    assert len(session.summary) <= SUMMARY_MAX_CHARS
+    assert len(session.turns) < RECENT_TURNS + SUMMARY_BATCH_TURNS
+    # 요약하는 동안 간이 요약으로 합친 내용은 요약이 끝나면 요약본에 반영 (남은 대화 바로 앞까지 빠짐없이)
+    assert session.overflow_summary == ""
+    first_remaining = int(session.turns[0]['user'].split("번째")[0])
+    assert f"{first_remaining - 1}번째 질문" in session.summary
@@ -0,0 +1,36 @@
+# =============================================================================
+# 로컬 언어 감지 테스트 (utils/language_detector.py)
+# =============================================================================
+# 문자 체계로 확실히 구분되는 경우만 판별하고, 그 외 라틴 문자 텍스트는
+# None을 돌려 googletrans가 판단하는지 확인
+# =============================================================================
+import pytest
+
+from utils.language_detector import detect_language
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("휴학 신청은 어떻게 하나요?", "ko"),
+    ("AI게임소프트웨어학과 curriculum 알려줘", "ko"),
+    ("ကျောင်းလခ ဘယ်လောက်လဲ", "my"),
+    ("Học phí bao nhiêu?", "vi"),
+    ("Tôi muốn đăng ký", "vi"),
+    ("Làm thế nào để xin nghỉ học", "vi"),
+])
+def test_detects_identifiable_scripts(text, expected):
+    assert detect_language(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "How do I apply for a leave of absence?",
+    "Bonjour, comment demander un congé?",
+    "Comment être admis?",
+    "C'est la fête",
+    "Você pode me ajudar?",
+    "São Paulo não",
+    "¿Cómo solicito una baja?",
+    "Wie beantrage ich Urlaub?",
+    "ok",
+])
+def test_leaves_other_latin_text_to_googletrans(text):
+    assert detect_language(text) is None
@@ -0,0 +1,68 @@
+# =============================================================================
+# ONNX 임베딩 일치도 테스트 (config/onnx_embeddings.py)
+# =============================================================================
+# ONNX(int8) 임베딩이 HuggingFace KURE-v1 임베딩과 같은 방향의 벡터를 만드는지 확인
+# (import와 검색에서 백엔드를 바꿔도 검색 결과가 유지되는지)
+# - onnxruntime이 없거나 변환된 모델이 없으면 건너뜀 (python -m config.onnx_embeddings)
+# =============================================================================
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("onnxruntime")
+
+from config.onnx_embeddings import ONNX_FP32_PATH, ONNX_INT8_PATH, OnnxEmbeddings
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# embedding_benchmark --min-cosine 기본값과 같은 기준
+MIN_COSINE = 0.99
+
+TEXTS = [
+    "휴학 신청은 어떻게 하나요?",
+    "장학금 신청 기간이 언제인가요?",
+    "AI게임소프트웨어학과 교육과정 알려줘",
+    "[학사 일정]\n2학기 수강신청은 8월 중순에 진행되며, 정정 기간은 개강 후 1주일입니다.",
+    "[등록금 안내]\n등록금은 학기 시작 전 지정된 기간에 가상계좌로 납부합니다.",
+]
+
+
+@pytest.fixture(scope="module")
+def embedders():
+    """ONNX / HuggingFace 임베딩 (모델 경로가 backend 기준 상대 경로이므로 backend에서 로드)"""
+    cwd = os.getcwd()
+    os.chdir(BACKEND_DIR)
+    try:
+        if not (os.path.exists(ONNX_INT8_PATH) or os.path.exists(ONNX_FP32_PATH)):
+            pytest.skip("변환된 ONNX 모델 없음 (python -m config.onnx_embeddings)")
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+        onnx = OnnxEmbeddings()
+        reference = HuggingFaceEmbeddings(model_name='nlpai-lab/KURE-v1', model_kwargs={'device': 'cpu'})
+        yield onnx, reference
+    finally:
+        os.chdir(cwd)
+
+
+def cosine(a, b) -> np.ndarray:
+    a, b = np.asarray(a, dtype=np.float32), np.asarray(b, dtype=np.float32)
+    a /= np.linalg.norm(a, axis=-1, keepdims=True)
+    b /= np.linalg.norm(b, axis=-1, keepdims=True)
+    return np.sum(a * b, axis=-1)
+
+
+def test_documents_match_huggingface(embedders):
+    onnx, reference = embedders
+    assert cosine(onnx.embed_documents(TEXTS), reference.embed_documents(TEXTS)).min() >= MIN_COSINE
+
+
+def test_query_matches_huggingface(embedders):
+    onnx, reference = embedders
+    for text in TEXTS[:3]:
+        assert cosine(onnx.embed_query(text), reference.embed_query(text)) >= MIN_COSINE
+
+
+def test_reports_model_size(embedders):
+    """메모리 예산(embedder 항목)에 ONNX 모델 크기가 잡히는지"""
+    onnx, _ = embedders
+    assert onnx.nbytes >= os.path.getsize(onnx.model_path) > 0
@@ -1,41 +1,224 @@
 # =============================================================================
-# 대화 히스토리 관리 (메모리 기반)
+# 대화 히스토리 관리 (메모리 기반, 세션별 롤링 요약)
 # =============================================================================
 # 사용자와의 대화 내용을 저장하여 맥락을 유지
-# 최근 10개 대화만 유지하여 메모리 효율성 확보
-chat_history = []
+# - 최근 3개 대화는 원문 그대로 유지
+# - 그보다 오래된 대화가 몇 개 쌓이면 백그라운드에서 한꺼번에 요약본에 합침 (요청 경로 밖)
+# - 요약본과 원문 길이를 모두 제한하여 대화가 길어져도 맥락 크기가 일정함
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 
-def get_chat_context(current_message: str) -> str:
+from config.memory_budget import register_memory_component
+
+DEFAULT_SESSION_ID = "default"
+
+RECENT_TURNS = 3          # 원문 그대로 유지할 최근 대화 수
+MAX_TURN_CHARS = 400      # 원문 대화 1개(질문/답변 각각)의 최대 길이
+SUMMARY_MAX_CHARS = 600   # 요약본 최대 길이
+SUMMARY_BATCH_TURNS = 4   # 요약 대기 대화가 이만큼 쌓여야 요약 (LLM 요약 호출 수 = 대화 수 / 4)
+MAX_PENDING_TURNS = 10    # 전체 대화가 이보다 많으면 즉시 간이 요약으로 합침 (요약 중이어도)
+MAX_SESSIONS = 1000       # 메모리에 유지할 최대 세션 수 (오래된 세션부터 제거)
+
+# 요약 함수: (기존 요약, 합칠 대화 목록) -> 새 요약
+Summarizer = Callable[[str, List[Dict[str, str]]], str]
+
+
+class SessionHistory:
+    """세션 하나의 대화 상태 (요약본 + 아직 요약되지 않은 대화)"""
+
+    def __init__(self):
+        self.summary = ""
+        self.turns: List[Dict[str, str]] = []
+        # 백그라운드 요약이 처리 중인 앞쪽 대화 수 (0이면 요약 중 아님)
+        self.folding = 0
+        # 요약하는 동안 대기 대화가 넘쳐 간이 요약으로 합친 내용 (요약이 끝나면 요약본 뒤에 붙임)
+        self.overflow_summary = ""
+        self.lock = threading.Lock()
+
+
+# 세션 ID -> 대화 상태 (최근 사용 순서 유지)
+sessions: "OrderedDict[str, SessionHistory]" = OrderedDict()
+_sessions_lock = threading.Lock()
+
+# 요약 작업은 요청 경로와 분리된 단일 백그라운드 스레드에서 처리
+_summary_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-summarizer")
+_summarizer: Optional[Summarizer] = None
+
+
+def set_history_summarizer(summarizer: Optional[Summarizer]):
+    """
+    오래된 대화를 요약할 함수 등록
+    - 보통 UnifiedPromptService.summarize_history (LLM 요약)
+    - 등록되지 않았거나 실패하면 간이 요약(질문 목록)을 사용
+    """
+    global _summarizer
+    _summarizer = summarizer
+
+
+def _get_session(session_id: str) -> SessionHistory:
+    """세션 상태 반환 (없으면 생성, 세션 수 초과 시 가장 오래된 세션 제거)"""
+    with _sessions_lock:
+        session = sessions.get(session_id)
+        if session is None:
+            session = SessionHistory()
+            sessions[session_id] = session
+            while len(sessions) > MAX_SESSIONS:
+                sessions.popitem(last=False)
+        else:
+            sessions.move_to_end(session_id)
+        return session
+
+
+def sessions_nbytes() -> int:
+    """대화 세션이 차지하는 메모리 추정 (요약본 + 대화 원문 문자열 크기)"""
+    with _sessions_lock:
+        items = list(sessions.values())
+    total = 0
+    for session in items:
+        total += sys.getsizeof(session.summary) + sys.getsizeof(session.overflow_summary)
+        total += sum(sys.getsizeof(turn['user']) + sys.getsizeof(turn['bot']) for turn in list(session.turns))
+    return total
+
+
+def trim_sessions(keep_ratio: float = 0.5):
+    """메모리 압박 시 오래 안 쓴 세션부터 제거 (최근 세션 keep_ratio 비율만 유지)"""
+    with _sessions_lock:
+        remove = len(sessions) - int(len(sessions) * keep_ratio)
+        for _ in range(remove):
+            sessions.popitem(last=False)
+    print(f"♻️ 대화 세션 {remove}개 제거 (남은 세션 {len(sessions)}개)")
+
+
+# 사용자 대화 맥락이 사라지므로 컬렉션 캐시보다 나중에 해제
+register_memory_component("sessions", sessions_nbytes, trim_sessions, priority=50)
+
+
+def _clip(text: str, limit: int) -> str:
+    """길이 제한 (초과 시 말줄임)"""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _clip_summary(summary: str) -> str:
+    """요약본 길이 제한 (최근 내용이 중요하므로 앞부분을 잘라냄)"""
+    summary = summary.strip()
+    if len(summary) <= SUMMARY_MAX_CHARS:
+        return summary
+    return "..." + summary[-(SUMMARY_MAX_CHARS - 3):]
+
+
+def _simple_summary(summary: str, turns: List[Dict[str, str]]) -> str:
+    """LLM 없이 만드는 간이 요약 (이전 질문 목록만 남김)"""
+    questions = " / ".join(_clip(turn['user'], 60) for turn in turns)
+    merged = f"{summary}\n이전 질문: {questions}" if summary else f"이전 질문: {questions}"
+    return _clip_summary(merged)
+
+
+def _pending_turns(session: SessionHistory) -> int:
+    """요약본에 아직 합치지 않은 오래된 대화 수 (최근 대화 제외, 잠금 안에서 호출)"""
+    return len(session.turns) - RECENT_TURNS
+
+
+def _fold_old_turns(session: SessionHistory):
+    """
+    백그라운드 요약 작업
+    - 예약 시 정한 앞쪽 대화(session.folding개)를 요약본에 합침
+    - 요약하는 동안 새 대화가 추가되거나 그 뒤 대화가 간이 요약으로 합쳐질 수 있으므로
+      합친 앞쪽 대화만 제거하고, 그동안의 간이 요약은 새 요약본 뒤에 붙임
+    """
+    try:
+        with session.lock:
+            old_turns = session.turns[:session.folding]
+            summary = session.summary
+        if not old_turns:
+            return
+
+        new_summary = None
+        if _summarizer is not None:
+            try:
+                new_summary = _summarizer(summary, old_turns)
+            except Exception as e:
+                print(f"⚠️ 대화 요약 오류: {e}")
+        if not new_summary:
+            new_summary = _simple_summary(summary, old_turns)
+
+        with session.lock:
+            new_summary = _clip_summary(new_summary)
+            if session.overflow_summary:
+                new_summary = _clip_summary(f"{new_summary}\n{session.overflow_summary}")
+                session.overflow_summary = ""
+            session.summary = new_summary
+            del session.turns[:len(old_turns)]
+            print(f"🗜️ 대화 요약 갱신: {len(old_turns)}개 대화 합침, 요약 {len(session.summary)} 문자")
+    finally:
+        with session.lock:
+            session.folding = 0
+        _schedule_summary(session)
+
+
+def _schedule_summary(session: SessionHistory):
+    """요약 작업이 진행 중이 아니고 대기 대화가 SUMMARY_BATCH_TURNS개 이상이면 백그라운드 요약 예약"""
+    with session.lock:
+        if session.folding or _pending_turns(session) < SUMMARY_BATCH_TURNS:
+            return
+        session.folding = _pending_turns(session)
+    _summary_executor.submit(_fold_old_turns, session)
+
+
+def get_chat_context(current_message: str, session_id: str = DEFAULT_SESSION_ID) -> str:
     """
     대화 히스토리를 바탕으로 맥락 구성
-    - 최근 3개 대화만 사용하여 맥락 유지하면서 메모리 절약
+    - 이전 대화 요약본 + 최근 3개 대화 원문 (각각 길이 제한)
     - AI가 이전 대화를 기억하고 자연스럽게 응답할 수 있게 함
     - 현재 메시지는 별도로 전달되므로 제외
     """
-    if not chat_history:
+    session = _get_session(session_id)
+    with session.lock:
+        summary = session.summary
+        if session.overflow_summary:
+            summary = _clip_summary(f"{summary}\n{session.overflow_summary}")
+        recent_history = list(session.turns[-RECENT_TURNS:])
+
+    if not summary and not recent_history:
         return ""  # 현재 메시지는 별도로 전달
-    
-    # 최근 3개 대화만 사용 (현재 메시지 제외)
-    recent_history = chat_history[-3:]
+
     context = ""
-    
+    if summary:
+        context += f"이전 대화 요약: {summary}\n\n"
+
     for msg in recent_history:
-        context += f"사용자: {msg['user']}\n"
-        context += f"챗봇: {msg['bot']}\n\n"
-    
+        context += f"사용자: {_clip(msg['user'], MAX_TURN_CHARS)}\n"
+        context += f"챗봇: {_clip(msg['bot'], MAX_TURN_CHARS)}\n\n"
+
     return context.strip()
 
-def update_chat_history(user_message: str, bot_response: str):
+
+def update_chat_history(user_message: str, bot_response: str, session_id: str = DEFAULT_SESSION_ID):
     """
     대화 히스토리 업데이트
     - 새로운 대화를 히스토리에 추가
-    - 최근 10개 대화만 유지하여 메모리 효율성 확보
-    """
-    chat_history.append({
-        'user': user_message,
-        'bot': bot_response
-    })
-    
-    # 최근 10개 대화만 유지 (메모리 절약)
-    if len(chat_history) > 10:
-        chat_history[:] = chat_history[-10:]
\ No newline at end of file
+    - 최근 대화보다 오래된 대화가 SUMMARY_BATCH_TURNS개 쌓이면 백그라운드에서 요약본에 합침
+    - 요약이 밀려 대화가 MAX_PENDING_TURNS개를 넘으면 간이 요약으로 즉시 합쳐 메모리 제한
+      (백그라운드 요약이 처리 중인 앞쪽 대화는 건드리지 않고 그 뒤 대화만 합침)
+    """
+    session = _get_session(session_id)
+    with session.lock:
+        session.turns.append({
+            'user': user_message,
+            'bot': bot_response
+        })
+
+        # 대화가 너무 많으면 간이 요약으로 즉시 합침 (요약이 밀려도 대화 수 제한)
+        if len(session.turns) > MAX_PENDING_TURNS:
+            start = session.folding
+            overflow = session.turns[start:-RECENT_TURNS]
+            if start:
+                # 앞쪽 대화는 요약 중이므로 요약이 끝날 때 요약본 뒤에 붙임
+                session.overflow_summary = _simple_summary(session.overflow_summary, overflow)
+            else:
+                session.summary = _simple_summary(session.summary, overflow)
+            del session.turns[start:start + len(overflow)]
+
+    _schedule_summary(session)
@@ -0,0 +1,120 @@
+# =============================================================================
+# 청크 저장소 (이웃 청크 확장용)
+# =============================================================================
+# 주요 기능:
+# 1. import 시 생성한 청크 원문과 메타데이터를 로컬 파일로 저장
+# 2. 검색된 청크의 앞뒤 이웃 청크 조회 (같은 파일, 같은 섹션)
+# 3. 토큰 예산 안에서 검색 결과를 이웃 청크로 확장
+# =============================================================================
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+from langchain.schema import Document
+
+# 컬렉션별 로컬 인덱스 파일 위치
+INDEX_DIR = os.path.join("data", "index")
+
+# 컬렉션명 -> {chunk_id: 청크}
+_stores: Dict[str, Dict[str, Dict]] = {}
+
+
+def chunk_store_path(collection_name: str) -> str:
+    """컬렉션의 청크 저장소 파일 경로"""
+    return os.path.join(INDEX_DIR, collection_name, "chunks.json")
+
+
+def save_chunks(collection_name: str, chunks: List[Document]):
+    """청크 원문과 메타데이터 저장 (임시 파일에 쓴 뒤 교체)"""
+    path = chunk_store_path(collection_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    records = [{"text": chunk.page_content, "metadata": chunk.metadata} for chunk in chunks]
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+    _stores.pop(collection_name, None)
+    print(f"💾 청크 저장소 저장: {len(records)}개 ({path})")
+
+
+def load_chunks(collection_name: str) -> Dict[str, Dict]:
+    """청크 저장소 로드 (한 번 읽은 뒤 메모리에 유지, 없으면 빈 dict)"""
+    store = _stores.get(collection_name)
+    if store is not None:
+        return store
+
+    store = {}
+    path = chunk_store_path(collection_name)
+    if os.path.exists(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                for record in json.load(f):
+                    store[record["metadata"]["chunk_id"]] = record
+        except Exception as e:
+            print(f"⚠️ 청크 저장소 로드 실패: {e}")
+    _stores[collection_name] = store
+    return store
+
+
+def unload_chunks(collection_name: str):
+    """메모리의 청크 저장소 해제 (다음 조회 시 다시 로드)"""
+    _stores.pop(collection_name, None)
+
+
+def _neighbor(store: Dict[str, Dict], chunk: Dict, offset: int) -> Optional[Dict]:
+    """같은 파일/섹션의 앞(-1) 또는 뒤(+1) 청크"""
+    metadata = chunk["metadata"]
+    source_name = metadata["chunk_id"].rsplit("#", 1)[0]
+    candidate = store.get(f"{source_name}#{metadata['chunk_index'] + offset}")
+    if candidate is None or candidate["metadata"].get("section") != metadata.get("section"):
+        return None
+    return candidate
+
+
+def expand_with_neighbors(collection_name: str, chunk_id: str, max_tokens: int) -> Optional[Tuple[str, List[str]]]:
+    """
+    검색된 청크를 앞뒤 이웃 청크로 확장
+
+    처리 과정:
+    1. 검색된 청크를 중심에 둠
+    2. 다음 청크, 이전 청크 순서로 번갈아 추가 (같은 섹션만)
+    3. 토큰 예산을 넘으면 중단
+
+    Returns:
+        (확장된 본문, 포함된 chunk_id 목록) (청크 저장소에 없으면 None)
+    """
+    store = load_chunks(collection_name)
+    center = store.get(chunk_id)
+    if center is None:
+        return None
+
+    parts = [center]
+    tokens = center["metadata"].get("n_tokens", 0)
+    before, after = center, center
+    while True:
+        added = False
+        for direction in (1, -1):
+            edge = after if direction == 1 else before
+            candidate = _neighbor(store, edge, direction)
+            if candidate is None:
+                continue
+            candidate_tokens = candidate["metadata"].get("n_tokens", 0)
+            if tokens + candidate_tokens > max_tokens:
+                continue
+            tokens += candidate_tokens
+            if direction == 1:
+                parts.append(candidate)
+                after = candidate
+            else:
+                parts.insert(0, candidate)
+                before = candidate
+            added = True
+        if not added:
+            break
+
+    # 섹션 제목은 첫 청크에만 남김
+    section_prefix = f"[{center['metadata'].get('section')}]\n"
+    texts = [parts[0]["text"]] + [
+        part["text"][len(section_prefix):] if part["text"].startswith(section_prefix) else part["text"]
+        for part in parts[1:]
+    ]
+    return "\n".join(texts), [part["metadata"]["chunk_id"] for part in parts]
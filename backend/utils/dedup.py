@@ -0,0 +1,189 @@
+# =============================================================================
+# import 단계 중복 제거 (반복되는 페이지 요소 + 거의 같은 청크)
+# =============================================================================
+# 주요 기능:
+# 1. 홈페이지 PDF의 반복 요소 제거 (청킹 전, 페이지 단위)
+#    - 인쇄 시각 + 경로 표시줄 머리글 ("25. 8. 22. 오후 5:46 명지전문대학 > ...")
+#    - 주소 + 쪽 번호 바닥글 ("https://www.mjc.ac.kr/ibuilder.do 1/2")
+#    - "Home > ..." 경로 표시줄, 글자 크기 버튼 등 화면 요소
+#    - 같은 파일의 여러 페이지 머리글/바닥글 영역에 반복되는 줄
+# 2. 거의 같은 청크 표시 (청킹 후, MinHash + LSH로 후보를 찾고 실제 자카드 유사도로 확인)
+#    - 중복 청크는 metadata["duplicate_of"]에 원본 chunk_id 기록
+#    - 청크 저장소에는 남겨 이웃 확장은 그대로 동작, 임베딩/벡터 인덱스에서만 제외
+# =============================================================================
+import hashlib
+import os
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+from langchain.schema import Document
+
+# 이 자카드 유사도 이상이면 거의 같은 청크로 판단
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.85"))
+
+# MinHash 설정: 서명 길이 = 밴드 수 x 밴드당 행 수
+# (16 x 4: 자카드 유사도 0.5 부근부터 후보가 되므로 0.85 이상은 거의 놓치지 않음)
+MINHASH_BANDS = 16
+MINHASH_ROWS = 4
+
+# 글자 shingle 길이 (공백 제거 후, 한국어는 단어보다 글자 단위가 안정적)
+SHINGLE_CHARS = 5
+
+# 페이지 위/아래에서 머리글/바닥글로 볼 줄 수
+EDGE_LINES = 3
+
+# 항상 제거하는 화면/인쇄 요소
+BOILERPLATE_PATTERNS = [
+    # 브라우저 인쇄 머리글: 인쇄 시각 + 경로 표시줄
+    re.compile(r"^\d{2}\.\s*\d{1,2}\.\s*\d{1,2}\.\s*오[전후]\s*\d{1,2}:\d{2}\b"),
+    # 브라우저 인쇄 바닥글: 주소 + 쪽 번호
+    re.compile(r"^(https?://)?(www\.)?mjc\.ac\.kr\S*(\s+\d+/\d+)?$"),
+    # 본문 위 경로 표시줄 (페이지 첫 줄의 경로 표시줄은 페이지 주제이므로 유지)
+    re.compile(r"^Home\s*>"),
+    # 글자 크기 버튼, 빈 경로 기호
+    re.compile(r"^글자크기"),
+    re.compile(r"^[>\s\xa0]*$"),
+]
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.default_rng(42)
+_PERMUTATION_A = _rng.integers(1, 1 << 31, size=MINHASH_BANDS * MINHASH_ROWS, dtype=np.uint64)
+_PERMUTATION_B = _rng.integers(0, 1 << 31, size=MINHASH_BANDS * MINHASH_ROWS, dtype=np.uint64)
+
+
+def _mask_line(line: str) -> str:
+    """반복 줄 비교용 정규화 (공백 정리, 숫자는 같은 값으로 취급: 쪽 번호/인쇄 시각)"""
+    return re.sub(r"\d+", "0", re.sub(r"\s+", " ", line.strip()))
+
+
+def _is_boilerplate(line: str) -> bool:
+    """항상 제거하는 줄인지"""
+    stripped = line.strip()
+    return any(pattern.match(stripped) for pattern in BOILERPLATE_PATTERNS)
+
+
+def strip_boilerplate(pages: List[Document]) -> Tuple[List[Document], Dict]:
+    """
+    페이지마다 반복되는 머리글/바닥글/화면 요소 제거
+
+    처리 과정:
+    1. 파일별로 페이지 위/아래 EDGE_LINES줄 안의 줄을 세어
+       2페이지 이상, 파일 페이지의 절반 이상에 나오는 줄을 반복 요소로 판단
+    2. 반복 요소와 BOILERPLATE_PATTERNS에 맞는 줄 제거
+
+    Returns:
+        (정리된 페이지 목록, 통계 {"lines": 제거한 줄 수, "chars": 제거한 글자 수})
+    """
+    pages_by_source = defaultdict(list)
+    for page in pages:
+        pages_by_source[page.metadata.get("source", "")].append(page)
+
+    repeated = {}
+    for source, source_pages in pages_by_source.items():
+        counts = Counter()
+        for page in source_pages:
+            lines = [line for line in page.page_content.splitlines() if line.strip()]
+            edges = lines[:EDGE_LINES] + lines[-EDGE_LINES:]
+            counts.update({_mask_line(line) for line in edges})
+        min_pages = max(2, (len(source_pages) + 1) // 2)
+        repeated[source] = {line for line, count in counts.items() if count >= min_pages}
+
+    stats = {"lines": 0, "chars": 0}
+    cleaned = []
+    for page in pages:
+        source_repeated = repeated[page.metadata.get("source", "")]
+        kept = []
+        for line in page.page_content.splitlines():
+            if line.strip() and (_is_boilerplate(line) or _mask_line(line) in source_repeated):
+                stats["lines"] += 1
+                stats["chars"] += len(line)
+                continue
+            kept.append(line)
+        cleaned.append(Document(page_content="\n".join(kept), metadata=page.metadata))
+    return cleaned, stats
+
+
+def _body(doc: Document) -> str:
+    """비교할 본문 (섹션 제목 접두어와 공백 제외)"""
+    section = doc.metadata.get("section", "")
+    text = doc.page_content
+    prefix = f"[{section}]\n"
+    if section and text.startswith(prefix):
+        text = text[len(prefix):]
+    return re.sub(r"\s+", "", text)
+
+
+def _shingles(text: str) -> np.ndarray:
+    """글자 shingle 해시 (32비트, 중복 제거)"""
+    if len(text) <= SHINGLE_CHARS:
+        grams = {text}
+    else:
+        grams = {text[i:i + SHINGLE_CHARS] for i in range(len(text) - SHINGLE_CHARS + 1)}
+    return np.unique(np.array(
+        [int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=4).digest(), "little") for g in grams],
+        dtype=np.uint64,
+    ))
+
+
+def _minhash(shingles: np.ndarray) -> np.ndarray:
+    """MinHash 서명 (순열마다 (a*x + b) mod p 의 최솟값)"""
+    hashed = (np.outer(shingles, _PERMUTATION_A) + _PERMUTATION_B) % _MERSENNE_PRIME
+    return hashed.min(axis=0)
+
+
+def _jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    """실제 자카드 유사도 (정렬된 shingle 해시)"""
+    intersection = len(np.intersect1d(a, b, assume_unique=True))
+    return intersection / (len(a) + len(b) - intersection)
+
+
+def mark_near_duplicates(docs: List[Document], threshold: float = NEAR_DUPLICATE_THRESHOLD) -> Dict:
+    """
+    거의 같은 청크에 duplicate_of 표시 (먼저 나온 청크를 원본으로 유지)
+
+    처리 과정:
+    1. 공백을 뺀 본문이 완전히 같으면 바로 중복
+    2. MinHash 서명을 밴드로 나눠 같은 밴드 값을 가진 청크를 후보로 선택 (LSH)
+    3. 후보와 실제 자카드 유사도가 threshold 이상이면 중복
+
+    Returns:
+        통계 {"chunks", "exact", "near", "kept"}
+    """
+    exact_seen: Dict[str, str] = {}
+    buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+    kept_shingles: Dict[int, np.ndarray] = {}
+    stats = {"chunks": len(docs), "exact": 0, "near": 0}
+
+    for i, doc in enumerate(docs):
+        doc.metadata.pop("duplicate_of", None)
+        body = _body(doc)
+        digest = hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+        if digest in exact_seen:
+            doc.metadata["duplicate_of"] = exact_seen[digest]
+            stats["exact"] += 1
+            continue
+
+        shingles = _shingles(body)
+        signature = _minhash(shingles).reshape(MINHASH_BANDS, MINHASH_ROWS)
+        bands = [(band, signature[band].tobytes()) for band in range(MINHASH_BANDS)]
+        candidates = {j for key in bands for j in buckets.get(key, [])}
+        original = next((j for j in sorted(candidates) if _jaccard(shingles, kept_shingles[j]) >= threshold), None)
+        if original is not None:
+            doc.metadata["duplicate_of"] = docs[original].metadata["chunk_id"]
+            stats["near"] += 1
+            continue
+
+        exact_seen[digest] = doc.metadata["chunk_id"]
+        kept_shingles[i] = shingles
+        for key in bands:
+            buckets[key].append(i)
+
+    stats["kept"] = stats["chunks"] - stats["exact"] - stats["near"]
+    return stats
+
+
+def unique_chunks(docs: List[Document]) -> List[Document]:
+    """중복 표시가 없는 청크만 (임베딩/번역 대상)"""
+    return [doc for doc in docs if "duplicate_of" not in doc.metadata]
@@ -0,0 +1,221 @@
+# =============================================================================
+# FAQ 답변 인덱스 (사전 계산된 자주 묻는 질문 답변)
+# =============================================================================
+# 주요 기능:
+# 1. faq_builder.py가 만든 인덱스 파일(질문 임베딩 + 다국어 답변) 로드
+# 2. 정규화된 질문 문자열 완전 일치 조회 (임베딩 계산 없이 즉시 응답)
+# 3. 질문 임베딩 행렬에 대한 벡터화된 코사인 유사도 검색
+#    (질문 임베딩은 호출하는 쪽이 스레드에서 계산해 전달하고 RAG 검색에서도 재사용)
+# 4. 인덱스 재구축 후 메모리의 인덱스 교체
+# =============================================================================
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.memory_budget import register_memory_component
+from config.vector_store import get_embeddings
+
+# 인덱스 파일 경로 (임베딩 행렬 / 질문·답변 메타데이터)
+FAQ_INDEX_DIR = os.path.join("data", "faq_index")
+FAQ_EMBEDDINGS_PATH = os.path.join(FAQ_INDEX_DIR, "embeddings.npy")
+FAQ_ENTRIES_PATH = os.path.join(FAQ_INDEX_DIR, "entries.json")
+
+# 큐레이션된 FAQ 질문 목록 (한국어, faq_builder.py가 답변 생성)
+FAQ_QUESTIONS_PATH = os.path.join("data", "faq_questions.json")
+
+# 이 값 이상의 코사인 유사도일 때만 FAQ 답변을 사용 (오답 방지를 위해 높게 설정)
+FAQ_SIMILARITY_THRESHOLD = float(os.getenv("FAQ_SIMILARITY_THRESHOLD", "0.92"))
+
+# 지원 언어 (TranslationService와 동일)
+FAQ_LANGUAGES = ['ko', 'en', 'vi', 'my']
+
+
+class FAQIndex:
+    """
+    메모리에 올라온 FAQ 인덱스
+    - embeddings: (질문 변형 수, 차원) 행렬, 행마다 L2 정규화됨
+      (디스크에는 float16, 메모리에는 계산용 float32로 보관)
+    - rows: 각 행의 {faq_id, lang} 정보
+    - answers: faq_id -> {언어코드: 답변}
+    """
+
+    def __init__(self, embeddings: np.ndarray, rows: List[Dict], answers: Dict[str, Dict[str, str]]):
+        self.embeddings = embeddings.astype(np.float32)
+        self.rows = rows
+        self.answers = answers
+        # 정규화된 질문 문자열 -> 행 번호 (완전 일치는 임베딩 없이 처리)
+        self.exact = {normalize_question(row['question']): i for i, row in enumerate(rows)}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def answer_for_row(self, row_index: int) -> Optional[Tuple[str, str]]:
+        """행 번호에 해당하는 (답변, 언어코드) 반환"""
+        row = self.rows[row_index]
+        answer = self.answers.get(row['faq_id'], {}).get(row['lang'])
+        if not answer:
+            return None
+        return answer, row['lang']
+
+
+# 현재 사용 중인 인덱스 (재구축 시 통째로 교체)
+_faq_index: Optional[FAQIndex] = None
+_faq_lock = threading.Lock()
+
+
+def normalize_question(text: str) -> str:
+    """완전 일치 비교를 위해 공백/문장부호/대소문자 차이 제거"""
+    text = re.sub(r"[\s\?\!\.\,~]+", " ", text.strip().lower())
+    return text.strip()
+
+
+def load_faq_questions() -> List[str]:
+    """FAQ 질문 목록 로드 (중복 제거, 순서 유지)"""
+    if not os.path.exists(FAQ_QUESTIONS_PATH):
+        print(f"Error: FAQ question list not found at {FAQ_QUESTIONS_PATH}")
+        return []
+    with open(FAQ_QUESTIONS_PATH, encoding="utf-8") as f:
+        questions = json.load(f)
+    return list(dict.fromkeys(q.strip() for q in questions if q.strip()))
+
+
+def save_faq_index(embeddings: np.ndarray, rows: List[Dict], answers: Dict[str, Dict[str, str]]):
+    """
+    FAQ 인덱스를 디스크에 저장
+    - 임베딩은 float16으로 저장하여 크기를 절반으로 줄임
+    - 임시 파일에 쓴 뒤 교체하여 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 함
+    """
+    os.makedirs(FAQ_INDEX_DIR, exist_ok=True)
+
+    tmp_embeddings = FAQ_EMBEDDINGS_PATH + ".tmp.npy"
+    np.save(tmp_embeddings, embeddings.astype(np.float16))
+
+    tmp_entries = FAQ_ENTRIES_PATH + ".tmp"
+    with open(tmp_entries, "w", encoding="utf-8") as f:
+        json.dump({"rows": rows, "answers": answers}, f, ensure_ascii=False)
+
+    os.replace(tmp_embeddings, FAQ_EMBEDDINGS_PATH)
+    os.replace(tmp_entries, FAQ_ENTRIES_PATH)
+    print(f"💾 FAQ 인덱스 저장 완료: 질문 변형 {len(rows)}개, FAQ {len(answers)}개")
+
+
+def load_faq_index() -> Optional[FAQIndex]:
+    """디스크에서 FAQ 인덱스를 읽어 메모리 인덱스를 교체"""
+    global _faq_index
+    if not (os.path.exists(FAQ_EMBEDDINGS_PATH) and os.path.exists(FAQ_ENTRIES_PATH)):
+        print("📝 FAQ 인덱스 없음: python faq_builder.py 로 생성할 수 있습니다")
+        with _faq_lock:
+            _faq_index = None
+        return None
+
+    try:
+        embeddings = np.load(FAQ_EMBEDDINGS_PATH)
+        with open(FAQ_ENTRIES_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+        index = FAQIndex(embeddings, data["rows"], data["answers"])
+        with _faq_lock:
+            _faq_index = index
+        print(f"✅ FAQ 인덱스 로드: 질문 변형 {len(index)}개")
+        return index
+    except Exception as e:
+        print(f"⚠️ FAQ 인덱스 로드 실패: {e}")
+        with _faq_lock:
+            _faq_index = None
+        return None
+
+
+def unload_faq_index():
+    """
+    FAQ 인덱스 사용 중지
+    - PDF 재import 중에는 이전 문서 기준 답변이 나가지 않도록 비활성화
+    """
+    global _faq_index
+    with _faq_lock:
+        _faq_index = None
+
+
+def get_faq_index() -> Optional[FAQIndex]:
+    """현재 FAQ 인덱스 반환 (없으면 None)"""
+    return _faq_index
+
+
+def faq_index_nbytes() -> int:
+    """FAQ 인덱스 임베딩 행렬 크기 (로드 전이면 0)"""
+    index = _faq_index
+    return index.embeddings.nbytes if index is not None else 0
+
+
+# 작고 LLM 호출을 줄여 부하를 낮추므로 해제하지 않음 (측정만)
+register_memory_component("faq_index", faq_index_nbytes)
+
+
+def faq_index_ready() -> bool:
+    """FAQ 인덱스가 로드되어 있는지 (유사도 조회용 질문 임베딩을 계산할 필요가 있는지)"""
+    index = _faq_index
+    return index is not None and len(index) > 0
+
+
+def lookup_faq_exact(message: str) -> Optional[Tuple[str, str, float]]:
+    """
+    정규화된 질문 문자열 완전 일치 조회 (임베딩 계산 없음, 이벤트 루프에서 바로 호출 가능)
+
+    Returns:
+        (답변, 언어코드, 1.0) 또는 None
+    """
+    index = _faq_index
+    if index is None or len(index) == 0:
+        return None
+    row_index = index.exact.get(normalize_question(message))
+    if row_index is None:
+        return None
+    hit = index.answer_for_row(row_index)
+    return (hit[0], hit[1], 1.0) if hit else None
+
+
+def lookup_faq(message: str, query_vector: Optional[List[float]] = None) -> Optional[Tuple[str, str, float]]:
+    """
+    사용자 메시지에 해당하는 사전 계산된 답변 조회
+
+    처리 과정:
+    1. 정규화된 문자열 완전 일치 확인 (임베딩 계산 없음)
+    2. 질문 임베딩과 전체 FAQ 임베딩 행렬의 내적으로 유사도 일괄 계산
+       (query_vector가 주어지면 그대로 사용: 같은 임베딩을 RAG 검색에서도 재사용)
+    3. 최고 유사도가 임계값 이상이면 해당 언어의 답변 반환
+
+    Returns:
+        (답변, 언어코드, 유사도) 또는 None
+    """
+    index = _faq_index
+    if index is None or len(index) == 0:
+        return None
+
+    # 1단계: 완전 일치
+    hit = lookup_faq_exact(message)
+    if hit:
+        return hit
+
+    # 2단계: 벡터화된 유사도 검색 (정규화된 벡터이므로 내적 = 코사인 유사도)
+    # (조회 실패 시 일반 파이프라인으로 처리되도록 None 반환)
+    try:
+        if query_vector is None:
+            query_vector = get_embeddings().embed_query(message)
+        query = np.array(query_vector, dtype=np.float32)
+    except Exception as e:
+        print(f"⚠️ FAQ 조회 오류: {e}")
+        return None
+    query /= (np.linalg.norm(query) or 1.0)
+    scores = index.embeddings @ query
+    best = int(np.argmax(scores))
+    score = float(scores[best])
+
+    # 3단계: 임계값 확인
+    if score < FAQ_SIMILARITY_THRESHOLD:
+        return None
+    hit = index.answer_for_row(best)
+    if not hit:
+        return None
+    return hit[0], hit[1], score
@@ -0,0 +1,129 @@
+# =============================================================================
+# 인덱스 세대(generation) 관리 (무중단 재import용)
+# =============================================================================
+# 주요 기능:
+# 1. import할 때마다 새 세대(<컬렉션>@<시각>)에 PGVector 컬렉션과 로컬 인덱스를 따로 생성
+# 2. 생성이 끝나면 활성 세대 포인터 파일(data/index/_active/<컬렉션>.json)을 원자적으로 교체
+# 3. 서버는 포인터가 바뀐 것을 감지해 새 세대를 미리 로드한 뒤 교체 (config/collection_registry.py)
+# 4. 최근 INDEX_KEEP_GENERATIONS개 세대만 남기고 오래된 세대 삭제
+#
+# 포인터가 없는 컬렉션은 이전 방식(컬렉션명 = 세대명)으로 동작
+# =============================================================================
+import json
+import os
+import shutil
+import time
+from typing import Dict, List, Optional
+
+from utils.chunk_store import INDEX_DIR, chunk_store_path
+
+# 세대 구분자 (사용자가 요청할 수 있는 컬렉션 이름에는 쓸 수 없는 문자)
+GENERATION_SEPARATOR = "@"
+
+# 활성 세대 포인터 위치
+ACTIVE_DIR = os.path.join(INDEX_DIR, "_active")
+
+# 남겨둘 세대 수 (활성 세대 + 이전 세대: 교체 직후 처리 중인 요청과 롤백용)
+INDEX_KEEP_GENERATIONS = max(2, int(os.getenv("INDEX_KEEP_GENERATIONS", "2")))
+
+
+def pointer_path(collection_name: str) -> str:
+    """컬렉션의 활성 세대 포인터 파일 경로"""
+    return os.path.join(ACTIVE_DIR, f"{collection_name}.json")
+
+
+def new_generation_name(collection_name: str) -> str:
+    """새 세대 이름 (예: mjc_homepage@20251019-153000123)"""
+    now = time.time()
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"{int(now * 1000) % 1000:03d}"
+    return f"{collection_name}{GENERATION_SEPARATOR}{stamp}"
+
+
+def read_pointer(collection_name: str) -> Optional[Dict]:
+    """활성 세대 포인터 읽기 ({"active": 세대명, "history": [오래된 순 세대명]}, 없으면 None)"""
+    try:
+        with open(pointer_path(collection_name), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"⚠️ 활성 세대 포인터 읽기 실패 ({collection_name}): {e}")
+        return None
+
+
+def active_generation(collection_name: str) -> str:
+    """현재 활성 세대 이름 (포인터가 없으면 이전 방식대로 컬렉션명 그대로)"""
+    pointer = read_pointer(collection_name)
+    return pointer["active"] if pointer else collection_name
+
+
+def collection_exists(collection_name: str) -> bool:
+    """import된 컬렉션인지 (활성 세대 포인터 또는 이전 방식 로컬 인덱스가 있음)"""
+    return os.path.exists(pointer_path(collection_name)) or os.path.exists(chunk_store_path(collection_name))
+
+
+def list_indexed_collections() -> List[str]:
+    """data/index/ 에 import된 컬렉션 이름 (세대 디렉터리와 '_' 디렉터리 제외)"""
+    names = []
+    if os.path.isdir(ACTIVE_DIR):
+        names += [
+            name[:-len(".json")] for name in os.listdir(ACTIVE_DIR)
+            if name.endswith(".json") and not name.startswith("_")
+        ]
+    if os.path.isdir(INDEX_DIR):
+        names += [
+            name for name in os.listdir(INDEX_DIR)
+            if not name.startswith("_") and GENERATION_SEPARATOR not in name
+            and os.path.exists(chunk_store_path(name))
+        ]
+    return sorted(set(names))
+
+
+def activate_generation(collection_name: str, generation: str) -> List[str]:
+    """
+    새 세대를 활성 세대로 교체
+
+    처리 과정:
+    1. 이전 세대 목록에 새 세대 추가 (포인터가 없으면 이전 방식 컬렉션을 첫 세대로 간주)
+    2. 임시 파일에 쓴 뒤 os.replace로 교체 (읽는 쪽은 항상 완전한 포인터만 봄)
+    3. 남겨둘 세대 수를 넘는 오래된 세대 목록 반환 (삭제는 호출하는 쪽에서)
+
+    Returns:
+        삭제할 세대 이름 목록
+    """
+    pointer = read_pointer(collection_name)
+    if pointer:
+        history = pointer.get("history", [pointer["active"]])
+    else:
+        history = [collection_name] if os.path.exists(chunk_store_path(collection_name)) else []
+    history = [name for name in history if name != generation] + [generation]
+    expired, history = history[:-INDEX_KEEP_GENERATIONS], history[-INDEX_KEEP_GENERATIONS:]
+
+    os.makedirs(ACTIVE_DIR, exist_ok=True)
+    path = pointer_path(collection_name)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"active": generation, "history": history, "activated_at": time.time()}, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+    print(f"🔀 활성 세대 교체: {collection_name} → {generation}")
+    return expired
+
+
+def deactivate_collection(collection_name: str) -> List[str]:
+    """
+    컬렉션 사용 중지 (포인터 삭제)
+
+    Returns:
+        삭제할 세대 이름 목록 (포인터가 없던 이전 방식 컬렉션 포함)
+    """
+    pointer = read_pointer(collection_name)
+    generations = pointer.get("history", [pointer["active"]]) if pointer else []
+    if os.path.exists(chunk_store_path(collection_name)) and collection_name not in generations:
+        generations.append(collection_name)
+    if pointer:
+        os.remove(pointer_path(collection_name))
+    return generations
+
+
+def delete_generation_files(generation: str):
+    """세대의 로컬 인덱스 파일 삭제 (청크 저장소 + 양자화 인덱스)"""
+    shutil.rmtree(os.path.join(INDEX_DIR, generation), ignore_errors=True)
@@ -0,0 +1,188 @@
+# =============================================================================
+# 질문/답변 기록 (분석용 추가 전용 로그)
+# =============================================================================
+# 주요 기능:
+# 1. 요청마다 질문, 언어, 검색된 chunk_id, 단계별 소요 시간, 토큰 수, 캐시(FAQ) 결과 기록
+# 2. 요청 경로에서는 메모리 큐에 넣기만 하고 (대기 없음), 백그라운드 스레드가 모아서 저장
+# 3. SQLite(data/logs/interactions.sqlite3)에 배치 단위로 추가
+#    (INTERACTION_LOG_PARQUET=1 이고 pyarrow가 있으면 배치마다 Parquet 파일도 저장)
+# 4. 분석은 interaction_report.py 로 확인
+# =============================================================================
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+# 기록 사용 여부 (기본 사용)
+INTERACTION_LOG_ENABLED = os.getenv("INTERACTION_LOG_ENABLED", "1") == "1"
+
+# 저장 위치
+INTERACTION_LOG_DIR = os.getenv("INTERACTION_LOG_DIR", os.path.join("data", "logs"))
+INTERACTION_LOG_PATH = os.path.join(INTERACTION_LOG_DIR, "interactions.sqlite3")
+INTERACTION_PARQUET_DIR = os.path.join(INTERACTION_LOG_DIR, "parquet")
+INTERACTION_LOG_PARQUET = os.getenv("INTERACTION_LOG_PARQUET", "0") == "1"
+
+# 배치 설정: BATCH_SIZE개가 모이거나 FLUSH_SECONDS가 지나면 저장
+BATCH_SIZE = 100
+FLUSH_SECONDS = 2.0
+
+# 큐가 가득 차면 (저장이 밀리면) 요청을 막지 않고 기록을 버림
+MAX_QUEUE_SIZE = 10000
+
+# 저장 컬럼 (순서 = 테이블 컬럼 순서)
+COLUMNS = [
+    "ts", "session_id", "collection", "question", "language", "translated_question",
+    "chunk_ids", "stage_ms", "total_ms", "prompt_tokens", "output_tokens",
+    "cache", "cache_score", "success", "error",
+]
+_JSON_COLUMNS = ("chunk_ids", "stage_ms")
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS interactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    session_id TEXT,
+    collection TEXT,
+    question TEXT NOT NULL,
+    language TEXT,
+    translated_question TEXT,
+    chunk_ids TEXT,
+    stage_ms TEXT,
+    total_ms REAL,
+    prompt_tokens INTEGER,
+    output_tokens INTEGER,
+    cache TEXT,
+    cache_score REAL,
+    success INTEGER,
+    error TEXT
+)
+"""
+
+_queue: "queue.Queue[Optional[Dict]]" = queue.Queue(maxsize=MAX_QUEUE_SIZE)
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+_dropped = 0
+
+
+def connect(path: str = INTERACTION_LOG_PATH) -> sqlite3.Connection:
+    """로그 DB 연결 (없으면 테이블 생성)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    connection = sqlite3.connect(path)
+    # WAL: 기록 중에도 리포트에서 읽을 수 있음
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute(_CREATE_TABLE)
+    connection.execute("CREATE INDEX IF NOT EXISTS interactions_ts ON interactions (ts)")
+    return connection
+
+
+def _to_row(record: Dict) -> tuple:
+    """기록 dict -> 테이블 행 (목록/딕셔너리 값은 JSON 문자열)"""
+    return tuple(
+        json.dumps(record.get(column), ensure_ascii=False) if column in _JSON_COLUMNS else record.get(column)
+        for column in COLUMNS
+    )
+
+
+def _write_parquet(batch: List[Dict]):
+    """배치를 Parquet 파일 하나로 저장 (pyarrow가 없으면 건너뜀)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return
+    os.makedirs(INTERACTION_PARQUET_DIR, exist_ok=True)
+    rows = [dict(zip(COLUMNS, _to_row(record))) for record in batch]
+    table = pa.Table.from_pylist(rows)
+    path = os.path.join(INTERACTION_PARQUET_DIR, f"interactions-{int(time.time() * 1000)}.parquet")
+    pq.write_table(table, path)
+
+
+def _flush(connection: sqlite3.Connection, batch: List[Dict]):
+    """배치 저장 (실패해도 서버에는 영향 없음)"""
+    try:
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        with connection:
+            connection.executemany(
+                f"INSERT INTO interactions ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                [_to_row(record) for record in batch],
+            )
+        if INTERACTION_LOG_PARQUET:
+            _write_parquet(batch)
+    except Exception as e:
+        print(f"⚠️ 질문/답변 기록 저장 실패 ({len(batch)}건): {e}")
+
+
+def _writer_loop():
+    """
+    백그라운드 저장 스레드
+    - 큐에서 기록을 꺼내 BATCH_SIZE개 또는 FLUSH_SECONDS마다 한 번에 저장
+    - None을 받으면 남은 기록을 저장하고 종료
+    """
+    connection = connect()
+    batch: List[Dict] = []
+    deadline = time.monotonic() + FLUSH_SECONDS
+    running = True
+    while running:
+        try:
+            record = _queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            if record is None:
+                running = False
+            else:
+                batch.append(record)
+        except queue.Empty:
+            pass
+        if batch and (not running or len(batch) >= BATCH_SIZE or time.monotonic() >= deadline):
+            _flush(connection, batch)
+            batch = []
+        if time.monotonic() >= deadline:
+            deadline = time.monotonic() + FLUSH_SECONDS
+    connection.close()
+
+
+def _ensure_writer():
+    """저장 스레드 시작 (최초 기록 시 한 번)"""
+    global _writer
+    if _writer is not None:
+        return
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_writer_loop, name="interaction-log-writer", daemon=True)
+            _writer.start()
+
+
+def log_interaction(record: Dict):
+    """
+    질문/답변 기록 추가 (요청 경로에서 호출, 큐에 넣기만 함)
+
+    Args:
+        record: COLUMNS의 키를 가진 dict (ts가 없으면 현재 시각)
+    """
+    global _dropped
+    if not INTERACTION_LOG_ENABLED:
+        return
+    _ensure_writer()
+    record.setdefault("ts", time.time())
+    try:
+        _queue.put_nowait(record)
+    except queue.Full:
+        _dropped += 1
+        if _dropped % 1000 == 1:
+            print(f"⚠️ 질문/답변 기록 큐가 가득 차 기록을 버림 (누적 {_dropped}건)")
+
+
+def shutdown_interaction_log(timeout: float = 5.0):
+    """남은 기록을 저장하고 저장 스레드 종료 (서버 종료 시)"""
+    global _writer
+    writer = _writer
+    if writer is None:
+        return
+    _queue.put(None)
+    writer.join(timeout)
+    _writer = None
+
+
+atexit.register(shutdown_interaction_log)
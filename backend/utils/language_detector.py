@@ -0,0 +1,48 @@
+# =============================================================================
+# 로컬 언어 감지 (문자 체계 기반, 네트워크 호출 없음)
+# =============================================================================
+# 주요 기능:
+# 1. 한글 / 미얀마 문자 개수로 ko, my 판별
+# 2. 베트남어는 베트남어 전용 발음 기호가 있는 경우에만 판별
+# 3. 그 외 라틴 문자 텍스트는 None (googletrans 감지로 대체)
+#    - 영어와 프랑스어/스페인어/독일어 등은 문자 체계만으로 구분할 수 없음
+# =============================================================================
+import re
+from typing import Optional
+
+_HANGUL = re.compile(r"[가-힣ᄀ-ᇿ㄰-㆏]")
+_MYANMAR = re.compile(r"[က-႟ꩠ-ꩿꧠ-꧿]")
+_LATIN = re.compile(r"[A-Za-zÀ-ɏḀ-ỿ]")
+# 베트남어에만 쓰이는 문자: ă đ ơ ư ĩ ũ 와 베트남어용 성조 모음 블록(Ạ-ỹ)
+# (â ê ô, à é ã õ 등은 프랑스어/포르투갈어에도 쓰이므로 제외: "être", "você")
+_VIETNAMESE = re.compile(r"[ăđơưĩũĂĐƠƯĨŨẠ-ỹ]")
+
+# 이보다 글자 수가 적으면 판별하지 않음 ("ok", "?" 등)
+MIN_LETTERS = 3
+
+
+def detect_language(text: str) -> Optional[str]:
+    """
+    문자 체계로 언어 판별
+
+    판별 순서:
+    1. 미얀마 문자가 한글보다 많으면 my
+    2. 한글이 있으면 ko (영어 단어가 섞인 한국어 질문 포함)
+    3. 라틴 문자만 있으면 베트남어 전용 문자가 있을 때 vi
+       (없으면 영어인지 다른 라틴 문자 언어인지 알 수 없으므로 None)
+
+    Returns:
+        ko / my / vi, 판별할 수 없으면 None
+    """
+    hangul = len(_HANGUL.findall(text))
+    myanmar = len(_MYANMAR.findall(text))
+    latin = len(_LATIN.findall(text))
+    if hangul + myanmar + latin < MIN_LETTERS:
+        return None
+    if myanmar > hangul:
+        return "my"
+    if hangul:
+        return "ko"
+    if latin and _VIETNAMESE.search(text):
+        return "vi"
+    return None
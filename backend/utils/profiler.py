@@ -0,0 +1,224 @@
+# =============================================================================
+# 요청 단위 샘플링 프로파일러 (운영 중 켜고 끌 수 있음)
+# =============================================================================
+# 주요 기능:
+# 1. 관리자 API로 켜고 일부 요청(sample_rate 비율)만 프로파일링
+#    (관리자 토큰 + X-Profile: 1 헤더로 특정 요청만 강제 프로파일링 가능)
+# 2. 프로파일링 중인 요청이 있을 때만 샘플링 스레드가 PROFILE_INTERVAL_MS마다
+#    해당 요청을 처리 중인 스레드의 호출 스택 수집 (sys._current_frames)
+# 3. 스택 맨 아래에 ChatService 파이프라인 단계 이름을 붙여 단계별로 구분
+# 4. 요청이 끝나면 collapsed stack 형식(data/profiles/*.folded)으로 저장
+#    → speedscope.app 또는 flamegraph.pl 로 플레임 그래프 확인
+#
+# 꺼져 있을 때는 요청마다 설정 확인 1회, 단계마다 ContextVar 조회 1회만 추가됨
+# =============================================================================
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+# 저장 위치와 최대 보관 파일 수 (오래된 파일부터 삭제)
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join("data", "profiles"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+
+# 샘플링 간격 (ms)
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+
+# 현재 설정 (관리자 API로 변경, 서버 재시작 시 환경 변수 값으로 초기화)
+_settings = {
+    "enabled": os.getenv("PROFILING_ENABLED", "0") == "1",
+    "sample_rate": float(os.getenv("PROFILE_SAMPLE_RATE", "0.01")),
+}
+
+
+class RequestProfile:
+    """
+    요청 하나의 프로파일
+    - threads: 스레드 ID -> 그 스레드에서 실행 중인 단계 이름 (샘플링 대상)
+    - stacks: collapsed stack -> 샘플 수
+    - stage_seconds: 단계별 샘플링 시간 (실제 샘플 간격 합계, GIL 경쟁으로 간격이 늘어나도 정확)
+    """
+
+    def __init__(self, label: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.threads: Dict[int, str] = {}
+        self.stacks: Counter = Counter()
+        self.stage_seconds: Counter = Counter()
+        self.samples = 0
+        self.path: Optional[str] = None
+
+    def stage_ms(self) -> Dict[str, float]:
+        """단계별 샘플링 시간 (ms, 긴 순서)"""
+        return {stage: round(seconds * 1000, 1) for stage, seconds in self.stage_seconds.most_common()}
+
+
+# 현재 요청의 프로파일 (asyncio 태스크와 asyncio.to_thread 스레드로 전달됨)
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+# 프로파일링 중인 요청들과 샘플링 스레드
+_active: List[RequestProfile] = []
+_active_lock = threading.Lock()
+_sampler: Optional[threading.Thread] = None
+
+
+def configure_profiling(enabled: Optional[bool] = None, sample_rate: Optional[float] = None) -> Dict:
+    """프로파일링 설정 변경 (None인 값은 유지)"""
+    if enabled is not None:
+        _settings["enabled"] = enabled
+    if sample_rate is not None:
+        _settings["sample_rate"] = min(1.0, max(0.0, sample_rate))
+    print(f"🔬 프로파일링 설정: {_settings}")
+    return profiling_status()
+
+
+def list_profiles() -> List[str]:
+    """저장된 프로파일 파일 이름 (최신순)"""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    return sorted((name for name in os.listdir(PROFILE_DIR) if name.endswith(".folded")), reverse=True)
+
+
+def profile_path(profile_id: str) -> Optional[str]:
+    """프로파일 ID로 저장된 파일 경로 찾기 (없으면 None)"""
+    for name in list_profiles():
+        if name.endswith(f"-{profile_id}.folded"):
+            return os.path.join(PROFILE_DIR, name)
+    return None
+
+
+def profiling_status() -> Dict:
+    """현재 설정과 최근 프로파일 목록 (관리자 API 응답)"""
+    with _active_lock:
+        active = len(_active)
+    return {
+        **_settings,
+        "interval_ms": PROFILE_INTERVAL_MS,
+        "active": active,
+        "recent": list_profiles()[:20],
+    }
+
+
+def _frame_name(frame) -> str:
+    """스택 프레임 하나의 이름 (파일:함수)"""
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _collapse(frame, stage: str) -> str:
+    """호출 스택 -> collapsed stack 한 줄 (단계;바깥 함수;...;안쪽 함수)"""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    names.append(stage)
+    return ";".join(reversed(names))
+
+
+def _sampler_loop():
+    """
+    샘플링 스레드
+    - 프로파일링 중인 요청이 없어지면 종료 (다음 프로파일링 요청에서 다시 시작)
+    """
+    global _sampler
+    interval = PROFILE_INTERVAL_MS / 1000
+    last = time.perf_counter()
+    while True:
+        with _active_lock:
+            if not _active:
+                _sampler = None
+                return
+            targets = [(profile, list(profile.threads.items())) for profile in _active]
+        frames = sys._current_frames()
+        now = time.perf_counter()
+        elapsed, last = now - last, now
+        for profile, threads in targets:
+            for thread_id, stage in threads:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    profile.stacks[_collapse(frame, stage)] += 1
+                    profile.stage_seconds[stage] += elapsed
+                    profile.samples += 1
+        del frames
+        time.sleep(interval)
+
+
+def _write_profile(profile: RequestProfile) -> Optional[str]:
+    """collapsed stack 파일 저장 (샘플이 없으면 저장하지 않음) 후 오래된 파일 정리"""
+    if not profile.stacks:
+        return None
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{profile.label}-{profile.id}.folded"
+    path = os.path.join(PROFILE_DIR, name)
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in profile.stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    for old_name in list_profiles()[PROFILE_MAX_FILES:]:
+        os.remove(os.path.join(PROFILE_DIR, old_name))
+    return path
+
+
+@contextmanager
+def request_profile(forced: bool = False, label: str = "chat"):
+    """
+    요청 하나를 프로파일링 (샘플링 대상이 아니면 None)
+
+    사용 예:
+        with request_profile(forced) as profile:
+            response = await chat_service.process_chat(request)
+        if profile is not None:
+            print(profile.path, profile.stage_ms())
+    """
+    global _sampler
+    if not forced and not (_settings["enabled"] and random.random() < _settings["sample_rate"]):
+        yield None
+        return
+
+    profile = RequestProfile(label)
+    token = _current.set(profile)
+    with _active_lock:
+        _active.append(profile)
+        if _sampler is None:
+            _sampler = threading.Thread(target=_sampler_loop, name="request-profiler", daemon=True)
+            _sampler.start()
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+        with _active_lock:
+            _active.remove(profile)
+        try:
+            profile.path = _write_profile(profile)
+            print(f"🔬 프로파일 저장: {profile.path} ({profile.samples} 샘플, 단계별 {profile.stage_ms()})")
+        except Exception as e:
+            print(f"⚠️ 프로파일 저장 실패: {e}")
+
+
+@contextmanager
+def profile_stage(stage: str):
+    """
+    현재 스레드에서 실행하는 코드를 단계 이름으로 샘플링
+    - 프로파일링 중인 요청이 아니면 아무것도 하지 않음
+    - 이벤트 루프 스레드에서는 await 없이 실행되는 구간에만 사용
+      (await 중에는 다른 요청의 코드가 실행되므로)
+    """
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    thread_id = threading.get_ident()
+    previous = profile.threads.get(thread_id)
+    profile.threads[thread_id] = stage
+    try:
+        yield
+    finally:
+        if previous is None:
+            profile.threads.pop(thread_id, None)
+        else:
+            profile.threads[thread_id] = previous
@@ -0,0 +1,283 @@
+# =============================================================================
+# 양자화된 로컬 벡터 인덱스 (int8 / binary + 원본 정밀도 재정렬)
+# =============================================================================
+# 주요 기능:
+# 1. import 시 청크 임베딩을 VECTOR_BACKEND가 고른 형식(float32 / int8 / binary)으로만 저장
+#    (int8: 차원별 스케일, binary: 부호 비트 / 양자화 검색 시 pgvector에는 벡터를 저장하지 않음)
+# 2. 메모리에는 압축된 코드만 올리고, 원본 float32 벡터는 디스크(memmap)에 유지
+# 3. 압축 코드로 후보를 넉넉히 찾은 뒤 원본 벡터로 최종 top-k 재정렬 (rescoring)
+# 4. pgvector 대신 프로세스 내 검색 백엔드로 사용 (VECTOR_BACKEND 환경 변수)
+# 5. (선택) MMR로 서로 비슷한 후보를 걸러 다양한 top-k 선택
+# =============================================================================
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain.schema import Document
+
+from utils.chunk_store import INDEX_DIR, load_chunks
+
+# 검색 백엔드: pgvector(기본) / float32 / int8 / binary
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "pgvector")
+QUANTIZED_BACKENDS = ("float32", "int8", "binary")
+
+# 재정렬할 후보 수 = top_k * RESCORE_FACTOR
+RESCORE_FACTOR = int(os.getenv("RESCORE_FACTOR", "10"))
+
+# 비트 수 계산용 테이블 (0~255 각 바이트의 1 비트 개수)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# int8 점수 계산 시 한 번에 float로 변환할 행 수 (임시 메모리 제한)
+_INT8_BLOCK_ROWS = 16384
+
+
+def quantized_index_dir(collection_name: str) -> str:
+    """컬렉션의 양자화 인덱스 디렉터리"""
+    return os.path.join(INDEX_DIR, collection_name, "vectors")
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    차원별 대칭 int8 양자화
+    - scale[d] = max(|x[:, d]|) / 127
+    - 벡터 1개당 4바이트/차원 → 1바이트/차원
+    """
+    scale = np.abs(vectors).max(axis=0) / 127.0
+    scale[scale == 0] = 1.0
+    codes = np.clip(np.round(vectors / scale), -127, 127).astype(np.int8)
+    return codes, scale.astype(np.float32)
+
+
+def quantize_binary(vectors: np.ndarray) -> np.ndarray:
+    """부호 비트 양자화 (1비트/차원, 8차원씩 1바이트로 묶음)"""
+    return np.packbits(vectors > 0, axis=1)
+
+
+def build_quantized_index(collection_name: str, chunk_ids: List[str], vectors: np.ndarray,
+                          modes: Tuple[str, ...] = None):
+    """
+    청크 임베딩으로 양자화 인덱스 생성 및 저장
+
+    저장 파일:
+    - float32.npy: L2 정규화된 원본 벡터 (float32 검색 / 재정렬용, 검색 시 memmap으로 읽음)
+    - int8.npy / int8_scale.npy: int8 코드와 차원별 스케일 (modes에 int8이 있을 때만)
+    - binary.npy: 부호 비트 코드 (modes에 binary가 있을 때만)
+    - ids.json: 행 번호 -> chunk_id
+
+    Args:
+        modes: 저장할 형식 (기본: VECTOR_BACKEND 하나, 벤치마크는 모든 형식)
+    """
+    modes = modes or (VECTOR_BACKEND,)
+    directory = quantized_index_dir(collection_name)
+    os.makedirs(directory, exist_ok=True)
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+    sizes = {"float32": vectors.nbytes}
+    np.save(os.path.join(directory, "float32.npy"), vectors)
+    if "int8" in modes:
+        codes, scale = quantize_int8(vectors)
+        np.save(os.path.join(directory, "int8.npy"), codes)
+        np.save(os.path.join(directory, "int8_scale.npy"), scale)
+        sizes["int8"] = codes.nbytes + scale.nbytes
+    if "binary" in modes:
+        bits = quantize_binary(vectors)
+        np.save(os.path.join(directory, "binary.npy"), bits)
+        sizes["binary"] = bits.nbytes
+    with open(os.path.join(directory, "ids.json"), "w", encoding="utf-8") as f:
+        json.dump(chunk_ids, f, ensure_ascii=False)
+
+    unload_quantized_index(collection_name)
+    print(f"💾 양자화 인덱스 저장: {len(chunk_ids)}개 벡터 ("
+          + " / ".join(f"{mode} {nbytes // 1024}KB" for mode, nbytes in sizes.items()) + ")")
+
+
+class QuantizedIndex:
+    """
+    메모리에 올라온 양자화 인덱스
+    - mode에 해당하는 압축 코드만 메모리에 로드
+    - 원본 float32 벡터는 memmap (재정렬 시 후보 행만 디스크에서 읽음)
+    """
+
+    def __init__(self, directory: str, mode: str):
+        self.mode = mode
+        with open(os.path.join(directory, "ids.json"), encoding="utf-8") as f:
+            self.chunk_ids: List[str] = json.load(f)
+        # float32 모드는 원본 벡터로 직접 검색하므로 메모리에 로드, 나머지는 memmap
+        self.full = np.load(os.path.join(directory, "float32.npy"), mmap_mode=None if mode == "float32" else "r")
+        self.codes = None
+        self.scale = None
+        if mode == "int8":
+            self.codes = np.load(os.path.join(directory, "int8.npy"))
+            self.scale = np.load(os.path.join(directory, "int8_scale.npy"))
+        elif mode == "binary":
+            self.codes = np.load(os.path.join(directory, "binary.npy"))
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    @property
+    def nbytes(self) -> int:
+        """메모리에 상주하는 바이트 수 (memmap 제외)"""
+        if self.codes is None:
+            return int(self.full.size * 4)
+        return int(self.codes.nbytes + (self.scale.nbytes if self.scale is not None else 0))
+
+    def _candidates(self, query: np.ndarray, count: int) -> np.ndarray:
+        """압축 코드로 근사 유사도를 계산해 후보 행 번호 반환"""
+        scores = self._approximate(query, slice(None))
+        count = min(count, len(scores))
+        candidates = np.argpartition(-scores, count - 1)[:count]
+        return candidates
+
+    def search(self, query: np.ndarray, top_k: int, rescore: bool = True) -> List[Tuple[int, float]]:
+        """
+        벡터 검색
+
+        처리 과정:
+        1. float32 모드: 원본 벡터 전체와 내적 (정확한 검색)
+        2. int8/binary 모드: 압축 코드로 top_k * RESCORE_FACTOR 후보 선택
+        3. 후보 행의 원본 벡터로 코사인 유사도를 다시 계산해 top_k 선택
+
+        Returns:
+            [(행 번호, 코사인 유사도)] 유사도 내림차순
+        """
+        query = np.asarray(query, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        top_k = min(top_k, len(self))
+        if top_k <= 0:
+            return []
+
+        if self.codes is None:
+            scores = self.full @ query
+            order = np.argsort(-scores)[:top_k]
+            return [(int(i), float(scores[i])) for i in order]
+
+        rows = self._candidates(query, top_k * RESCORE_FACTOR if rescore else top_k)
+        if not rescore:
+            # 재정렬 없이 압축 코드 점수 순서 그대로 사용 (벤치마크 비교용)
+            rows = rows[np.argsort(-self._approximate(query, rows))]
+            return [(int(row), float(self.full[row] @ query)) for row in rows]
+
+        rows = np.sort(rows)  # memmap 순차 읽기
+        scores = np.asarray(self.full[rows]) @ query
+        order = np.argsort(-scores)[:top_k]
+        return [(int(rows[i]), float(scores[i])) for i in order]
+
+    def _approximate(self, query: np.ndarray, rows) -> np.ndarray:
+        """
+        압축 코드 기반 근사 점수 (클수록 유사)
+        - int8: 비대칭 내적 (쿼리는 float 그대로, 코퍼스만 int8), 블록 단위로 계산
+        - binary: 해밍 거리의 음수
+        """
+        codes = self.codes[rows]
+        if self.mode == "int8":
+            weighted_query = query * self.scale
+            return np.concatenate([
+                codes[start:start + _INT8_BLOCK_ROWS].astype(np.float32) @ weighted_query
+                for start in range(0, len(codes), _INT8_BLOCK_ROWS)
+            ]) if len(codes) else np.zeros(0, dtype=np.float32)
+        query_bits = quantize_binary(query[None, :])[0]
+        return -_POPCOUNT[np.bitwise_xor(codes, query_bits)].sum(axis=1, dtype=np.int32)
+
+
+# 형식별로 있어야 하는 파일 (float32 재정렬용 원본 벡터는 항상 저장)
+_MODE_FILES = {"float32": "float32.npy", "int8": "int8.npy", "binary": "binary.npy"}
+
+# 컬렉션명 -> 로드된 인덱스
+_indexes: Dict[str, QuantizedIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_quantized_index(collection_name: str, mode: str = None) -> Optional[QuantizedIndex]:
+    """양자화 인덱스 반환 (최초 호출 시 로드, 없으면 None)"""
+    mode = mode or VECTOR_BACKEND
+    key = f"{collection_name}:{mode}"
+    index = _indexes.get(key)
+    if index is not None:
+        return index
+
+    directory = quantized_index_dir(collection_name)
+    if not os.path.exists(os.path.join(directory, "ids.json")):
+        return None
+    if not os.path.exists(os.path.join(directory, _MODE_FILES[mode])):
+        # 다른 VECTOR_BACKEND로 import한 인덱스 (다시 import해야 이 형식으로 검색 가능)
+        return None
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = QuantizedIndex(directory, mode)
+            _indexes[key] = index
+            print(f"✅ 로컬 벡터 인덱스 로드 ({mode}): {len(index)}개, 메모리 {index.nbytes // 1024}KB")
+    return index
+
+
+def unload_quantized_index(collection_name: str):
+    """컬렉션의 모든 모드 인덱스를 메모리에서 해제 (다음 검색 시 다시 로드)"""
+    with _indexes_lock:
+        for key in [key for key in _indexes if key.startswith(f"{collection_name}:")]:
+            _indexes.pop(key, None)
+
+
+def loaded_index_nbytes(collection_name: str) -> int:
+    """컬렉션의 로드된 인덱스가 차지하는 메모리 (바이트)"""
+    return sum(index.nbytes for key, index in list(_indexes.items())
+               if key.startswith(f"{collection_name}:"))
+
+
+def mmr_select(query: np.ndarray, vectors: np.ndarray, k: int, lambda_mult: float) -> List[int]:
+    """
+    MMR(Maximal Marginal Relevance) 선택
+    - 매번 lambda x (질문과의 유사도) - (1 - lambda) x (이미 고른 결과와의 최대 유사도)가 가장 큰 후보 선택
+    - 첫 번째는 항상 질문과 가장 가까운 후보
+
+    Args:
+        query, vectors: L2 정규화된 질문 벡터와 후보 벡터 (후보 수, 차원)
+        lambda_mult: 1이면 유사도 순서 그대로, 작을수록 다양성 우선
+
+    Returns:
+        선택한 후보 번호 (선택 순서)
+    """
+    relevance = vectors @ query
+    selected = [int(np.argmax(relevance))]
+    redundancy = vectors @ vectors[selected[0]]
+    while len(selected) < min(k, len(vectors)):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[selected] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        redundancy = np.maximum(redundancy, vectors @ vectors[best])
+    return selected
+
+
+def similarity_search_quantized(collection_name: str, query_vector: List[float], top_k: int,
+                                mode: str = None, fetch_k: int = 0,
+                                lambda_mult: float = 1.0) -> List[Tuple[Document, float]]:
+    """
+    양자화 인덱스로 검색하여 PGVector와 같은 (문서, 코사인 거리) 목록 반환
+    - 문서 본문/메타데이터는 청크 저장소에서 조회
+    - lambda_mult < 1이면 fetch_k개 후보 중 MMR로 top_k 선택 (원본 float32 벡터 사용,
+      선택한 결과는 선택 순서가 아닌 유사도 순서로 반환)
+    """
+    index = get_quantized_index(collection_name, mode)
+    if index is None:
+        return []
+    store = load_chunks(collection_name)
+    query = np.asarray(query_vector, dtype=np.float32)
+    results = index.search(query, max(top_k, fetch_k) if lambda_mult < 1 else top_k)
+    if lambda_mult < 1 and len(results) > top_k:
+        rows = np.array([row for row, _ in results])
+        order = mmr_select(query / (np.linalg.norm(query) or 1.0), np.asarray(index.full[rows]), top_k, lambda_mult)
+        # 선택한 결과는 유사도 순서로 (PGVector max_marginal_relevance_search_with_score와 같은 순서)
+        results = [results[i] for i in sorted(order)]
+
+    hits = []
+    for row, score in results:
+        record = store.get(index.chunk_ids[row])
+        if record is None:
+            continue
+        hits.append((Document(page_content=record["text"], metadata=record["metadata"]), 1.0 - score))
+    return hits
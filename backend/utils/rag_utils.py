@@ -1,33 +1,113 @@
-from typing import List
-from config.vector_store import get_vector_store
+import os
+from typing import List, Optional, Tuple
+from langchain.schema import Document
+from config.vector_store import get_embeddings
+from config.collection_registry import CollectionEntry
+from utils.chunk_store import expand_with_neighbors
+from utils.quantized_index import VECTOR_BACKEND, QUANTIZED_BACKENDS, similarity_search_quantized
 
-def search_similar_documents(query: str, top_k: int = 3) -> List[str]:
+# 검색된 청크 1개당 이웃 확장 포함 최대 토큰 수
+RAG_CONTEXT_TOKENS = int(os.getenv("RAG_CONTEXT_TOKENS", "384"))
+
+# 메타데이터가 없는 이전 방식 청크는 기존처럼 500자로 제한
+LEGACY_MAX_CHARS = 500
+
+# 최종 top-k 다양성 (MMR): 1이면 유사도 순서 그대로, 작을수록 비슷한 청크를 덜 뽑음
+# - top_k * MMR_FETCH_FACTOR개 후보 중에서 선택
+# - 기본값은 관련도 쪽 (0.5면 관련 청크가 top_k에서 밀려날 수 있음)
+#   값을 바꾸기 전에 retrieval_eval의 structure-float32+nb+mmr 설정으로 recall/MRR 비교
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.7"))
+MMR_FETCH_FACTOR = int(os.getenv("MMR_FETCH_FACTOR", "4"))
+
+# 원문(번역 전) 질문 검색의 최고 결과가 이 거리 이하면 번역문 검색 생략 (코사인 거리)
+SPECULATIVE_ACCEPT_DISTANCE = float(os.getenv("SPECULATIVE_ACCEPT_DISTANCE", "0.35"))
+
+def embed_query(query: str) -> List[float]:
+    """질문 임베딩 (FAQ 조회와 원문 질문 검색에서 한 번만 계산해 함께 사용)"""
+    return get_embeddings().embed_query(query)
+
+def retrieve_documents(query: str, top_k: int, entry: CollectionEntry,
+                       query_vector: Optional[List[float]] = None) -> List[Tuple[Document, float]]:
     """
-    LangChain 벡터 스토어에서 유사한 문서 검색
-    - 사용자 질문과 유사한 PDF 문서 조각들을 찾아서 반환
-    - AI가 정확한 답변을 생성할 수 있도록 참고 자료 제공
+    컬렉션 세대의 벡터 스토어에서 유사한 청크 검색
+    - (문서, 거리) 목록 반환 (거리가 작을수록 유사)
+    - VECTOR_BACKEND가 float32/int8/binary면 로컬 양자화 인덱스 사용
+      (인덱스가 없으면 pgvector로 검색)
+    - entry: 요청이 lease_collection으로 잡고 있는 세대 (검색/참고 자료 구성이 모두 같은 세대를 사용,
+      여기서 다시 잡으면 그 사이 세대가 교체되어 요청이 잡지 않은 세대로 검색할 수 있음)
+    - MMR_LAMBDA < 1이면 후보를 넉넉히 찾은 뒤 서로 비슷한 청크를 피해 top_k 선택
+    - query_vector: 이미 계산한 질문 임베딩 (FAQ 조회에서 계산한 경우, 없으면 여기서 계산)
     """
-    vector_store = get_vector_store()
+    fetch_k = top_k * MMR_FETCH_FACTOR
+    if query_vector is None:
+        query_vector = embed_query(query)
+    if VECTOR_BACKEND in QUANTIZED_BACKENDS:
+        hits = similarity_search_quantized(entry.generation, query_vector, top_k,
+                                           fetch_k=fetch_k, lambda_mult=MMR_LAMBDA)
+        if hits:
+            return hits
+
+    vector_store = entry.vector_store
     if not vector_store:
         return []
-    
+    if MMR_LAMBDA < 1:
+        return vector_store.max_marginal_relevance_search_with_score_by_vector(
+            query_vector, k=top_k, fetch_k=fetch_k, lambda_mult=MMR_LAMBDA)
+    return vector_store.similarity_search_with_score_by_vector(query_vector, k=top_k)
+
+def search_hits(query: str, top_k: int, entry: CollectionEntry,
+                query_vector: Optional[List[float]] = None) -> List[Tuple[Document, float]]:
+    """retrieve_documents와 같지만 오류 시 빈 목록 반환 (병렬 실행용)"""
     try:
-        print(f"🔍 RAG 검색: '{query}'")
-        
-        # 벡터 유사도 검색으로 관련 문서 찾기 (상위 3개)
-        docs = vector_store.similarity_search(query, k=top_k)
-        
-        # 문서 내용을 참고 자료 형태로 변환
-        reference_docs = []
-        for i, doc in enumerate(docs, 1):
-            # 문서 내용이 너무 길면 500자로 제한
-            content = doc.page_content[:500] + "..." if len(doc.page_content) > 500 else doc.page_content
-            reference_docs.append(f"문서 {i}: {content}")
-            print(f"📄 문서 {i}: {content[:100]}...")
-        
-        print(f"✅ 선택된 문서: {len(reference_docs)}개")
-        return reference_docs
-        
+        print(f"🔍 RAG 검색 [{entry.name}]: '{query}'")
+        return retrieve_documents(query, top_k, entry, query_vector)
     except Exception as e:
         print(f"❌ RAG 검색 오류: {e}")
         return []
+
+def is_confident(hits: List[Tuple[Document, float]]) -> bool:
+    """최고 결과가 충분히 가까운지 (원문 검색 결과만으로 답변 가능한지)"""
+    return bool(hits) and hits[0][1] <= SPECULATIVE_ACCEPT_DISTANCE
+
+def merge_hits(hit_lists: List[List[Tuple[Document, float]]], top_k: int) -> List[Tuple[Document, float]]:
+    """
+    여러 검색 결과 합치기 (원문 질문 검색 + 번역문 검색)
+    - 같은 청크는 더 가까운 거리만 유지
+    - 거리순으로 top_k개 반환
+    """
+    best = {}
+    for hits in hit_lists:
+        for doc, score in hits:
+            key = doc.metadata.get("chunk_id") or doc.page_content
+            if key not in best or score < best[key][1]:
+                best[key] = (doc, score)
+    return sorted(best.values(), key=lambda hit: hit[1])[:top_k]
+
+def format_reference_docs(hits: List[Tuple[Document, float]], entry: CollectionEntry) -> List[str]:
+    """
+    검색 결과를 참고 자료 문자열로 변환
+    - 구조 기반 청크: 검색된 청크 전체 + 같은 섹션의 이웃 청크 (토큰 예산 내)
+    - 이전 방식 청크: 500자로 제한
+    - 이웃 청크는 검색한 세대(entry, 요청이 잡고 있는 세대)의 청크 저장소에서 찾음
+      (해제된 세대의 청크 저장소를 다시 로드하지 않도록)
+    """
+    reference_docs = []
+    included_ids = set()
+    for doc, score in hits:
+        chunk_id = doc.metadata.get("chunk_id")
+        # 앞선 결과의 이웃 확장에 이미 포함된 청크는 중복이므로 건너뜀
+        if chunk_id and chunk_id in included_ids:
+            continue
+        expanded = expand_with_neighbors(entry.generation, chunk_id, RAG_CONTEXT_TOKENS) if chunk_id else None
+        if expanded is not None:
+            content, chunk_ids = expanded
+            included_ids.update(chunk_ids)
+        else:
+            content = doc.page_content[:LEGACY_MAX_CHARS] + "..." if len(doc.page_content) > LEGACY_MAX_CHARS else doc.page_content
+
+        i = len(reference_docs) + 1
+        page = doc.metadata.get("page")
+        location = f" (p.{page})" if page else ""
+        reference_docs.append(f"문서 {i}{location}: {content}")
+        print(f"📄 문서 {i}{location} [{chunk_id or '-'}, 거리 {score:.3f}]: {content[:100]}...")
+    return reference_docs
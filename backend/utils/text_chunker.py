@@ -0,0 +1,232 @@
+# =============================================================================
+# 문서 구조를 고려한 텍스트 분할 (Chunking)
+# =============================================================================
+# 주요 기능:
+# 1. PDF 페이지 텍스트를 제목 / 문단 / 목록 / 표 블록으로 구분
+# 2. 제목을 기준으로 섹션을 나누고, 섹션 안에서 블록 단위로 청크 구성
+# 3. 글자 수가 아닌 임베딩 모델 토큰 수로 청크 크기 제한
+# 4. 청크마다 출처 / 페이지 / 섹션 / 순번 메타데이터 기록
+# =============================================================================
+import os
+import re
+from typing import Dict, List
+
+from langchain.schema import Document
+
+# 청크 최대 토큰 수 (KURE-v1 토크나이저 기준)
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "256"))
+
+# 토큰 수 계산용 토크나이저 (임베딩 모델과 동일)
+TOKENIZER_MODEL_NAME = 'nlpai-lab/KURE-v1'
+
+# 제목 줄 패턴: "제1장", "Ⅰ.", "가. ", "■", "【" 등으로 시작하는 짧은 줄
+# (가나다 순서 번호는 글자를 나열: 범위 [가-하]는 거의 모든 한글 음절과 일치)
+HEADING_PATTERN = re.compile(r"^(제\s*\d+\s*[장절조관]|[ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩIVX]+\.\s|[가나다라마바사아자차카타파하]\.\s|[■□▣◆◇【\[])")
+# 목록 줄 패턴: "-", "•", "○", "1.", "1)", "(1)", "①", "가)" 등
+# (홈페이지 PDF에서 "1. " 줄은 대부분 표/목록 항목)
+LIST_PATTERN = re.compile(r"^([-•·○●※▶►✔*]|\d{1,2}\.\s|\d{1,2}\)|\(\d{1,2}\)|[①-⑳]|[가나다라마바사아자차카타파하]\))\s*")
+# 문장이 끝난 줄의 마지막 글자 (이 글자로 끝나지 않는 긴 줄은 다음 줄로 이어지는 줄)
+SENTENCE_ENDINGS = (".", "다", "요", "함", "됨", "음", "임", ":", "!", "?")
+# 표 줄 패턴: 세로선/탭이 있거나, 세 칸 이상 공백으로 구분된 칸이 3개 이상
+# (PDF 추출 시 단어 사이에 공백 2칸이 들어가므로 2칸은 표 구분으로 보지 않음)
+TABLE_PATTERN = re.compile(r"\||\t|(\S+ {3,}){2,}\S+")
+# 제목 후보 줄: 문장부호 없이 글자로만 이루어진 짧은 줄 (예: "학과소개", "유의사항")
+TITLE_LINE_PATTERN = re.compile(r"[가-힣A-Za-z0-9 ·ㆍ/()]+")
+# 문장 끝 (큰 문단을 나눌 때 사용)
+SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?。])\s+")
+
+HEADING_MAX_CHARS = 40
+TITLE_LINE_MAX_CHARS = 20
+
+_tokenizer = None
+
+
+def count_tokens(text: str) -> int:
+    """
+    임베딩 모델 토크나이저 기준 토큰 수
+    - 토크나이저를 불러올 수 없으면 글자 수 기반 근사값 사용
+    """
+    global _tokenizer
+    if _tokenizer is None:
+        try:
+            from transformers import AutoTokenizer
+            _tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_MODEL_NAME)
+        except Exception as e:
+            print(f"⚠️ 토크나이저 로드 실패, 근사 토큰 수 사용: {e}")
+            _tokenizer = False
+    if _tokenizer:
+        return len(_tokenizer.encode(text, add_special_tokens=False))
+    # 한국어는 대략 1.5자당 1토큰
+    return max(1, int(len(text) / 1.5))
+
+
+def _normalize_line(line: str) -> str:
+    """PDF 추출 시 단어 사이에 생기는 공백 2칸을 1칸으로 정리 (3칸 이상은 표 구분으로 유지)"""
+    return re.sub(r"(?<=\S) {2}(?=\S)", " ", line.strip())
+
+
+def _is_title_line(previous: str, line: str, following: str) -> bool:
+    """
+    기호 없는 제목 줄 판별 (예: "학과소개", "교육목표", "유의사항")
+    - 문장부호 없는 짧은 줄이고
+    - 다음 줄은 긴 본문이며
+    - 이전 줄이 같은 종류의 짧은 줄이 아니고 (표 칸이 줄바꿈된 조각 제외)
+    - 이전 줄이 문장 중간에서 줄바꿈된 긴 줄이 아닐 때 (문장 끝 조각 제외)
+    """
+    if not (2 <= len(line) <= TITLE_LINE_MAX_CHARS and TITLE_LINE_PATTERN.fullmatch(line)):
+        return False
+    if len(following) <= HEADING_MAX_CHARS:
+        return False
+    if not previous:
+        return True
+    if len(previous) <= TITLE_LINE_MAX_CHARS and TITLE_LINE_PATTERN.fullmatch(previous):
+        return False
+    # 경로 표시줄(">" 포함)은 문장이 아니므로 줄바꿈된 줄로 보지 않음
+    wrapped = (len(previous) > HEADING_MAX_CHARS and ">" not in previous
+               and not previous.endswith(SENTENCE_ENDINGS))
+    return not wrapped
+
+
+def _line_type(line: str) -> str:
+    """줄 종류 판별: heading / list / table / text"""
+    if LIST_PATTERN.match(line):
+        return "list"
+    if TABLE_PATTERN.search(line):
+        return "table"
+    if (len(line) <= HEADING_MAX_CHARS and HEADING_PATTERN.match(line)
+            and not line.endswith(("다.", "요.", "니다"))):
+        return "heading"
+    return "text"
+
+
+def split_blocks(page_text: str) -> List[Dict]:
+    """
+    페이지 텍스트를 블록 목록으로 변환
+    - 같은 종류의 연속된 줄(목록, 표, 문단)은 하나의 블록으로 묶음
+    - 빈 줄은 문단 경계
+    """
+    lines = [_normalize_line(raw_line) for raw_line in page_text.splitlines()]
+    blocks = []
+    current = None
+    for i, line in enumerate(lines):
+        if not line:
+            current = None
+            continue
+        kind = _line_type(line)
+        if kind == "text":
+            previous = lines[i - 1] if i > 0 else ""
+            following = lines[i + 1] if i + 1 < len(lines) else ""
+            if _is_title_line(previous, line, following):
+                kind = "heading"
+        if kind == "heading":
+            blocks.append({"type": "heading", "text": line})
+            current = None
+            continue
+        if current is not None and current["type"] == kind:
+            # 목록/표는 줄 구분 유지, 문단은 한 줄로 이어붙임
+            separator = " " if kind == "text" else "\n"
+            current["text"] += separator + line
+        else:
+            current = {"type": kind, "text": line}
+            blocks.append(current)
+    return blocks
+
+
+def _split_oversized(block: Dict, max_tokens: int) -> List[Dict]:
+    """
+    최대 토큰 수를 넘는 블록 분할
+    - 문단은 문장 단위, 목록/표는 줄 단위로 나눔 (행/항목 중간에서 자르지 않음)
+    """
+    if block["type"] == "text":
+        units = [u for u in SENTENCE_END_PATTERN.split(block["text"]) if u and u.strip()]
+        separator = " "
+    else:
+        units = block["text"].split("\n")
+        separator = "\n"
+
+    pieces, current = [], ""
+    for unit in units:
+        candidate = f"{current}{separator}{unit}" if current else unit
+        if current and count_tokens(candidate) > max_tokens:
+            pieces.append({"type": block["type"], "text": current})
+            current = unit
+        else:
+            current = candidate
+    if current:
+        pieces.append({"type": block["type"], "text": current})
+    return pieces
+
+
+def chunk_documents(documents: List[Document], max_tokens: int = CHUNK_MAX_TOKENS) -> List[Document]:
+    """
+    PDF 페이지 문서들을 구조 기반 청크로 분할
+
+    처리 과정:
+    1. 페이지별 텍스트를 블록으로 변환 (제목 / 문단 / 목록 / 표)
+    2. 제목을 만나면 현재 청크를 마무리하고 새 섹션 시작
+    3. 블록을 최대 토큰 수까지 하나의 청크로 모음 (목록/표는 되도록 나누지 않음)
+    4. 청크마다 메타데이터 기록
+
+    Args:
+        documents: PyPDFLoader가 반환한 페이지 단위 문서
+        max_tokens: 청크 최대 토큰 수
+
+    Returns:
+        List[Document]: 청크 문서 (metadata: source, page, page_end, section,
+                        chunk_index, chunk_id, block_types, n_tokens)
+    """
+    chunks: List[Document] = []
+    chunk_counts: Dict[str, int] = {}
+
+    state = {"texts": [], "types": [], "tokens": 0, "page": None, "page_end": None}
+    section = ""
+    source = ""
+
+    def flush():
+        if not state["texts"]:
+            return
+        body = "\n".join(state["texts"])
+        # 섹션 제목을 청크 앞에 붙여 검색/답변 시 맥락 제공
+        text = f"[{section}]\n{body}" if section else body
+        index = chunk_counts.get(source, 0)
+        chunk_counts[source] = index + 1
+        chunks.append(Document(page_content=text, metadata={
+            "source": source,
+            "page": state["page"],
+            "page_end": state["page_end"],
+            "section": section,
+            "chunk_index": index,
+            "chunk_id": f"{os.path.basename(source)}#{index}",
+            "block_types": sorted(set(state["types"])),
+            "n_tokens": state["tokens"],
+        }))
+        state.update({"texts": [], "types": [], "tokens": 0, "page": None, "page_end": None})
+
+    for document in documents:
+        doc_source = document.metadata.get("source", "")
+        if doc_source != source:
+            # 새 파일은 새 섹션에서 시작
+            flush()
+            source, section = doc_source, ""
+        # PyPDFLoader의 page는 0부터 시작
+        page = int(document.metadata.get("page", 0)) + 1
+
+        for block in split_blocks(document.page_content):
+            if block["type"] == "heading":
+                flush()
+                section = block["text"]
+                continue
+
+            block_tokens = count_tokens(block["text"])
+            pieces = [block] if block_tokens <= max_tokens else _split_oversized(block, max_tokens)
+            for piece in pieces:
+                piece_tokens = block_tokens if piece is block else count_tokens(piece["text"])
+                if state["texts"] and state["tokens"] + piece_tokens > max_tokens:
+                    flush()
+                state["texts"].append(piece["text"])
+                state["types"].append(piece["type"])
+                state["tokens"] += piece_tokens
+                state["page"] = state["page"] or page
+                state["page_end"] = page
+    flush()
+    return chunks
@@ -9,6 +9,8 @@ function ChatPage() {
     const [inputMessage, setInputMessage] = useState('');
     const [isLoading, setIsLoading] = useState(false);
     const messagesEndRef = useRef(null);
+    // 대화 세션 ID (서버가 세션별로 대화 맥락을 요약/유지)
+    const [sessionId] = useState(() => `${Date.now()}-${Math.random().toString(36).slice(2)}`);
 
     // 메시지 목록을 자동으로 스크롤
     const scrollToBottom = () => {
@@ -58,6 +60,7 @@ function ChatPage() {
                 },
                 body: JSON.stringify({
                     message: inputMessage.trim(),
+                    session_id: sessionId,
                     chat_history: chatHistory
                 })
             });